@@ -1,29 +1,31 @@
+from api_lib.health.api_health import health_check_response
+from api_lib.request.api_idempotency import idempotent
 from api_lib.request.api_request import ApiRequest, api
+from api_lib.request.api_router import api_router
 from api_lib.response.api_response import ApiResponse
 from core_lib.data_access.user import user_data_access
 from core_lib.services.auth import auth_service
 from core_lib.utils.json_schema_util import ACTIVE_STATUS
 from core_lib.utils.lambda_util import lambda_handler
+from core_lib.utils.log_util import log_unexpected_exception
 from core_lib.utils.uuid_util import generate_uuid
 from core_lib.services.database import database_service
 
+HEALTH_PROBES = {
+    "auth": auth_service.health_check,
+    "database": database_service.health_check,
+}
 
-@lambda_handler()
+
+@lambda_handler(log_event=False)
 @api(skip_access_log=True)
 def health(api_request: ApiRequest):
-    auth_service.health_check()
+    return health_check_response(api_request=api_request, probes=HEALTH_PROBES)
 
-    database_service.health_check()
 
-    return ApiResponse(
-        request_headers=api_request.headers,
-        status_code=200,
-        response_body=None,
-    ).format(skip_access_log=True)
-
-
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
+@idempotent()
 def signup(api_request: ApiRequest):
     request_body = api_request.body
     username = request_body.get("username")
@@ -32,33 +34,52 @@ def signup(api_request: ApiRequest):
     first_name = request_body.get("first_name")
     last_name = request_body.get("last_name")
     profile = generate_uuid()
-    signup_response = auth_service.replicated_sign_up(
-        profile=profile,
-        username=username,
-        email=email,
-        password=password,
-        first_name=first_name,
-        last_name=last_name,
-    )
+    sign_up_args = {
+        "profile": profile,
+        "username": username,
+        "email": email,
+        "password": password,
+        "first_name": first_name,
+        "last_name": last_name,
+    }
+
+    # the user item is only written once cognito accepted the username, a rejected
+    # signup then never leaves an item behind for the stream handlers to index
+    sign_up_response = auth_service.sign_up(**sign_up_args)
+
+    try:
+        user_data_access.create_user(
+            {
+                "profile": profile,
+                "username": username,
+                "email": email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "entity_status": ACTIVE_STATUS,
+            }
+        )
+    except Exception as e:
+        delete_cognito_user(username=sign_up_response["username"])
+        raise e
+
+    # replicate only after both succeeded, a queued replica signup can not be compensated
+    auth_service.replicate_sign_up(**sign_up_args)
 
-    user_data_access.create_user(
-        {
-            "profile": profile,
-            "username": username,
-            "email": email,
-            "first_name": first_name,
-            "last_name": last_name,
-            "entity_status": ACTIVE_STATUS,
-        }
-    )
     return ApiResponse(
         request_headers=api_request.headers,
         status_code=201,
-        response_body=signup_response,
+        response_body=sign_up_response,
     ).format()
 
 
-@lambda_handler()
+def delete_cognito_user(username: str):
+    try:
+        auth_service.admin_delete_user(username=username)
+    except Exception as e:
+        log_unexpected_exception(e)
+
+
+@lambda_handler(log_event=False)
 @api()
 def confirm_sign_up(api_request: ApiRequest):
     query_parameters = api_request.query_parameters
@@ -70,7 +91,7 @@ def confirm_sign_up(api_request: ApiRequest):
     ).format()
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
 def authenticate(api_request: ApiRequest):
     request_body = api_request.body
@@ -84,3 +105,31 @@ def authenticate(api_request: ApiRequest):
         status_code=200,
         response_body=authentication_response,
     ).format()
+
+
+@lambda_handler(log_event=False)
+@api()
+def refresh_authentication(api_request: ApiRequest):
+    request_body = api_request.body
+    username = request_body.get("username")
+    refresh_token = request_body.get("refresh_token")
+    authentication_response = auth_service.initiate_refresh_token_auth(
+        username=username, refresh_token=refresh_token
+    )
+    return ApiResponse(
+        request_headers=api_request.headers,
+        status_code=200,
+        response_body=authentication_response,
+    ).format()
+
+
+# API Gateway (method, resource) of every handler above
+ROUTES = {
+    ("GET", "/v1.0/health"): health,
+    ("POST", "/v1.0/signup"): signup,
+    ("GET", "/v1.0/confirm_sign_up"): confirm_sign_up,
+    ("POST", "/v1.0/auth"): authenticate,
+    ("POST", "/v1.0/auth/refresh"): refresh_authentication,
+}
+
+route = api_router(ROUTES)
@@ -1,11 +1,17 @@
+import functools
 from enum import Enum
 from threading import current_thread
 
 from api_lib.auth.jwt_util import get_decoded_jwt
 from api_lib.request.api_request import ApiRequest
-from core_lib.data_access.user import user_data_access, user_association_data_access
-from core_lib.utils.date_time_util import get_current_utc_datetime_iso
-from core_lib.utils.thread_util import safe_get_thread_attribute
+from core_lib.data_access.rate_limit import rate_limit_data_access
+from core_lib.data_access.user import (
+    user_data_access,
+    user_association_data_access,
+    user_existence_data_access,
+)
+from core_lib.exceptions.types import AppException
+from core_lib.utils.log_util import log_unexpected_exception
 
 
 class UserGroup(Enum):
@@ -18,6 +24,7 @@ class ActionType(Enum):
     Create = "CREATE"
     List = "LIST"
     Get = "GET"
+    BatchGet = "BATCH_GET"
     Update = "UPDATE"
     Delete = "DELETE"
     Associate = "ASSOCIATE"
@@ -52,6 +59,25 @@ class TargetResourceAuthorizationModel:
     def is_principle_authorized(self):
         return False
 
+    def is_principle_authorized_many(self, target_resource_ids: list):
+        """
+        Evaluate the action against many targets and return a verdict per target id.
+        """
+        return {
+            target_resource_id: self.for_target(
+                target_resource_id
+            ).is_principle_authorized()
+            for target_resource_id in target_resource_ids
+        }
+
+    def for_target(self, target_resource_id: str):
+        return self.__class__(
+            principle=self.principle,
+            user_groups=self.user_groups,
+            target_resource_id_holder={"id": target_resource_id},
+            action_type=self.action_type,
+        )
+
     def format(self):
         return {
             "action_type": self.action_type.value,
@@ -74,6 +100,7 @@ class UserResourceAuthorizationModel(TargetResourceAuthorizationModel):
             ActionType.Create: self.is_create_allowed,
             ActionType.List: self.is_list_allowed,
             ActionType.Get: self.is_get_allowed,
+            ActionType.BatchGet: self.is_batch_get_allowed,
             ActionType.Update: self.is_update_allowed,
             ActionType.Delete: self.is_delete_allowed,
             ActionType.Associate: self.is_associate_allowed,
@@ -82,6 +109,35 @@ class UserResourceAuthorizationModel(TargetResourceAuthorizationModel):
         authorizor = ACTION_AUTH.get(self.action_type)
         return authorizor()
 
+    def is_principle_authorized_many(self, target_resource_ids: list):
+        if self.action_type not in (ActionType.Get, ActionType.BatchGet):
+            return super().is_principle_authorized_many(target_resource_ids)
+
+        if is_admin(self.user_groups):
+            return {
+                target_resource_id: True for target_resource_id in target_resource_ids
+            }
+
+        # every non self target is resolved with a single batch read of associations
+        associated_user_ids = user_association_data_access.find_associated_users(
+            user_a_id=self.principle,
+            user_b_ids=[
+                target_resource_id
+                for target_resource_id in target_resource_ids
+                if not is_self_target(
+                    target_resource_id=target_resource_id, principle=self.principle
+                )
+            ],
+        )
+
+        return {
+            target_resource_id: is_self_target(
+                target_resource_id=target_resource_id, principle=self.principle
+            )
+            or target_resource_id in associated_user_ids
+            for target_resource_id in target_resource_ids
+        }
+
     def is_create_allowed(self):
         return is_admin(user_groups=self.user_groups)
 
@@ -94,16 +150,13 @@ class UserResourceAuthorizationModel(TargetResourceAuthorizationModel):
         ) or is_admin(self.user_groups):
             return True
 
-        associated_resource = next(
-            iter(
-                user_association_data_access.query_associated_users(
-                    user_a_id=self.principle, user_b_id=self.target_resource_id
-                ).get("Items", [])
-            ),
-            None,
+        return user_association_data_access.is_user_associated(
+            user_a_id=self.principle, user_b_id=self.target_resource_id
         )
 
-        return associated_resource is not None
+    def is_batch_get_allowed(self):
+        # each target is authorized by the handler through is_principle_authorized_many
+        return True
 
     def is_update_allowed(self):
         return is_self_target(
@@ -116,6 +169,9 @@ class UserResourceAuthorizationModel(TargetResourceAuthorizationModel):
         ) or is_admin(self.user_groups)
 
     def is_associate_allowed(self):
+        if not user_existence_data_access.might_user_exist(self.target_resource_id):
+            return False
+
         return (
             user_data_access.find_user_by_id(
                 _id=self.target_resource_id, projection_expression="profile"
@@ -151,20 +207,55 @@ class ResourceAccess(Enum):
     AccessSearch = SearchResourceAuthorizationModel
 
 
+class RateLimit:
+    """
+    A token bucket per principal and route: bursts of up to limit requests, refilled at
+    limit requests per window_seconds.
+    """
+
+    def __init__(self, limit: int, window_seconds: int = 60):
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+
 class Authorization:
     def __init__(
         self,
         resource_access: ResourceAccess,
         action_type: ActionType,
         user_group: UserGroup = None,
+        rate_limit: RateLimit = None,
     ):
         self.user_group = user_group
         self.resource_access = resource_access
         self.action_type = action_type
+        self.rate_limit = rate_limit
+
+
+def enforce_rate_limit(rate_limit: RateLimit, principle: str, route: str):
+    try:
+        retry_after = rate_limit_data_access.take_token(
+            principle=principle,
+            route=route,
+            limit=rate_limit.limit,
+            window_seconds=rate_limit.window_seconds,
+        )
+    except Exception as e:
+        # fail open, API Gateway throttling still bounds the total load
+        log_unexpected_exception(e)
+        return
+
+    if retry_after is not None:
+        raise AppException(
+            message="Too many requests",
+            code=429,
+            params={"headers": {"Retry-After": str(retry_after)}},
+        )
 
 
 def authorize(authorization: Authorization):
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(api_request: ApiRequest):
             # Get the JWT from the event
             authorization_header = api_request.headers.get("Authorization")
@@ -187,6 +278,15 @@ def authorize(authorization: Authorization):
 
             principle = decoded_jwt["profile"]
             current_thread().__setattr__("principle", principle)
+
+            # before resource authorization, which may already read the table
+            if authorization.rate_limit is not None:
+                enforce_rate_limit(
+                    rate_limit=authorization.rate_limit,
+                    principle=principle,
+                    route=func.__name__,
+                )
+
             auth_instance = None
             resource_access = authorization.resource_access
             if resource_access is not None:
@@ -201,20 +301,7 @@ def authorize(authorization: Authorization):
                 if not is_authorized:
                     raise Exception("Unauthorized access")
 
-            message = {
-                "utc_datetime_iso": get_current_utc_datetime_iso(),
-                "log_type": "APP_ACCESS_LOG",
-                "event_type": "USER_AUTHORIZED",
-                "auth_instance": auth_instance.format()
-                if auth_instance is not None
-                else None,
-                "principle": principle,
-                "lambda_event": safe_get_thread_attribute("event"),
-                "request_headers": api_request.headers,
-                "request_body": api_request.body,
-                "request_path_parameters": api_request.path_parameters,
-            }
-            print(message)
+            api_request.authorization = auth_instance
 
             return func(api_request=api_request)
 
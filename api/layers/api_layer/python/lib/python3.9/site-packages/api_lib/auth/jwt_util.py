@@ -1,38 +1,39 @@
 import base64
+import hashlib
+import os
 import time
 
 import jwt
 from core_lib.services.auth.auth_service import (
     get_audience,
-    get_known_public_keys,
+    get_known_public_key,
 )
+from core_lib.utils.cache_util import LRUCache
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
+# container lifetime store of ready to use public keys keyed by kid
+PUBLIC_KEYS = {}
 
-def get_decoded_jwt(token: str, is_access_token=False, check_exp_claim=True):
-    jwks = get_known_public_keys()
+# verified claims keyed by a digest of the token, each entry expires at the token's exp
+VERIFIED_CLAIMS_CACHE = LRUCache(
+    max_size=int(os.getenv("JWT_CLAIMS_CACHE_MAX_SIZE", "1024"))
+)
 
-    # get the kid from the headers prior to verification
-    unverified_headers = jwt.get_unverified_header(token)
-    kid = unverified_headers["kid"]
 
-    key = None
-    for jwk in jwks:
-        if jwk["kid"] == kid:
-            key = jwk
-            break
+def get_decoded_jwt(token: str, is_access_token=False, check_exp_claim=True):
+    token_digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
 
-    public_key_pem = jwk_to_pem(key)
+    verified_token = VERIFIED_CLAIMS_CACHE.get(token_digest)
+    if verified_token is None:
+        verified_token = verify_jwt(token)
 
-    # Verify the signature of the JWT token using the public key
-    verified_token = jwt.decode(
-        token,
-        public_key_pem,
-        algorithms=["RS256"],
-        audience=get_audience(),
-        options={"verify_signature": True},
-    )
+        if verified_token.get("exp") is not None:
+            VERIFIED_CLAIMS_CACHE.set(
+                token_digest, verified_token, expires_at=verified_token["exp"]
+            )
+
+    verified_token = dict(verified_token)
 
     # additionally we can verify the token expiration
     if check_exp_claim is True and time.time() > verified_token["exp"]:
@@ -47,6 +48,57 @@ def get_decoded_jwt(token: str, is_access_token=False, check_exp_claim=True):
     return verified_token
 
 
+def verify_jwt(token: str):
+    # get the kid from the headers prior to verification
+    unverified_headers = jwt.get_unverified_header(token)
+    kid = unverified_headers["kid"]
+
+    public_key = get_public_key(kid)
+
+    # Verify the signature of the JWT token using the public key
+    return jwt.decode(
+        token,
+        public_key,
+        algorithms=["RS256"],
+        audience=get_audience(),
+        options={"verify_signature": True},
+    )
+
+
+def get_verified_claims_cache_stats():
+    return VERIFIED_CLAIMS_CACHE.stats()
+
+
+def get_public_key(kid: str):
+    # resolve the kid against the current jwks so rotated out keys stop verifying
+    jwk = get_known_public_key(kid)
+    if jwk is None:
+        PUBLIC_KEYS.pop(kid, None)
+        raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+
+    public_key = PUBLIC_KEYS.get(kid)
+    if public_key is None:
+        public_key = jwk_to_public_key(jwk)
+        PUBLIC_KEYS[kid] = public_key
+
+    return public_key
+
+
+def jwk_to_public_key(jwk):
+    """
+    Convert a JWK (JSON Web Key) to an RSA public key object.
+
+    Args:
+        jwk (dict): A dictionary containing the JWK data.
+
+    Returns:
+        RSAPublicKey: The public key, ready to be passed to jwt.decode.
+    """
+    e = int(base64.urlsafe_b64decode(jwk["e"] + "==").hex(), 16)
+    n = int(base64.urlsafe_b64decode(jwk["n"] + "==").hex(), 16)
+    return rsa.RSAPublicNumbers(e, n).public_key()
+
+
 def jwk_to_pem(jwk):
     """
     Convert a JWK (JSON Web Key) to PEM (Privacy-Enhanced Mail) format.
@@ -58,9 +110,7 @@ def jwk_to_pem(jwk):
         str: The JWK data converted to PEM format.
     """
     # Construct the RSA public key from the JWK
-    e = int(base64.urlsafe_b64decode(jwk["e"] + "==").hex(), 16)
-    n = int(base64.urlsafe_b64decode(jwk["n"] + "==").hex(), 16)
-    public_key = rsa.RSAPublicNumbers(e, n).public_key()
+    public_key = jwk_to_public_key(jwk)
 
     # Serialize the public key to PEM format
     pem = public_key.public_bytes(
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from api_lib.request.api_request import ApiRequest
+from api_lib.response.api_response import ApiResponse
+from core_lib.utils.cache_util import LRUCache
+from core_lib.utils.log_util import log_warning
+
+HEALTH_CHECK_PASS = "pass"
+HEALTH_CHECK_FAIL = "fail"
+
+# probe results are reused for this long, high frequency monitors never reach the
+# dependencies more often than once per ttl and container
+HEALTH_CHECK_CACHE_TTL_SECONDS = float(
+    os.getenv("HEALTH_CHECK_CACHE_TTL_SECONDS", "30")
+)
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+
+HEALTH_CHECK_CACHE = LRUCache(max_size=64, ttl_seconds=HEALTH_CHECK_CACHE_TTL_SECONDS)
+HEALTH_CHECK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="health-check"
+)
+# name -> future of a probe still running, it is awaited rather than started again
+HEALTH_CHECK_IN_FLIGHT = {}
+HEALTH_CHECK_IN_FLIGHT_LOCK = threading.Lock()
+
+
+def health_check_response(api_request: ApiRequest, probes: dict):
+    """
+    Liveness by default. With ?deep=true every probe, a name to callable mapping, is run
+    in parallel or served from cache, and any failing probe turns the response into a 503.
+    """
+    query_parameters = api_request.query_parameters or {}
+    if str(query_parameters.get("deep", "")).lower() != "true":
+        return ApiResponse(
+            request_headers=api_request.headers,
+            status_code=200,
+            response_body={"status": HEALTH_CHECK_PASS},
+        ).format()
+
+    checks = run_health_checks(probes)
+    is_healthy = all(check["status"] == HEALTH_CHECK_PASS for check in checks.values())
+
+    return ApiResponse(
+        request_headers=api_request.headers,
+        status_code=200 if is_healthy else 503,
+        response_body={
+            "status": HEALTH_CHECK_PASS if is_healthy else HEALTH_CHECK_FAIL,
+            "checks": checks,
+        },
+        cache_control="no-store",
+    ).format()
+
+
+def run_health_checks(probes: dict):
+    checks = {}
+    futures = {}
+    for name, probe in probes.items():
+        cached_check = HEALTH_CHECK_CACHE.get(name)
+        if cached_check is not None:
+            checks[name] = {**cached_check, "cached": True}
+        else:
+            futures[name] = submit_probe(name, probe)
+
+    if futures:
+        wait(futures.values(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+
+    for name, future in futures.items():
+        if future.done():
+            check = future.result()
+        else:
+            # not cached, the probe caches its own result once it completes
+            log_warning(f"health check timed out: {name}")
+            check = {"status": HEALTH_CHECK_FAIL, "error": "timed out"}
+
+        checks[name] = {**check, "cached": False}
+
+    return checks
+
+
+def submit_probe(name: str, probe):
+    with HEALTH_CHECK_IN_FLIGHT_LOCK:
+        future = HEALTH_CHECK_IN_FLIGHT.get(name)
+        if future is None:
+            future = HEALTH_CHECK_EXECUTOR.submit(run_probe, name, probe)
+            HEALTH_CHECK_IN_FLIGHT[name] = future
+
+        return future
+
+
+def run_probe(name: str, probe):
+    started_at = time.perf_counter()
+    try:
+        probe()
+        check = {"status": HEALTH_CHECK_PASS}
+    except Exception as e:
+        log_warning(f"health check failed: {name}: {e}")
+        check = {"status": HEALTH_CHECK_FAIL, "error": type(e).__name__}
+
+    check["duration_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+
+    # cached before it leaves the in flight probes, a request sees one or the other
+    HEALTH_CHECK_CACHE.set(name, check)
+    with HEALTH_CHECK_IN_FLIGHT_LOCK:
+        HEALTH_CHECK_IN_FLIGHT.pop(name, None)
+
+    return check
@@ -0,0 +1,85 @@
+import os
+import time
+
+from api_lib.request.request_headers import get_request_header
+from core_lib.utils import json_util
+from core_lib.utils.date_time_util import get_current_utc_datetime_iso
+from core_lib.utils.log_util import log_unexpected_exception
+from core_lib.utils.thread_util import safe_get_thread_attribute
+
+# the raw lambda event is only logged when enabled, and truncated
+API_ACCESS_LOG_EVENT = os.getenv("API_ACCESS_LOG_EVENT", "false").lower() == "true"
+API_ACCESS_LOG_EVENT_MAX_CHARS = int(
+    os.getenv("API_ACCESS_LOG_EVENT_MAX_CHARS", "2048")
+)
+
+REDACTED_HEADERS = {"authorization", "cookie", "x-access-token", "x-refresh-token"}
+
+
+def log_access_record(
+    event: dict, api_request, response: dict, route: str, started_at: float
+):
+    """
+    Print the single access record of an API request, once its response is known.
+    """
+    try:
+        print(
+            build_access_record(
+                event=event,
+                api_request=api_request,
+                response=response,
+                route=route,
+                duration_ms=(time.perf_counter() - started_at) * 1000,
+            )
+        )
+    except Exception as e:
+        log_unexpected_exception(e)
+
+
+def build_access_record(
+    event: dict, api_request, response: dict, route: str, duration_ms: float
+):
+    request_context = event.get("requestContext") or {}
+    # a handler raising instead of responding surfaces as a 502 from API Gateway
+    response = response if isinstance(response, dict) else {"statusCode": 502}
+    authorization = getattr(api_request, "authorization", None)
+
+    message = {
+        "utc_datetime_iso": get_current_utc_datetime_iso(),
+        "log_type": "APP_ACCESS_LOG",
+        "event_type": "API_ACCESS",
+        "request_id": request_context.get("requestId"),
+        "route": route,
+        "http_method": event.get("httpMethod"),
+        "resource": event.get("resource"),
+        "path": event.get("path"),
+        "source_ip": (request_context.get("identity") or {}).get("sourceIp"),
+        "user_agent": get_request_header(event.get("headers"), "User-Agent"),
+        "principle": safe_get_thread_attribute("principle"),
+        "authorization": (
+            authorization.format() if authorization is not None else None
+        ),
+        "status_code": response.get("statusCode"),
+        "duration_ms": round(duration_ms, 1),
+        "request_bytes": len(event.get("body") or ""),
+        "response_bytes": len(response.get("body") or ""),
+    }
+    if API_ACCESS_LOG_EVENT:
+        message["lambda_event"] = json_util.dumps(redact_event(event))[
+            :API_ACCESS_LOG_EVENT_MAX_CHARS
+        ]
+
+    return message
+
+
+def redact_event(event: dict):
+    redacted_event = dict(event)
+    for headers_key in ("headers", "multiValueHeaders"):
+        if event.get(headers_key):
+            redacted_event[headers_key] = {
+                key: value
+                for key, value in event[headers_key].items()
+                if key.lower() not in REDACTED_HEADERS
+            }
+
+    return redacted_event
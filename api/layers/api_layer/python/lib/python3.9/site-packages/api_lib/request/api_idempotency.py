@@ -0,0 +1,133 @@
+import functools
+import hashlib
+
+from api_lib.request.api_request import ApiRequest
+from api_lib.response.api_response import ApiResponse, set_access_control_allow_origin
+from core_lib.data_access.idempotency import idempotency_data_access
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_data_model import (
+    IDEMPOTENCY_RECORD_COMPLETE,
+)
+from core_lib.exceptions.types import AppException
+from core_lib.utils import json_util
+from core_lib.utils.log_util import log_unexpected_exception
+from core_lib.utils.thread_util import safe_get_thread_attribute
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def idempotent():
+    """
+    Replay the first response to requests retried with the same Idempotency-Key header.
+
+    Apply it below api, and below authorize on authenticated routes so keys are scoped
+    to the principal and replays are still authorized. Requests without the header run
+    as usual. Responses below 500 are stored, failures release the key for a retry.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(api_request: ApiRequest):
+            idempotency_key = api_request.headers.get(IDEMPOTENCY_KEY_HEADER)
+            if idempotency_key is None:
+                return func(api_request=api_request)
+
+            if not 0 < len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+                raise AppException(
+                    message=f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters",
+                    code=400,
+                )
+
+            record_id = build_record_id(api_request, idempotency_key)
+            fingerprint = build_fingerprint(api_request)
+            record = idempotency_data_access.acquire_idempotency_record(
+                record_id=record_id, fingerprint=fingerprint
+            )
+            if record is not None:
+                return replay(api_request, record, fingerprint)
+
+            try:
+                response = func(api_request=api_request)
+            except Exception as e:
+                release(record_id)
+                raise e
+
+            store(record_id, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def build_record_id(api_request: ApiRequest, idempotency_key: str):
+    scope = [
+        safe_get_thread_attribute("principle"),
+        api_request.http_method,
+        api_request.resource,
+        idempotency_key,
+    ]
+    return hashlib.sha256(json_util.dumps_bytes(scope)).hexdigest()
+
+
+def build_fingerprint(api_request: ApiRequest):
+    request = [
+        api_request.path,
+        api_request.query_parameters,
+        api_request.raw_body,
+    ]
+    return hashlib.sha256(json_util.dumps_bytes(request)).hexdigest()
+
+
+def replay(api_request: ApiRequest, record: dict, fingerprint: str):
+    if record.get("fingerprint") != fingerprint:
+        raise AppException(
+            message=f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request",
+            code=422,
+        )
+
+    if record.get("record_status") != IDEMPOTENCY_RECORD_COMPLETE:
+        response = ApiResponse(
+            request_headers=api_request.headers,
+            status_code=409,
+            response_body={
+                "message": f"a request with this {IDEMPOTENCY_KEY_HEADER} is in progress"
+            },
+        )
+        response.headers["Retry-After"] = "1"
+        return response.format()
+
+    stored_response = record["stored_response"]
+    return {
+        **stored_response,
+        "statusCode": int(stored_response["statusCode"]),
+        "headers": {
+            **stored_response.get("headers", {}),
+            "Access-Control-Allow-Origin": set_access_control_allow_origin(
+                api_request.headers
+            ),
+            "Idempotent-Replayed": "true",
+        },
+    }
+
+
+def store(record_id: str, response: dict):
+    if response.get("statusCode", 500) < 500:
+        try:
+            idempotency_data_access.complete_idempotency_record(
+                record_id=record_id, response=response
+            )
+            return
+        except Exception as e:
+            # e.g. a response too large for an item, a retry just runs the request again
+            log_unexpected_exception(e)
+
+    release(record_id)
+
+
+def release(record_id: str):
+    try:
+        idempotency_data_access.release_idempotency_record(record_id)
+    except Exception as e:
+        # the record still expires after IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS
+        log_unexpected_exception(e)
@@ -1,42 +1,147 @@
-import json
+import base64
+import functools
+import os
+import time
+from threading import current_thread
 
-from core_lib.utils.date_time_util import get_current_utc_datetime_iso
-from core_lib.utils.thread_util import safe_get_thread_attribute
+from api_lib.request.api_access_log import log_access_record
+from api_lib.request.request_headers import RequestHeaders
+from api_lib.response.api_response import ApiResponse
+from core_lib.exceptions.types import AppException
+from core_lib.utils import json_util
+
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", "1048576"))
+
+UNPARSED = object()
 
 
 def api(skip_access_log: bool = False):
     def decorator(func):
+        route = getattr(func, "__name__", None)
+
+        @functools.wraps(func)
         def wrapper(event):
-            api_request = ApiRequest(event)
-
-            if not skip_access_log:
-                message = {
-                    "utc_datetime_iso": get_current_utc_datetime_iso(),
-                    "log_type": "APP_ACCESS_LOG",
-                    "event_type": "API_REQUEST",
-                    "lambda_event": safe_get_thread_attribute("event"),
-                    "request_headers": api_request.headers,
-                    "request_body": api_request.body,
-                    "request_path_parameters": api_request.path_parameters,
-                }
-                print(message)
-
-            return func(api_request=api_request)
+            started_at = time.perf_counter()
+            # threads are reused across invocations, never log a previous principal
+            current_thread().__setattr__("principle", None)
+            api_request = None
+            response = None
+            try:
+                api_request = ApiRequest(event)
+                response = func(api_request=api_request)
+            except AppException as e:
+                response = format_app_exception(
+                    (
+                        api_request.headers
+                        if api_request is not None
+                        else event.get("headers") or {}
+                    ),
+                    e,
+                )
+            finally:
+                if not skip_access_log:
+                    log_access_record(
+                        event=event,
+                        api_request=api_request,
+                        response=response,
+                        route=route,
+                        started_at=started_at,
+                    )
+
+            return response
 
         return wrapper
 
     return decorator
 
 
+def format_app_exception(request_headers: dict, e: AppException):
+    response = ApiResponse(
+        request_headers=request_headers,
+        status_code=e.get_code() or 400,
+        response_body={"message": e.get_message()},
+    )
+    if isinstance(e.params, dict):
+        response.headers.update(e.params.get("headers") or {})
+    return response.format()
+
+
 class ApiRequest:
     def __init__(self, event: dict):
-        self.headers = event.get("headers", {})
+        self.http_method = event.get("httpMethod")
+        self.resource = event.get("resource")
+        self.path = event.get("path")
+        self.headers = RequestHeaders(event.get("headers"))
         self.path_parameters = event.get("pathParameters", {})
-        self.body = (
-            json.loads(event.get("body", {}))
-            if self.headers.get("Content-Type", "application/json")
-            == "application/json"
-            and event.get("body") is not None
-            else event.get("body")
-        )
         self.query_parameters = event.get("queryStringParameters", {})
+        self.raw_body = event.get("body")
+        self.is_base64_encoded = event.get("isBase64Encoded", False)
+        self._body = UNPARSED
+        # set by the authorize decorator, for the access record and handlers that
+        # authorize many targets
+        self.authorization = None
+
+        if self.get_body_size() > API_MAX_BODY_BYTES:
+            raise AppException(
+                message=f"request body exceeds {API_MAX_BODY_BYTES} bytes", code=413
+            )
+
+    def get_fields(self, allowed_fields: tuple):
+        """
+        Fields requested with ?fields=a,b, or all allowed fields when none are requested.
+        """
+        requested_fields = (self.query_parameters or {}).get("fields")
+        if requested_fields is None:
+            return list(allowed_fields)
+
+        fields = list(
+            dict.fromkeys(
+                field.strip() for field in requested_fields.split(",") if field.strip()
+            )
+        )
+        unknown_fields = [field for field in fields if field not in allowed_fields]
+        if not fields or unknown_fields:
+            raise AppException(
+                message=f"fields must be a comma separated subset of: {','.join(allowed_fields)}",
+                code=400,
+            )
+
+        return fields
+
+    def get_body_size(self):
+        if self.raw_body is None:
+            return 0
+
+        if self.is_base64_encoded:
+            return len(self.raw_body) * 3 // 4
+
+        return len(self.raw_body)
+
+    @property
+    def body(self):
+        if self._body is UNPARSED:
+            self._body = self.parse_body()
+
+        return self._body
+
+    def parse_body(self):
+        if self.raw_body is None:
+            return None
+
+        body = (
+            base64.b64decode(self.raw_body) if self.is_base64_encoded else self.raw_body
+        )
+
+        if not self.is_json():
+            return body
+
+        try:
+            return json_util.loads(body)
+        except ValueError:
+            raise AppException(message="request body is not valid JSON", code=400)
+
+    def is_json(self):
+        content_type = self.headers.get("Content-Type", "application/json")
+        media_type = content_type.split(";")[0].strip().lower()
+
+        return media_type == "application/json" or media_type.endswith("+json")
@@ -0,0 +1,42 @@
+from api_lib.response.api_response import ApiResponse
+
+
+def api_router(routes: dict):
+    """
+    Single Lambda entry point for many controller handlers.
+
+    routes maps (http method, API Gateway resource) to a handler taking (event, context),
+    e.g. ("GET", "/v1.0/user/{id}"): user_controller.get. The resource is the path
+    template of the API Gateway resource, not the request path.
+    """
+    routes = {
+        (method.upper(), resource): handler
+        for (method, resource), handler in routes.items()
+    }
+    methods_by_resource = {}
+    for method, resource in routes:
+        methods_by_resource.setdefault(resource, []).append(method)
+
+    def router(event, context):
+        resource = event.get("resource")
+        handler = routes.get(((event.get("httpMethod") or "").upper(), resource))
+        if handler is not None:
+            return handler(event, context)
+
+        request_headers = event.get("headers") or {}
+        if resource not in methods_by_resource:
+            return ApiResponse(
+                request_headers=request_headers,
+                status_code=404,
+                response_body={"message": "resource not found"},
+            ).format()
+
+        response = ApiResponse(
+            request_headers=request_headers,
+            status_code=405,
+            response_body={"message": "method not allowed"},
+        )
+        response.headers["Allow"] = ",".join(sorted(methods_by_resource[resource]))
+        return response.format()
+
+    return router
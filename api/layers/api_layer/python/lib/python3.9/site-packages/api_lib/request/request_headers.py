@@ -0,0 +1,40 @@
+from collections.abc import Mapping
+
+
+class RequestHeaders(Mapping):
+    """
+    Read only request headers with case insensitive lookups, keys keep the casing sent
+    by the client.
+    """
+
+    def __init__(self, headers: dict = None):
+        self.headers = dict(headers or {})
+        self.keys_by_lower_key = {key.lower(): key for key in self.headers}
+
+    def __getitem__(self, key):
+        return self.headers[self.keys_by_lower_key.get(key.lower(), key)]
+
+    def __contains__(self, key):
+        return isinstance(key, str) and key.lower() in self.keys_by_lower_key
+
+    def __iter__(self):
+        return iter(self.headers)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def __repr__(self):
+        return f"RequestHeaders({self.headers!r})"
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def get_request_header(headers: dict, name: str):
+    """
+    Case insensitive lookup of a header in a RequestHeaders or a plain event headers dict.
+    """
+    if not isinstance(headers, RequestHeaders):
+        headers = RequestHeaders(headers)
+
+    return headers.get(name)
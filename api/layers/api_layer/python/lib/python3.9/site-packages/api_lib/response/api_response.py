@@ -1,8 +1,32 @@
-import json
+import base64
+import gzip
+import hashlib
 import os
+from uuid import uuid4
 
-from core_lib.utils.date_time_util import get_current_utc_datetime_iso
-from core_lib.utils.thread_util import safe_get_thread_attribute
+from api_lib.request.request_headers import get_request_header
+from core_lib.services.file_storage import file_storage_service
+from core_lib.utils import json_util
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+API_COMPRESSION_MIN_BYTES = int(os.getenv("API_COMPRESSION_MIN_BYTES", "1024"))
+# Lambda rejects response payloads above 6 MB, the serialized proxy response is
+# offloaded from 256 KB below that
+LAMBDA_RESPONSE_MAX_BYTES = 6291456
+API_RESPONSE_OFFLOAD_MIN_BYTES = int(
+    os.getenv("API_RESPONSE_OFFLOAD_MIN_BYTES", str(LAMBDA_RESPONSE_MAX_BYTES - 262144))
+)
+API_RESPONSE_OFFLOAD_URL_EXPIRES_IN = int(
+    os.getenv("API_RESPONSE_OFFLOAD_URL_EXPIRES_IN", "300")
+)
+# the app storage bucket expires objects under this prefix
+API_RESPONSE_OFFLOAD_KEY_PREFIX = "api-responses"
+GZIP_COMPRESS_LEVEL = 5
+BROTLI_QUALITY = 4
 
 CORS_ALLOWED_ORIGINS = (
     os.getenv("CORS_ALLOWED_ORIGINS").split(",")
@@ -21,17 +45,24 @@ def get_cors_allowed_origins():
 
 class ApiResponse:
     def __init__(
-        self, request_headers: dict, status_code: int, response_body: any = None
+        self,
+        request_headers: dict,
+        status_code: int,
+        response_body: any = None,
+        etag: bool = False,
+        cache_control: str = None,
     ):
         self.status_code = status_code
         self.body = response_body
+        self.request_headers = request_headers
+        self.etag = etag
         self.headers = {
             "Access-Control-Allow-Origin": set_access_control_allow_origin(
                 request_headers
             ),
             "Access-Control-Allow-Credentials": "true",
             "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token,"
-            "X-Access-Token,X-Refresh-Token,",
+            "X-Access-Token,X-Refresh-Token,If-None-Match,Idempotency-Key,",
             "Access-Control-Allow-Methods": "OPTIONS,POST,GET,PATCH,DELETE,PUT",
             "Content-Type": "application/json",
             "strict-transport-security": "max-age=31536000; includeSubdomains; preload",
@@ -40,34 +71,186 @@ class ApiResponse:
             "x-frame-options": "DENY",
             "x-content-type-options": "nosniff",
         }
+        if cache_control is not None:
+            self.headers["Cache-Control"] = cache_control
+
+    def format(self):
+        body = json_util.dumps_bytes(self.body) if self.body is not None else None
+        content_encoding = self.get_content_encoding(body) if body is not None else None
+        if body is not None and self.etag:
+            self.set_etag(body, content_encoding)
+            if self.status_code == 304:
+                body = None
 
-    def format(self, skip_access_log: bool = False):
         formatted_response = {
             "statusCode": self.status_code,
             "body": self.body,
             "headers": self.headers,
         }
-        if not skip_access_log:
-            message = {
-                "utc_datetime_iso": get_current_utc_datetime_iso(),
-                "log_type": "APP_ACCESS_LOG",
-                "event_type": "API_RESPONSE",
-                "principle": safe_get_thread_attribute("principle"),
-                "lambda_event": safe_get_thread_attribute("event"),
-                "response_status_code": self.status_code,
-                "response_status_body": self.body,
-                "response_status_headers": self.headers,
-            }
-            print(message)
+        if body is None:
+            formatted_response["body"] = None
+            return formatted_response
 
-        formatted_response["body"] = (
-            json.dumps(self.body, cls=json.JSONEncoder)
-            if self.body is not None
-            else None
+        self.encode_body(formatted_response, body, content_encoding)
+        if is_payload_too_large(formatted_response, body):
+            return self.offload_body(formatted_response, body)
+
+        return formatted_response
+
+    def get_content_encoding(self, body: bytes):
+        if len(body) < API_COMPRESSION_MIN_BYTES:
+            return None
+
+        # above the threshold the body depends on the request Accept-Encoding
+        self.headers["Vary"] = "Accept-Encoding"
+        return negotiate_content_encoding(
+            get_request_header(self.request_headers, "Accept-Encoding")
         )
 
+    def encode_body(
+        self, formatted_response: dict, body: bytes, content_encoding: str = None
+    ):
+        if content_encoding is None:
+            formatted_response["body"] = body.decode("utf-8")
+            return
+
+        self.headers["Content-Encoding"] = content_encoding
+        formatted_response["body"] = base64.b64encode(
+            compress(body, content_encoding)
+        ).decode("ascii")
+        formatted_response["isBase64Encoded"] = True
+
+    def offload_body(self, formatted_response: dict, body: bytes):
+        """
+        Replace a body too large for a Lambda response with a presigned url to a copy
+        of it in the app storage bucket.
+        """
+        bucket_name = file_storage_service.get_app_storage_bucket()
+        key = f"{API_RESPONSE_OFFLOAD_KEY_PREFIX}/{uuid4()}.json"
+        uploaded = file_storage_service.upload(
+            bucket_name=bucket_name,
+            key=key,
+            content=body,
+            ContentType="application/json",
+        )
+
+        self.headers.pop("Content-Encoding", None)
+        self.headers.pop("Vary", None)
+        if "ETag" in self.headers:
+            self.headers["ETag"] = build_etag(body)
+        formatted_response.pop("isBase64Encoded", None)
+        if uploaded is None:
+            formatted_response["statusCode"] = 500
+            formatted_response["body"] = json_util.dumps(
+                {"message": "Response too large"}
+            )
+            return formatted_response
+
+        formatted_response["body"] = json_util.dumps(
+            {
+                "offloaded_response": {
+                    "url": file_storage_service.generate_presigned_download_url(
+                        bucket_name=bucket_name,
+                        key=key,
+                        expires_in=API_RESPONSE_OFFLOAD_URL_EXPIRES_IN,
+                    ),
+                    "expires_in": API_RESPONSE_OFFLOAD_URL_EXPIRES_IN,
+                    "content_type": "application/json",
+                    "content_length": len(body),
+                }
+            }
+        )
         return formatted_response
 
+    def set_etag(self, body: bytes, content_encoding: str = None):
+        etag = build_etag(body, content_encoding)
+        self.headers["ETag"] = etag
+        self.headers["Access-Control-Expose-Headers"] = "ETag"
+
+        if is_etag_matched(
+            get_request_header(self.request_headers, "If-None-Match"), etag
+        ):
+            self.status_code = 304
+            self.body = None
+
+
+def is_payload_too_large(formatted_response: dict, body: bytes):
+    """
+    Whether the serialized proxy response reaches API_RESPONSE_OFFLOAD_MIN_BYTES. The
+    body is JSON escaped in it, so its size is measured on the serialized response.
+    """
+    # escaping at most doubles a JSON body and a base64 compressed body is smaller
+    # still, only responses that may be too large are serialized to be measured
+    if len(body) * 2 < API_RESPONSE_OFFLOAD_MIN_BYTES:
+        return False
+
+    return (
+        len(json_util.dumps_bytes(formatted_response)) >= API_RESPONSE_OFFLOAD_MIN_BYTES
+    )
+
+
+def build_etag(body: bytes, content_encoding: str = None):
+    """
+    Strong ETag of a representation, a compressed body gets its own ETag since its
+    bytes differ from the identity body.
+    """
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    if content_encoding is None:
+        return f'"{digest}"'
+
+    return f'"{digest}-{content_encoding}"'
+
+
+def is_etag_matched(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses the weak comparison, W/ prefixes are ignored
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def negotiate_content_encoding(accept_encoding: str):
+    """
+    Pick br or gzip from an Accept-Encoding header, honouring q values, or None for identity.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.strip().partition(";")
+        quality = 1.0
+        if parameters.strip().startswith("q="):
+            try:
+                quality = float(parameters.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    wildcard_quality = qualities.get("*", 0.0)
+    supported_encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    candidates = [
+        (qualities.get(encoding, wildcard_quality), encoding)
+        for encoding in supported_encodings
+    ]
+    # the first supported encoding wins a tie, brotli compresses JSON tighter
+    quality, encoding = max(candidates, key=lambda candidate: candidate[0])
+
+    return encoding if quality > 0 else None
+
+
+def compress(body: bytes, content_encoding: str):
+    if content_encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+
 
 def set_access_control_allow_origin(request_headers: dict = None):
     if request_headers is None:
@@ -1,36 +1,42 @@
+import os
+
 from api_lib.auth.authorization import (
     authorize,
     Authorization,
     ActionType,
+    RateLimit,
     ResourceAccess,
 )
+from api_lib.health.api_health import health_check_response
 from api_lib.request.api_request import ApiRequest, api
+from api_lib.request.api_router import api_router
 from api_lib.response.api_response import ApiResponse
 from core_lib.services.auth import auth_service
 from core_lib.services.search import search_service
 from core_lib.utils.lambda_util import lambda_handler
 
+# requests per principal per minute
+SEARCH_USERS_RATE_LIMIT = int(os.getenv("SEARCH_USERS_RATE_LIMIT", "60"))
 
-@lambda_handler()
-@api(skip_access_log=True)
-def health(api_request: ApiRequest):
-    auth_service.health_check()
+HEALTH_PROBES = {
+    "auth": auth_service.health_check,
+    "search": search_service.health_check,
+}
 
-    search_service.health_check()
 
-    return ApiResponse(
-        request_headers=api_request.headers,
-        status_code=200,
-        response_body=None,
-    ).format(skip_access_log=True)
+@lambda_handler(log_event=False)
+@api(skip_access_log=True)
+def health(api_request: ApiRequest):
+    return health_check_response(api_request=api_request, probes=HEALTH_PROBES)
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
         action_type=ActionType.List,
         resource_access=ResourceAccess.AccessSearch,
+        rate_limit=RateLimit(limit=SEARCH_USERS_RATE_LIMIT),
     )
 )
 def search_users(api_request: ApiRequest):
@@ -41,3 +47,12 @@ def search_users(api_request: ApiRequest):
         status_code=200,
         response_body=search_service.search_users(search_str=search_str),
     ).format()
+
+
+# API Gateway (method, resource) of every handler above
+ROUTES = {
+    ("GET", "/v1.0/health"): health,
+    ("POST", "/v1.0/search/user"): search_users,
+}
+
+route = api_router(ROUTES)
@@ -1,33 +1,44 @@
+import os
+
 from api_lib.auth.authorization import (
     authorize,
     Authorization,
     ResourceAccess,
     ActionType,
+    RateLimit,
 )
+from api_lib.health.api_health import health_check_response
+from api_lib.request.api_idempotency import idempotent
 from api_lib.request.api_request import ApiRequest, api
+from api_lib.request.api_router import api_router
 from api_lib.response.api_response import ApiResponse
 from core_lib.data_access.user import user_data_access, user_association_data_access
+from core_lib.exceptions.types import AppException
 from core_lib.services.auth import auth_service
 from core_lib.services.database import database_service
 from core_lib.utils.lambda_util import lambda_handler
 from core_lib.utils.thread_util import safe_get_thread_attribute
 
+# clients revalidate with If-None-Match before reusing a cached user
+GET_USER_CACHE_CONTROL = os.getenv("GET_USER_CACHE_CONTROL", "private, no-cache")
+BATCH_GET_USERS_MAX_IDS = int(os.getenv("BATCH_GET_USERS_MAX_IDS", "100"))
+# requests per principal per minute
+GET_USER_RATE_LIMIT = int(os.getenv("GET_USER_RATE_LIMIT", "300"))
+BATCH_GET_USERS_RATE_LIMIT = int(os.getenv("BATCH_GET_USERS_RATE_LIMIT", "60"))
 
-@lambda_handler()
-@api(skip_access_log=True)
-def health(api_request: ApiRequest):
-    auth_service.health_check()
+HEALTH_PROBES = {
+    "auth": auth_service.health_check,
+    "database": database_service.health_check,
+}
 
-    database_service.health_check()
 
-    return ApiResponse(
-        request_headers=api_request.headers,
-        status_code=200,
-        response_body=None,
-    ).format(skip_access_log=True)
+@lambda_handler(log_event=False)
+@api(skip_access_log=True)
+def health(api_request: ApiRequest):
+    return health_check_response(api_request=api_request, probes=HEALTH_PROBES)
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
@@ -36,21 +47,36 @@ def health(api_request: ApiRequest):
     )
 )
 def query(api_request: ApiRequest):
+    query_parameters = api_request.query_parameters or {}
     return ApiResponse(
         api_request.headers,
         status_code=200,
         response_body=user_association_data_access.query_associated_users_with_profiles(
-            user_a_id=safe_get_thread_attribute("principle")
+            user_a_id=safe_get_thread_attribute("principle"),
+            limit=get_page_limit(query_parameters.get("limit")),
+            cursor=query_parameters.get("cursor"),
+            fields=api_request.get_fields(user_data_access.USER_PROFILE_FIELDS),
         ),
     ).format()
 
 
-@lambda_handler()
+def get_page_limit(limit: str):
+    if limit is None:
+        return None
+
+    if not limit.isdigit() or int(limit) < 1:
+        raise AppException(message="limit must be a positive integer", code=400)
+
+    return int(limit)
+
+
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
         action_type=ActionType.Get,
         resource_access=ResourceAccess.AccessUser,
+        rate_limit=RateLimit(limit=GET_USER_RATE_LIMIT),
     )
 )
 def get(api_request: ApiRequest):
@@ -60,12 +86,70 @@ def get(api_request: ApiRequest):
         status_code=200,
         response_body=user_data_access.find_user_by_id(
             _id=path_parameters.get("id"),
-            projection_expression="profile,username,first_name,last_name,email,entity_status",
+            fields=api_request.get_fields(user_data_access.USER_PROFILE_FIELDS),
         ),
+        etag=True,
+        cache_control=GET_USER_CACHE_CONTROL,
     ).format()
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
+@api()
+@authorize(
+    Authorization(
+        action_type=ActionType.BatchGet,
+        resource_access=ResourceAccess.AccessUser,
+        rate_limit=RateLimit(limit=BATCH_GET_USERS_RATE_LIMIT),
+    )
+)
+def batch_get(api_request: ApiRequest):
+    """
+    Users keyed by id, unreadable ids get a per id error rather than failing the batch.
+    """
+    ids = get_batch_ids(api_request.body)
+    fields = api_request.get_fields(user_data_access.USER_PROFILE_FIELDS)
+
+    is_authorized_by_id = api_request.authorization.is_principle_authorized_many(ids)
+    users_by_id = user_data_access.find_users_by_ids(
+        _ids=[_id for _id in ids if is_authorized_by_id[_id]], fields=fields
+    )
+
+    results = {}
+    for _id in ids:
+        if not is_authorized_by_id[_id]:
+            results[_id] = build_batch_error("FORBIDDEN", "access denied")
+        elif _id not in users_by_id:
+            results[_id] = build_batch_error("NOT_FOUND", "user not found")
+        else:
+            results[_id] = {"user": users_by_id[_id]}
+
+    return ApiResponse(
+        api_request.headers,
+        status_code=200,
+        response_body={"results": results},
+    ).format()
+
+
+def get_batch_ids(body):
+    ids = body.get("ids") if isinstance(body, dict) else None
+    if (
+        not isinstance(ids, list)
+        or not 0 < len(ids) <= BATCH_GET_USERS_MAX_IDS
+        or not all(isinstance(_id, str) and _id for _id in ids)
+    ):
+        raise AppException(
+            message=f"ids must be a list of 1 to {BATCH_GET_USERS_MAX_IDS} user ids",
+            code=400,
+        )
+
+    return list(dict.fromkeys(ids))
+
+
+def build_batch_error(code: str, message: str):
+    return {"error": {"code": code, "message": message}}
+
+
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
@@ -84,7 +168,7 @@ def update(api_request: ApiRequest):
     ).format()
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
@@ -102,7 +186,7 @@ def delete(api_request: ApiRequest):
     ).format()
 
 
-@lambda_handler()
+@lambda_handler(log_event=False)
 @api()
 @authorize(
     Authorization(
@@ -110,6 +194,7 @@ def delete(api_request: ApiRequest):
         resource_access=ResourceAccess.AccessUser,
     )
 )
+@idempotent()
 def associate(api_request: ApiRequest):
     path_parameters = api_request.path_parameters
     return ApiResponse(
@@ -120,3 +205,18 @@ def associate(api_request: ApiRequest):
             user_b_id=path_parameters.get("id"),
         ),
     ).format()
+
+
+# API Gateway (method, resource) of every handler above
+ROUTES = {
+    ("GET", "/v1.0/health"): health,
+    ("GET", "/v1.0/user"): query,
+    ("POST", "/v1.0/user/batch-get"): batch_get,
+    ("GET", "/v1.0/user/{id}"): get,
+    ("PATCH", "/v1.0/user/{id}"): update,
+    ("DELETE", "/v1.0/user/{id}"): delete,
+    ("PUT", "/v1.0/user/{id}/associate"): associate,
+}
+
+# entry point of the single function deployment
+route = api_router(ROUTES)
@@ -1,6 +1,5 @@
-import json
-
 from core_lib.services.auth import auth_service
+from core_lib.utils import json_util
 from core_lib.utils.lambda_util import lambda_handler
 from core_lib.utils.log_util import log_unexpected_exception, log_warning
 
@@ -9,7 +8,7 @@ from core_lib.utils.log_util import log_unexpected_exception, log_warning
 def handle_auth_event(event):
     for record in event.get("Records", []):
         try:
-            message = json.loads(record.get("body"))
+            message = json_util.loads(record.get("body"))
             event_type = message.get("event_type")
             handler = EVENT_TYPE_HANDLERS.get(event_type)
             if not handler:
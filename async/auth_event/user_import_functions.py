@@ -0,0 +1,35 @@
+import os
+
+from core_lib.services.auth import user_import_service
+from core_lib.services.cloud_function import function_service
+from core_lib.utils.lambda_util import lambda_handler
+from core_lib.utils.thread_util import safe_get_thread_attribute
+
+# stop early enough to finish the in flight chunk and checkpoint before the timeout
+USER_IMPORT_STOP_REMAINING_MILLIS = int(
+    os.getenv("USER_IMPORT_STOP_REMAINING_MILLIS", "120000")
+)
+
+
+@lambda_handler()
+def import_users(event):
+    context = safe_get_thread_attribute("context")
+    import_id = event.get("import_id") or event["key"].rsplit("/", 1)[-1]
+
+    checkpoint = user_import_service.import_users(
+        bucket_name=event["bucket_name"],
+        key=event["key"],
+        import_id=import_id,
+        should_stop=lambda: context.get_remaining_time_in_millis()
+        < USER_IMPORT_STOP_REMAINING_MILLIS,
+    )
+
+    if checkpoint["status"] != user_import_service.IMPORT_COMPLETE:
+        # continue from the checkpoint in a fresh invocation
+        function_service.invoke_function_async(
+            function_name=context.function_name,
+            payload={**event, "import_id": import_id},
+        )
+
+    print(f"user import: {checkpoint}")
+    return checkpoint
@@ -1,5 +1,3 @@
-import json
-
 import boto3
 
 from core_lib.services.database.impl.dynamodb_service import dynamodb_json_to_json
@@ -7,6 +5,7 @@ from core_lib.services.parameter.parameter_service import (
     get_parameter_value,
     ParameterName,
 )
+from core_lib.utils import json_util
 from core_lib.utils.lambda_util import lambda_handler
 from core_lib.utils.log_util import log_unexpected_exception, log_warning, log_info
 from user.user_lifecycle_events import handle_user_event
@@ -45,6 +44,8 @@ def handle_db_event(event):
             if not entity_type:
                 log_warning(f"missing EntityType attribute: {new_image}")
                 continue
+            if entity_type in IGNORED_ENTITY_TYPES:
+                continue
             entity_type_handler = ENTITY_TYPES.get(entity_type)
 
             if not entity_type_handler:
@@ -61,6 +62,9 @@ def handle_db_event(event):
 
 ENTITY_TYPES = {"user": handle_user_event}
 
+# short lived request bookkeeping, neither replicated to search nor to the data lake
+IGNORED_ENTITY_TYPES = {"idempotency_record", "rate_limit"}
+
 
 def put_firehose_record(event_name, old_image, new_image):
     record = new_image if event_name in ["INSERT", "MODIFY"] else old_image
@@ -75,5 +79,5 @@ def put_firehose_record(event_name, old_image, new_image):
 
     firehose.put_record(
         DeliveryStreamName=delivery_stream_name,
-        Record={"Data": json.dumps(record)},
+        Record={"Data": json_util.dumps_bytes(record)},
     )
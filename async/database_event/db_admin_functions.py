@@ -1,5 +1,6 @@
 import os
 
+from core_lib.data_access.user import user_existence_data_access
 from core_lib.services.cloud_function.impl import lambda_service
 from core_lib.utils.cloudformation_custom_resource_util import send_cfn_response
 from core_lib.utils.lambda_util import lambda_handler
@@ -19,3 +20,10 @@ def create_trigger(event):
         "SUCCESS",
         {"Message": "Lambda function triggered"},
     )
+
+
+@lambda_handler()
+def rebuild_user_existence_filter(event):
+    user_count = user_existence_data_access.rebuild_user_existence_filter()
+    print(f"user existence filter rebuilt with {user_count} users")
+    return {"user_count": user_count}
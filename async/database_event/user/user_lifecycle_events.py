@@ -1,4 +1,6 @@
+from core_lib.data_access.user import user_existence_data_access
 from core_lib.services.search import search_service
+from core_lib.utils.log_util import log_unexpected_exception
 import os
 
 
@@ -13,6 +15,13 @@ def user_inserted(old_image, new_image):
     if is_search_enabled():
         search_service.upsert_user(new_image)
 
+    # last and isolated, a contended filter must not cost the search upsert or the
+    # firehose record of the user
+    try:
+        user_existence_data_access.add_users_to_existence_filter([new_image["profile"]])
+    except Exception as e:
+        log_unexpected_exception(e)
+
 
 def user_modified(old_image, new_image):
     print(f"user_modified: {old_image} {new_image}")
@@ -0,0 +1,264 @@
+"""
+Serve an API in-process, without SAM or Docker, for local load testing.
+
+HTTP requests are turned into API Gateway proxy events and dispatched to the decorated
+controller handlers through their router, on a bounded pool of worker threads.
+
+    python scripts/local_server.py user --port 3000 --workers 32
+
+AWS calls go to the configured account, or to stand-ins such as DynamoDB local or
+LocalStack through the standard endpoint variables, e.g. AWS_ENDPOINT_URL or
+AWS_ENDPOINT_URL_DYNAMODB, together with the app variables the handlers read (DB_TABLE, ...).
+"""
+
+import argparse
+import base64
+import importlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LAYER_PATHS = [
+    os.path.join(
+        PROJECT_ROOT,
+        "api",
+        "layers",
+        "api_layer",
+        "python",
+        "lib",
+        "python3.9",
+        "site-packages",
+    ),
+    os.path.join(
+        PROJECT_ROOT,
+        "shared_layers",
+        "core_layer",
+        "python",
+        "lib",
+        "python3.9",
+        "site-packages",
+    ),
+]
+LAMBDA_TIMEOUT_MILLIS = 30000
+
+
+class LocalLambdaContext:
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid4())
+        self.log_stream_name = "local"
+        self.deadline = time.monotonic() + LAMBDA_TIMEOUT_MILLIS / 1000
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self.deadline - time.monotonic()) * 1000))
+
+
+def build_resource_matchers(routes: dict):
+    """
+    Regex per API Gateway resource, static resources first so /user/batch-get is not
+    taken for /user/{id}.
+    """
+    resources = sorted(
+        {resource for _, resource in routes}, key=lambda r: (r.count("{"), r)
+    )
+
+    return [
+        (
+            resource,
+            re.compile(
+                "^"
+                + re.sub(
+                    r"\\{(\w+)(\\\+)?\\}",
+                    lambda m: (
+                        f"(?P<{m.group(1)}>.+)"
+                        if m.group(2)
+                        else f"(?P<{m.group(1)}>[^/]+)"
+                    ),
+                    re.escape(resource),
+                )
+                + "$"
+            ),
+        )
+        for resource in resources
+    ]
+
+
+def match_resource(resource_matchers: list, path: str):
+    for resource, pattern in resource_matchers:
+        match = pattern.match(path)
+        if match:
+            return resource, match.groupdict() or None
+
+    return None, None
+
+
+def build_proxy_event(
+    resource_matchers: list, method: str, url: str, headers: dict, body: bytes
+):
+    """
+    API Gateway REST proxy event for an HTTP request.
+    """
+    split_url = urlsplit(url)
+    resource, path_parameters = match_resource(resource_matchers, split_url.path)
+    multi_value_query_parameters = (
+        parse_qs(split_url.query, keep_blank_values=True) or None
+    )
+
+    return {
+        "resource": resource or split_url.path,
+        "path": split_url.path,
+        "httpMethod": method,
+        "headers": headers or None,
+        "multiValueHeaders": {key: [value] for key, value in headers.items()} or None,
+        "queryStringParameters": (
+            {key: values[-1] for key, values in multi_value_query_parameters.items()}
+            if multi_value_query_parameters
+            else None
+        ),
+        "multiValueQueryStringParameters": multi_value_query_parameters,
+        "pathParameters": path_parameters,
+        "stageVariables": None,
+        "requestContext": {
+            "resourcePath": resource or split_url.path,
+            "httpMethod": method,
+            "path": split_url.path,
+            "stage": "local",
+            "requestId": str(uuid4()),
+            "requestTimeEpoch": int(time.time() * 1000),
+            "identity": {"sourceIp": "127.0.0.1"},
+        },
+        # the APIs declare */* as binary media types, so API Gateway encodes every body
+        "body": base64.b64encode(body).decode("ascii") if body else None,
+        "isBase64Encoded": bool(body),
+    }
+
+
+def build_request_handler(api_name: str, router, resource_matchers: list):
+    class LocalApiRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def handle_any(self):
+            content_length = int(self.headers.get("Content-Length") or 0)
+            event = build_proxy_event(
+                resource_matchers=resource_matchers,
+                method=self.command,
+                url=self.path,
+                headers=dict(self.headers.items()),
+                body=self.rfile.read(content_length) if content_length else b"",
+            )
+
+            try:
+                response = router(event, LocalLambdaContext(f"{api_name}-local"))
+            except Exception:
+                # a Lambda raising surfaces as a 502 from API Gateway
+                response = {
+                    "statusCode": 502,
+                    "body": '{"message":"Internal server error"}',
+                }
+
+            self.write_response(response)
+
+        def write_response(self, response: dict):
+            body = response.get("body") or b""
+            if response.get("isBase64Encoded"):
+                body = base64.b64decode(body)
+            elif isinstance(body, str):
+                body = body.encode("utf-8")
+
+            self.send_response(response.get("statusCode", 200))
+            for key, value in (response.get("headers") or {}).items():
+                if key.lower() not in ("content-length", "connection"):
+                    self.send_header(key, str(value))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # the handlers write their own access logs
+            pass
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = handle_any
+
+    return LocalApiRequestHandler
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """
+    HTTPServer handling each connection on a bounded pool of worker threads.
+    """
+
+    def __init__(self, server_address, request_handler_class, max_workers: int):
+        super().__init__(server_address, request_handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def load_controller(api_name: str):
+    for path in [os.path.join(PROJECT_ROOT, "api", api_name), *LAYER_PATHS]:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    # there is no X-Ray daemon or segment outside of Lambda
+    os.environ.setdefault("AWS_XRAY_SDK_ENABLED", "false")
+    os.environ.setdefault("AWS_XRAY_CONTEXT_MISSING", "IGNORE_ERROR")
+
+    return importlib.import_module(f"{api_name}_controller")
+
+
+def create_server(api_name: str, host: str, port: int, max_workers: int):
+    controller = load_controller(api_name)
+    request_handler_class = build_request_handler(
+        api_name=api_name,
+        router=controller.route,
+        resource_matchers=build_resource_matchers(controller.ROUTES),
+    )
+
+    return ThreadPoolHTTPServer((host, port), request_handler_class, max_workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("api", choices=["auth", "search", "user"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    # a keep-alive connection holds its worker, use at least one worker per client connection
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    server = create_server(
+        api_name=args.api, host=args.host, port=args.port, max_workers=args.workers
+    )
+    print(
+        f"serving the {args.api} API on http://{args.host}:{args.port} with {args.workers} workers"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
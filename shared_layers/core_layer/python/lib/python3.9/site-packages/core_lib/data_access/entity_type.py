@@ -4,3 +4,5 @@ from enum import Enum
 class EntityType(Enum):
     User = "user"
     UserAssociation = "user_association"
+    IdempotencyRecord = "idempotency_record"
+    RateLimit = "rate_limit"
@@ -0,0 +1,62 @@
+import os
+import time
+
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_data_model import (
+    IDEMPOTENCY_RECORD_COMPLETE,
+    IDEMPOTENCY_RECORD_EXPIRES_AT,
+)
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_repository import (
+    IdempotencyDynamoDBRepository,
+)
+
+IDEMPOTENCY_DATA_ACCESS_IMPL = IdempotencyDynamoDBRepository()
+
+# how long a completed response is replayed for retries of the same key
+IDEMPOTENCY_RECORD_TTL_SECONDS = int(
+    os.getenv("IDEMPOTENCY_RECORD_TTL_SECONDS", "86400")
+)
+# how long a request that never completed, e.g. a timed out Lambda, blocks its key
+IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS = int(
+    os.getenv("IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS", "60")
+)
+IDEMPOTENCY_ACQUIRE_MAX_ATTEMPTS = 3
+
+
+def acquire_idempotency_record(record_id: str, fingerprint: str):
+    """
+    None when the caller now owns the record and should execute the request, otherwise
+    the unexpired record of an earlier request with the same id.
+    """
+    now = int(time.time())
+    for _ in range(IDEMPOTENCY_ACQUIRE_MAX_ATTEMPTS):
+        is_created = IDEMPOTENCY_DATA_ACCESS_IMPL.create_idempotency_record(
+            record_id=record_id,
+            fingerprint=fingerprint,
+            expires_at=now + IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS,
+            now=now,
+        )
+        if is_created:
+            return None
+
+        record = IDEMPOTENCY_DATA_ACCESS_IMPL.find_idempotency_record(record_id)
+        # the record can be released between the failed create and the read
+        if record is not None:
+            return record
+
+    raise Exception(f"unable to acquire idempotency record: {record_id}")
+
+
+def complete_idempotency_record(record_id: str, response: dict):
+    return IDEMPOTENCY_DATA_ACCESS_IMPL.update_idempotency_record(
+        record_id=record_id,
+        updates={
+            "record_status": IDEMPOTENCY_RECORD_COMPLETE,
+            "stored_response": response,
+            IDEMPOTENCY_RECORD_EXPIRES_AT: int(time.time())
+            + IDEMPOTENCY_RECORD_TTL_SECONDS,
+        },
+    )
+
+
+def release_idempotency_record(record_id: str):
+    return IDEMPOTENCY_DATA_ACCESS_IMPL.delete_idempotency_record(record_id=record_id)
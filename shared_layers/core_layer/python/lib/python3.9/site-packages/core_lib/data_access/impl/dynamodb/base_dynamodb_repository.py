@@ -7,12 +7,12 @@ class BaseDynamoDBRepository:
         self.db_service = dynamodb_service
         self.data_model = data_model
 
-    def put_item(self, item):
-        return self.db_service.put_item(item=item, data_model=self.data_model)
+    def put_item(self, item, **kwargs):
+        return self.db_service.put_item(item=item, data_model=self.data_model, **kwargs)
 
-    def get_item(self, key, projection_expression: str = None):
+    def get_item(self, key, projection_expression: str = None, fields: list = None):
         return self.db_service.get_item(
-            Key=key, ProjectionExpression=projection_expression
+            Key=key, **self.db_service.build_projection(fields, projection_expression)
         )
 
     def update_item(self, key, updates: dict):
@@ -28,8 +28,22 @@ class BaseDynamoDBRepository:
             key=key, updates={"is_deleted": True}, data_model=self.data_model
         )
 
-    def query(self, **kwargs):
-        return self.db_service.query_items(**kwargs)
+    def query(self, fields: list = None, **kwargs):
+        projection_expression = kwargs.pop("ProjectionExpression", None)
+        return self.db_service.query_items(
+            **kwargs, **self.db_service.build_projection(fields, projection_expression)
+        )
+
+    def batch_get_item(self, fields: list = None, **kwargs):
+        if fields:
+            for table_request in kwargs.get("RequestItems", {}).values():
+                table_request.update(self.db_service.build_projection(fields))
 
-    def batch_get_item(self, **kwargs):
         return self.db_service.batch_get_item(**kwargs)
+
+    def batch_get_items(
+        self, keys: list, projection_expression: str = None, fields: list = None
+    ):
+        return self.db_service.batch_get_items(
+            keys=keys, **self.db_service.build_projection(fields, projection_expression)
+        )
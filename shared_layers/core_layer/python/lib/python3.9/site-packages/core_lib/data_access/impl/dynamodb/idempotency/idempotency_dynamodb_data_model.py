@@ -0,0 +1,117 @@
+from core_lib.data_access.entity_type import EntityType
+from core_lib.data_access.impl.dynamodb.base_dynamodb_data_model import (
+    BASE_DYNAMODB_DATA_MODEL_SCHEMA,
+    DynamoDBItem,
+)
+from core_lib.services.database.impl.dynamodb_service import build_new_item
+from core_lib.utils.json_schema_util import (
+    get_schema_validator,
+    JSON_SCHEMA_2020_12_DRAFT,
+    STRING,
+    NON_NEGATIVE_NUMBER,
+)
+
+IDEMPOTENCY_RECORD_ENTITY_TYPE = EntityType.IdempotencyRecord
+
+IDEMPOTENCY_RECORD_IN_PROGRESS = "IN_PROGRESS"
+IDEMPOTENCY_RECORD_COMPLETE = "COMPLETE"
+
+# the table's TimeToLiveSpecification attribute, in epoch seconds
+IDEMPOTENCY_RECORD_EXPIRES_AT = "expires_at"
+
+IDEMPOTENCY_RECORD_STATUS = {
+    "type": "string",
+    "enum": [IDEMPOTENCY_RECORD_IN_PROGRESS, IDEMPOTENCY_RECORD_COMPLETE],
+}
+
+IDEMPOTENCY_RECORD_DATA_MODEL_SCHEMA = {
+    **BASE_DYNAMODB_DATA_MODEL_SCHEMA,
+    "title": "IdempotencyRecordDataModel",
+    "type": "object",
+    "properties": {
+        **BASE_DYNAMODB_DATA_MODEL_SCHEMA["properties"],
+        "pk": {
+            "type": "string",
+            "pattern": f"^{IDEMPOTENCY_RECORD_ENTITY_TYPE.value}-[0-9a-f]{{64}}$",
+        },
+        "sk": {"const": IDEMPOTENCY_RECORD_ENTITY_TYPE.value},
+        "entity_type": {"const": IDEMPOTENCY_RECORD_ENTITY_TYPE.value},
+        "record_status": IDEMPOTENCY_RECORD_STATUS,
+        "fingerprint": STRING,
+        IDEMPOTENCY_RECORD_EXPIRES_AT: NON_NEGATIVE_NUMBER,
+    },
+    "required": [
+        *BASE_DYNAMODB_DATA_MODEL_SCHEMA["required"],
+        "record_status",
+        "fingerprint",
+        IDEMPOTENCY_RECORD_EXPIRES_AT,
+    ],
+}
+
+IDEMPOTENCY_RECORD_JSON_SCHEMA_VALIDATOR = None
+
+
+IDEMPOTENCY_RECORD_ALLOWED_UPDATES_SCHEMA = {
+    **JSON_SCHEMA_2020_12_DRAFT,
+    "title": "IdempotencyRecordAllowedUpdatesDataModel",
+    "type": "object",
+    "properties": {
+        "record_status": IDEMPOTENCY_RECORD_STATUS,
+        "stored_response": {"type": "object"},
+        IDEMPOTENCY_RECORD_EXPIRES_AT: NON_NEGATIVE_NUMBER,
+    },
+    "additionalProperties": False,
+}
+
+IDEMPOTENCY_RECORD_ALLOWED_UPDATES_JSON_SCHEMA_VALIDATOR = None
+
+
+def get_idempotency_record_json_schema_validator():
+    global IDEMPOTENCY_RECORD_JSON_SCHEMA_VALIDATOR
+
+    if IDEMPOTENCY_RECORD_JSON_SCHEMA_VALIDATOR is None:
+        IDEMPOTENCY_RECORD_JSON_SCHEMA_VALIDATOR = get_schema_validator(
+            schema=IDEMPOTENCY_RECORD_DATA_MODEL_SCHEMA
+        )
+
+    return IDEMPOTENCY_RECORD_JSON_SCHEMA_VALIDATOR
+
+
+def get_idempotency_record_allowed_updates_json_schema_validator():
+    global IDEMPOTENCY_RECORD_ALLOWED_UPDATES_JSON_SCHEMA_VALIDATOR
+
+    if IDEMPOTENCY_RECORD_ALLOWED_UPDATES_JSON_SCHEMA_VALIDATOR is None:
+        IDEMPOTENCY_RECORD_ALLOWED_UPDATES_JSON_SCHEMA_VALIDATOR = get_schema_validator(
+            schema=IDEMPOTENCY_RECORD_ALLOWED_UPDATES_SCHEMA
+        )
+
+    return IDEMPOTENCY_RECORD_ALLOWED_UPDATES_JSON_SCHEMA_VALIDATOR
+
+
+def build_idempotency_record_key(record_id: str):
+    return {
+        "pk": f"{IDEMPOTENCY_RECORD_ENTITY_TYPE.value}-{record_id}",
+        "sk": IDEMPOTENCY_RECORD_ENTITY_TYPE.value,
+    }
+
+
+def build_new_idempotency_record(idempotency_record: dict):
+    item = {
+        **build_idempotency_record_key(idempotency_record["record_id"]),
+        "entity_type": IDEMPOTENCY_RECORD_ENTITY_TYPE.value,
+        "record_status": IDEMPOTENCY_RECORD_IN_PROGRESS,
+        "fingerprint": idempotency_record["fingerprint"],
+        IDEMPOTENCY_RECORD_EXPIRES_AT: idempotency_record[
+            IDEMPOTENCY_RECORD_EXPIRES_AT
+        ],
+    }
+    return build_new_item(item)
+
+
+class IdempotencyRecordDynamoDBItem(DynamoDBItem):
+    def __init__(self):
+        super().__init__(
+            new_item_builder=build_new_idempotency_record,
+            put_item_validator=get_idempotency_record_json_schema_validator(),
+            update_item_validator=get_idempotency_record_allowed_updates_json_schema_validator(),
+        )
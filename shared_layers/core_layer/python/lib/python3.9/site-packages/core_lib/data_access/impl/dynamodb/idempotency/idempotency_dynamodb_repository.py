@@ -0,0 +1,56 @@
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from core_lib.data_access.impl.dynamodb.base_dynamodb_repository import (
+    BaseDynamoDBRepository,
+)
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_data_model import (
+    IDEMPOTENCY_RECORD_EXPIRES_AT,
+    IdempotencyRecordDynamoDBItem,
+    build_idempotency_record_key,
+)
+
+
+class IdempotencyDynamoDBRepository(BaseDynamoDBRepository):
+    def __init__(self):
+        super().__init__(data_model=IdempotencyRecordDynamoDBItem())
+
+    def create_idempotency_record(
+        self, record_id: str, fingerprint: str, expires_at: int, now: int
+    ):
+        """
+        True when the record was created, False when an unexpired record already exists.
+        """
+        try:
+            self.put_item(
+                item={
+                    "record_id": record_id,
+                    "fingerprint": fingerprint,
+                    IDEMPOTENCY_RECORD_EXPIRES_AT: expires_at,
+                },
+                # ttl deletion lags behind expiry, an expired record is taken over
+                ConditionExpression=Attr("pk").not_exists()
+                | Attr(IDEMPOTENCY_RECORD_EXPIRES_AT).lt(now),
+            )
+            return True
+
+        except ClientError as e:
+            if (
+                e.response.get("Error", {}).get("Code")
+                == "ConditionalCheckFailedException"
+            ):
+                return False
+            raise e
+
+    def find_idempotency_record(self, record_id: str):
+        return self.db_service.get_item(
+            Key=build_idempotency_record_key(record_id), ConsistentRead=True
+        )
+
+    def update_idempotency_record(self, record_id: str, updates: dict):
+        return self.update_item(
+            key=build_idempotency_record_key(record_id), updates=updates
+        )
+
+    def delete_idempotency_record(self, record_id: str):
+        return self.delete_item(key=build_idempotency_record_key(record_id))
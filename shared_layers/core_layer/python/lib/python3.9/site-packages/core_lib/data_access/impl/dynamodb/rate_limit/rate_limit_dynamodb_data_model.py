@@ -0,0 +1,13 @@
+from core_lib.data_access.entity_type import EntityType
+
+RATE_LIMIT_ENTITY_TYPE = EntityType.RateLimit
+
+
+def build_rate_limit_key(principle: str, route: str):
+    """
+    One token bucket item per principal and route.
+    """
+    return {
+        "pk": f"{RATE_LIMIT_ENTITY_TYPE.value}-{principle}",
+        "sk": route,
+    }
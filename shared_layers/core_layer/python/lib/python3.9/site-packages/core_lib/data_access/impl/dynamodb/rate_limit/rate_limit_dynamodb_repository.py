@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from core_lib.data_access.impl.dynamodb.base_dynamodb_repository import (
+    BaseDynamoDBRepository,
+)
+from core_lib.data_access.impl.dynamodb.rate_limit.rate_limit_dynamodb_data_model import (
+    RATE_LIMIT_ENTITY_TYPE,
+    build_rate_limit_key,
+)
+
+
+class RateLimitDynamoDBRepository(BaseDynamoDBRepository):
+    def __init__(self):
+        # buckets are only written with conditional updates, never put or validated
+        super().__init__(data_model=None)
+
+    def find_token_bucket(self, principle: str, route: str):
+        """
+        The bucket's tokens, refilled_at and revision as floats and an int, or None
+        when the principal has no bucket on the route.
+        """
+        item = self.db_service.get_item(
+            Key=build_rate_limit_key(principle=principle, route=route),
+            ConsistentRead=True,
+        )
+        if item is None:
+            return None
+
+        return {
+            "tokens": float(item["tokens"]),
+            "refilled_at": float(item["refilled_at"]),
+            "revision": int(item["revision"]),
+        }
+
+    def save_token_bucket(
+        self,
+        principle: str,
+        route: str,
+        tokens: float,
+        refilled_at: float,
+        revision: int,
+        expires_at: int,
+    ):
+        """
+        Write the bucket if it is still at revision, None for a new bucket. True when
+        written, False when another container wrote it first.
+        """
+        try:
+            self.db_service.dynamodb_update_item(
+                Key=build_rate_limit_key(principle=principle, route=route),
+                UpdateExpression="SET tokens = :tokens, refilled_at = :refilled_at, revision = :next_revision, "
+                "entity_type = :entity_type, expires_at = :expires_at",
+                ConditionExpression=(
+                    Attr("pk").not_exists()
+                    if revision is None
+                    else Attr("revision").eq(revision)
+                ),
+                ExpressionAttributeValues={
+                    ":tokens": Decimal(str(round(tokens, 6))),
+                    ":refilled_at": Decimal(str(round(refilled_at, 6))),
+                    ":next_revision": 0 if revision is None else revision + 1,
+                    ":entity_type": RATE_LIMIT_ENTITY_TYPE.value,
+                    ":expires_at": expires_at,
+                },
+            )
+            return True
+
+        except ClientError as e:
+            if (
+                e.response.get("Error", {}).get("Code")
+                == "ConditionalCheckFailedException"
+            ):
+                return False
+            raise e
@@ -82,6 +82,10 @@ def build_formatted_user_id(user_id: str):
     return f"{USER_ENTITY_TYPE.value}-{user_id}"
 
 
+def parse_formatted_user_id(formatted_user_id: str):
+    return formatted_user_id.removeprefix(f"{USER_ENTITY_TYPE.value}-")
+
+
 def build_user_item_key(_id: str) -> dict:
     return {"pk": USER_ENTITY_TYPE.value, "sk": f"{build_formatted_user_id(_id)}"}
 
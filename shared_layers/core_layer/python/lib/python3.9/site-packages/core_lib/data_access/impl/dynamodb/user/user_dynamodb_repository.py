@@ -1,6 +1,10 @@
+from boto3.dynamodb.conditions import Key
+
 from core_lib.data_access.impl.dynamodb.user.user_dynamodb_data_model import (
+    USER_ENTITY_TYPE,
     UserDynamoDBItem,
     build_user_item_key,
+    parse_formatted_user_id,
 )
 from core_lib.data_access.impl.dynamodb.base_dynamodb_repository import (
     BaseDynamoDBRepository,
@@ -11,12 +15,30 @@ class UserDynamoDBRepository(BaseDynamoDBRepository):
     def __init__(self):
         super().__init__(data_model=UserDynamoDBItem())
 
-    def find_user_by_id(self, _id: str, projection_expression: str = None):
+    def find_user_by_id(
+        self, _id: str, projection_expression: str = None, fields: list = None
+    ):
         return self.get_item(
             key=build_user_item_key(_id=_id),
             projection_expression=projection_expression,
+            fields=fields,
+        )
+
+    def find_users_by_ids(self, _ids: list, fields: list = None):
+        # sk identifies each returned item, it is only kept when it was requested
+        is_sk_requested = not fields or "sk" in fields
+        users = self.batch_get_items(
+            keys=[build_user_item_key(_id=_id) for _id in _ids],
+            fields=fields if is_sk_requested else [*fields, "sk"],
         )
 
+        return {
+            parse_formatted_user_id(
+                user["sk"] if is_sk_requested else user.pop("sk")
+            ): user
+            for user in users
+        }
+
     def delete_user_by_id(self, _id: str):
         return self.soft_delete_item(key=build_user_item_key(_id=_id))
 
@@ -26,3 +48,10 @@ class UserDynamoDBRepository(BaseDynamoDBRepository):
     def update_user(self, _id: str, updates: dict):
         key = build_user_item_key(_id=_id)
         return self.update_item(key=key, updates=updates)
+
+    def query_user_profiles(self, exclusive_start_key: dict = None):
+        return self.query(
+            KeyConditionExpression=Key("pk").eq(USER_ENTITY_TYPE.value),
+            ProjectionExpression="profile",
+            ExclusiveStartKey=exclusive_start_key,
+        )
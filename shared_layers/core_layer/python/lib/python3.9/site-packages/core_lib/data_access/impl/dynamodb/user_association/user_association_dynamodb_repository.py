@@ -3,6 +3,7 @@ from boto3.dynamodb.conditions import Key
 from core_lib.data_access.impl.dynamodb.user.user_dynamodb_data_model import (
     USER_ENTITY_TYPE,
     build_formatted_user_id,
+    parse_formatted_user_id,
 )
 from core_lib.data_access.impl.dynamodb.user_association.user_association_dynamodb_data_model import (
     UserAssociationDynamoDBItem,
@@ -21,7 +22,12 @@ class UserAssociationDynamoDBRepository(BaseDynamoDBRepository):
         self.put_item(item=item)
 
     def query_associated_users(
-        self, user_a_id: str, user_b_id: str = None, projection_expression: str = None
+        self,
+        user_a_id: str,
+        user_b_id: str = None,
+        projection_expression: str = None,
+        limit: int = None,
+        exclusive_start_key: dict = None,
     ):
         key_condition_expression = Key("pk").eq(build_formatted_user_id(user_a_id))
 
@@ -38,12 +44,37 @@ class UserAssociationDynamoDBRepository(BaseDynamoDBRepository):
         return self.query(
             KeyConditionExpression=key_condition_expression,
             ProjectionExpression=projection_expression,
+            Limit=limit,
+            ExclusiveStartKey=exclusive_start_key,
         )
 
+    def find_associated_user_ids(self, user_a_id: str, user_b_ids: list):
+        if not user_b_ids:
+            return set()
+
+        formatted_user_a_id = build_formatted_user_id(user_a_id)
+        item_keys = [
+            {"pk": formatted_user_a_id, "sk": build_formatted_user_id(user_b_id)}
+            for user_b_id in user_b_ids
+        ]
+        associations = self.batch_get_items(keys=item_keys, projection_expression="sk")
+
+        return {parse_formatted_user_id(item["sk"]) for item in associations}
+
     def query_associated_users_with_profiles(
-        self, user_a_id: str, user_b_id: str = None
+        self,
+        user_a_id: str,
+        user_b_id: str = None,
+        limit: int = None,
+        exclusive_start_key: dict = None,
+        fields: list = None,
     ):
-        association_users_response = self.query_associated_users(user_a_id, user_b_id)
+        association_users_response = self.query_associated_users(
+            user_a_id,
+            user_b_id,
+            limit=limit,
+            exclusive_start_key=exclusive_start_key,
+        )
         items = association_users_response.get("Items", [])
         last_evaluated_key = association_users_response.get("LastEvaluatedKey")
 
@@ -53,12 +84,7 @@ class UserAssociationDynamoDBRepository(BaseDynamoDBRepository):
         item_keys = [
             {"pk": USER_ENTITY_TYPE.value, "sk": item.get("sk")} for item in items
         ]
-        item_request = {
-            self.db_service.db_table_name(): {
-                "Keys": item_keys,
-                "ProjectionExpression": "profile,username,first_name,last_name,email,entity_status",
-            }
-        }
-        user_profiles = self.batch_get_item(RequestItems=item_request)
+        item_request = {self.db_service.db_table_name(): {"Keys": item_keys}}
+        user_profiles = self.batch_get_item(RequestItems=item_request, fields=fields)
 
         return {"last_evaluated_key": last_evaluated_key, "items": user_profiles}
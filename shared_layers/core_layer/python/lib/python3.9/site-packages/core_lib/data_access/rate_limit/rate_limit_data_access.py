@@ -0,0 +1,128 @@
+import math
+import os
+import threading
+import time
+
+from core_lib.data_access.impl.dynamodb.rate_limit.rate_limit_dynamodb_repository import (
+    RateLimitDynamoDBRepository,
+)
+from core_lib.utils.cache_util import LRUCache
+
+RATE_LIMIT_DATA_ACCESS_IMPL = RateLimitDynamoDBRepository()
+
+# tokens a container takes from a bucket per write, the rest of the claim is spent from
+# memory. Unspent tokens are never returned, so a principal spread over many containers
+# is limited slightly early, never late.
+RATE_LIMIT_MAX_CLAIM = int(os.getenv("RATE_LIMIT_MAX_CLAIM", "10"))
+# claimed tokens are only spent shortly after the claim, so spending can not lag the
+# bucket by more than this
+RATE_LIMIT_CLAIM_TTL_SECONDS = float(os.getenv("RATE_LIMIT_CLAIM_TTL_SECONDS", "1"))
+RATE_LIMIT_MAX_WRITE_ATTEMPTS = 3
+# buckets outlive a full refill so ttl deletion only ever removes full buckets
+RATE_LIMIT_EXPIRY_GRACE_SECONDS = 60
+
+# (principle, route) -> [claimed tokens left, denied until or None]
+RATE_LIMIT_ALLOWANCE_CACHE = LRUCache(
+    max_size=int(os.getenv("RATE_LIMIT_ALLOWANCE_CACHE_MAX_SIZE", "4096"))
+)
+RATE_LIMIT_ALLOWANCE_LOCK = threading.Lock()
+
+
+def get_claim_size(limit: int):
+    return max(1, min(RATE_LIMIT_MAX_CLAIM, limit // 10))
+
+
+def take_token(principle: str, route: str, limit: int, window_seconds: int):
+    """
+    None when the request may proceed, otherwise the seconds until the principal's
+    bucket on the route holds a token again.
+
+    Each principal and route has a token bucket of limit tokens that refills
+    continuously at limit tokens per window_seconds: bursts up to limit, then the
+    refill rate. The bucket is an item updated with a conditional write. Containers
+    claim tokens in small batches and serve most requests from memory, an empty bucket
+    is also remembered until its next token so over limit requests do not call
+    DynamoDB either.
+    """
+    cache_key = (principle, route)
+    now = time.time()
+
+    with RATE_LIMIT_ALLOWANCE_LOCK:
+        allowance = RATE_LIMIT_ALLOWANCE_CACHE.get(cache_key)
+        if allowance is not None:
+            remaining, denied_until = allowance
+            if remaining > 0:
+                RATE_LIMIT_ALLOWANCE_CACHE.set(
+                    cache_key,
+                    [remaining - 1, None],
+                    expires_at=now + RATE_LIMIT_CLAIM_TTL_SECONDS,
+                )
+                return None
+
+            if denied_until is not None and denied_until > now:
+                return max(1, math.ceil(denied_until - now))
+
+    granted, retry_after = claim_tokens(
+        principle=principle,
+        route=route,
+        limit=limit,
+        window_seconds=window_seconds,
+        tokens=get_claim_size(limit),
+    )
+
+    with RATE_LIMIT_ALLOWANCE_LOCK:
+        if granted == 0:
+            RATE_LIMIT_ALLOWANCE_CACHE.set(
+                cache_key, [0, now + retry_after], expires_at=now + retry_after
+            )
+            return retry_after
+
+        # keep what a concurrent request of this container claimed meanwhile
+        remaining, _denied_until = RATE_LIMIT_ALLOWANCE_CACHE.get(cache_key, [0, None])
+        RATE_LIMIT_ALLOWANCE_CACHE.set(
+            cache_key,
+            [remaining + granted - 1, None],
+            expires_at=now + RATE_LIMIT_CLAIM_TTL_SECONDS,
+        )
+        return None
+
+
+def claim_tokens(
+    principle: str, route: str, limit: int, window_seconds: int, tokens: int
+):
+    """
+    Take up to tokens whole tokens from the refilled bucket. Returns the tokens granted
+    and, when none were, the seconds until the bucket holds one.
+    """
+    refill_rate = limit / window_seconds
+
+    for _ in range(RATE_LIMIT_MAX_WRITE_ATTEMPTS):
+        now = time.time()
+        bucket = RATE_LIMIT_DATA_ACCESS_IMPL.find_token_bucket(
+            principle=principle, route=route
+        )
+        available = (
+            limit
+            if bucket is None
+            else min(
+                limit,
+                bucket["tokens"] + (now - bucket["refilled_at"]) * refill_rate,
+            )
+        )
+        if available < 1:
+            return 0, max(1, math.ceil((1 - available) / refill_rate))
+
+        granted = min(tokens, int(available))
+        if RATE_LIMIT_DATA_ACCESS_IMPL.save_token_bucket(
+            principle=principle,
+            route=route,
+            tokens=available - granted,
+            refilled_at=now,
+            revision=None if bucket is None else bucket["revision"],
+            expires_at=math.ceil(now + window_seconds)
+            + RATE_LIMIT_EXPIRY_GRACE_SECONDS,
+        ):
+            return granted, None
+
+    # other containers keep winning the write, the bucket is drained by now
+    return 0, 1
@@ -1,9 +1,33 @@
+import os
+import time
+
 from core_lib.data_access.impl.dynamodb.user_association.user_association_dynamodb_repository import (
     UserAssociationDynamoDBRepository,
 )
+from core_lib.data_access.user.user_data_access import USER_PROFILE_FIELDS
+from core_lib.services.secrets import secrets_service
+from core_lib.utils.cache_util import LRUCache
+from core_lib.utils.cursor_util import decode_cursor, encode_cursor
 
 USER_ASSOCIATION_DATA_ACCESS_IMPL = UserAssociationDynamoDBRepository()
 
+ASSOCIATED_USERS_CACHE_TTL_SECONDS = int(
+    os.getenv("ASSOCIATED_USERS_CACHE_TTL_SECONDS", "60")
+)
+# per container cache of the user ids each principal is known to be associated with.
+# only confirmed associations are cached so a new association is never denied, and
+# a removed association is still allowed until the ttl expires, there is no cross
+# container invalidation
+ASSOCIATED_USERS_CACHE = LRUCache(
+    max_size=int(os.getenv("ASSOCIATED_USERS_CACHE_MAX_SIZE", "1024"))
+)
+
+# a page never needs more than one BatchGetItem for its profiles
+ASSOCIATED_USERS_PAGE_MAX_LIMIT = 100
+ASSOCIATED_USERS_PAGE_DEFAULT_LIMIT = int(
+    os.getenv("ASSOCIATED_USERS_PAGE_DEFAULT_LIMIT", "50")
+)
+
 
 def query_associated_users(user_a_id: str, user_b_id: str = None):
     return USER_ASSOCIATION_DATA_ACCESS_IMPL.query_associated_users(
@@ -11,13 +35,111 @@ def query_associated_users(user_a_id: str, user_b_id: str = None):
     )
 
 
+def is_user_associated(user_a_id: str, user_b_id: str):
+    cached_associated_users = ASSOCIATED_USERS_CACHE.get(user_a_id)
+    if cached_associated_users is not None and user_b_id in cached_associated_users[0]:
+        return True
+
+    associated_resource = next(
+        iter(query_associated_users(user_a_id, user_b_id).get("Items", [])),
+        None,
+    )
+    if associated_resource is None:
+        return False
+
+    cache_associated_user(user_a_id, user_b_id)
+    return True
+
+
+def find_associated_users(user_a_id: str, user_b_ids: list):
+    cached_associated_users = ASSOCIATED_USERS_CACHE.get(user_a_id)
+    cached_associated_user_ids = (
+        cached_associated_users[0] if cached_associated_users else frozenset()
+    )
+
+    uncached_user_b_ids = list(
+        dict.fromkeys(
+            user_b_id
+            for user_b_id in user_b_ids
+            if user_b_id not in cached_associated_user_ids
+        )
+    )
+    associated_user_ids = USER_ASSOCIATION_DATA_ACCESS_IMPL.find_associated_user_ids(
+        user_a_id=user_a_id, user_b_ids=uncached_user_b_ids
+    )
+
+    for user_b_id in associated_user_ids:
+        cache_associated_user(user_a_id, user_b_id)
+
+    return {
+        user_b_id
+        for user_b_id in user_b_ids
+        if user_b_id in cached_associated_user_ids or user_b_id in associated_user_ids
+    }
+
+
+def cache_associated_user(user_a_id: str, user_b_id: str):
+    cached_associated_users = ASSOCIATED_USERS_CACHE.get(user_a_id)
+
+    # adding a member keeps the original expiry so the whole set is re-read every ttl
+    associated_user_ids, expires_at = cached_associated_users or (
+        frozenset(),
+        time.time() + ASSOCIATED_USERS_CACHE_TTL_SECONDS,
+    )
+    ASSOCIATED_USERS_CACHE.set(
+        user_a_id, (associated_user_ids | {user_b_id}, expires_at), expires_at
+    )
+
+
 def associate_users(user_a_id: str, user_b_id: str):
-    return USER_ASSOCIATION_DATA_ACCESS_IMPL.create_user_association(
+    response = USER_ASSOCIATION_DATA_ACCESS_IMPL.create_user_association(
         user_a_id, user_b_id
     )
+    cache_associated_user(user_a_id, user_b_id)
+    return response
 
 
-def query_associated_users_with_profiles(user_a_id: str, user_b_id: str = None):
-    return USER_ASSOCIATION_DATA_ACCESS_IMPL.query_associated_users_with_profiles(
-        user_a_id=user_a_id, user_b_id=user_b_id
+def query_associated_users_with_profiles(
+    user_a_id: str,
+    user_b_id: str = None,
+    limit: int = None,
+    cursor: str = None,
+    fields: list = USER_PROFILE_FIELDS,
+):
+    """
+    One page of associated user profiles, pass the returned cursor back for the next page.
+    """
+    exclusive_start_key = (
+        decode_cursor(
+            cursor,
+            signing_key=secrets_service.get_cursor_signing_key(),
+            scope=user_a_id,
+        )
+        if cursor
+        else None
     )
+
+    response = USER_ASSOCIATION_DATA_ACCESS_IMPL.query_associated_users_with_profiles(
+        user_a_id=user_a_id,
+        user_b_id=user_b_id,
+        limit=min(
+            limit or ASSOCIATED_USERS_PAGE_DEFAULT_LIMIT,
+            ASSOCIATED_USERS_PAGE_MAX_LIMIT,
+        ),
+        exclusive_start_key=exclusive_start_key,
+        fields=fields,
+    )
+
+    last_evaluated_key = response.get("last_evaluated_key")
+    return {
+        "cursor": (
+            encode_cursor(
+                last_evaluated_key,
+                signing_key=secrets_service.get_cursor_signing_key(),
+                scope=user_a_id,
+            )
+            if last_evaluated_key
+            else None
+        ),
+        "items": response.get("items", []),
+    }
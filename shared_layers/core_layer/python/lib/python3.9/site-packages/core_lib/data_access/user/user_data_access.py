@@ -4,13 +4,33 @@ from core_lib.data_access.impl.dynamodb.user.user_dynamodb_repository import (
 
 USER_DATA_ACCESS_IMPL = UserDynamoDBRepository()
 
+# attributes of a user that may be returned to API clients
+USER_PROFILE_FIELDS = (
+    "profile",
+    "username",
+    "first_name",
+    "last_name",
+    "email",
+    "entity_status",
+)
+
 
-def find_user_by_id(_id: str, projection_expression: str = None):
+def find_user_by_id(_id: str, projection_expression: str = None, fields: list = None):
     return USER_DATA_ACCESS_IMPL.find_user_by_id(
-        _id=_id, projection_expression=projection_expression
+        _id=_id, projection_expression=projection_expression, fields=fields
     )
 
 
+def find_users_by_ids(_ids: list, fields: list = None):
+    """
+    Users keyed by id, ids without a user are missing from the result.
+    """
+    if not _ids:
+        return {}
+
+    return USER_DATA_ACCESS_IMPL.find_users_by_ids(_ids=_ids, fields=fields)
+
+
 def delete_user_by_id(_id: str):
     return USER_DATA_ACCESS_IMPL.delete_user_by_id(_id=_id)
 
@@ -21,3 +41,9 @@ def create_user(user):
 
 def update_user(_id: str, updates: dict):
     return USER_DATA_ACCESS_IMPL.update_user(_id=_id, updates=updates)
+
+
+def query_user_profiles(exclusive_start_key: dict = None):
+    return USER_DATA_ACCESS_IMPL.query_user_profiles(
+        exclusive_start_key=exclusive_start_key
+    )
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+
+from core_lib.data_access.user import user_data_access
+from core_lib.services.file_storage import file_storage_service
+from core_lib.utils.bloom_filter_util import BloomFilter
+from core_lib.utils.log_util import log_unexpected_exception, log_warning
+
+USER_EXISTENCE_FILTER_KEY = os.getenv(
+    "USER_EXISTENCE_FILTER_KEY", "indexes/user-existence-filter.bin"
+)
+USER_EXISTENCE_FILTER_TTL_SECONDS = int(
+    os.getenv("USER_EXISTENCE_FILTER_TTL_SECONDS", "300")
+)
+USER_EXISTENCE_FILTER_MIN_RELOAD_SECONDS = int(
+    os.getenv("USER_EXISTENCE_FILTER_MIN_RELOAD_SECONDS", "30")
+)
+USER_EXISTENCE_FILTER_CAPACITY = int(
+    os.getenv("USER_EXISTENCE_FILTER_CAPACITY", "100000")
+)
+USER_EXISTENCE_FILTER_FALSE_POSITIVE_RATE = float(
+    os.getenv("USER_EXISTENCE_FILTER_FALSE_POSITIVE_RATE", "0.01")
+)
+USER_EXISTENCE_FILTER_MAX_WRITE_ATTEMPTS = 5
+
+USER_EXISTENCE_FILTER = None
+USER_EXISTENCE_FILTER_LOADED_AT = 0
+USER_EXISTENCE_FILTER_LOCK = threading.Lock()
+
+
+def might_user_exist(user_id: str):
+    """
+    False only when the user id is definitely unknown, True when the user may exist
+    or when no filter snapshot is available.
+    """
+    user_existence_filter = get_user_existence_filter()
+    if user_existence_filter is None or user_existence_filter.might_contain(user_id):
+        return True
+
+    # the loaded snapshot may predate the user, re-read it before trusting a miss
+    user_existence_filter = get_user_existence_filter(force_refresh=True)
+    return user_existence_filter is None or user_existence_filter.might_contain(user_id)
+
+
+def get_user_existence_filter(force_refresh: bool = False):
+    if is_user_existence_filter_reloadable(force_refresh):
+        with USER_EXISTENCE_FILTER_LOCK:
+            if is_user_existence_filter_reloadable(force_refresh):
+                reload_user_existence_filter()
+
+    return USER_EXISTENCE_FILTER
+
+
+def is_user_existence_filter_reloadable(force_refresh: bool = False):
+    # forced reloads are rate limited so guessed ids can not hammer the snapshot
+    reload_interval = (
+        USER_EXISTENCE_FILTER_MIN_RELOAD_SECONDS
+        if force_refresh
+        else USER_EXISTENCE_FILTER_TTL_SECONDS
+    )
+    return time.time() - USER_EXISTENCE_FILTER_LOADED_AT >= reload_interval
+
+
+def reload_user_existence_filter():
+    global USER_EXISTENCE_FILTER
+    global USER_EXISTENCE_FILTER_LOADED_AT
+
+    USER_EXISTENCE_FILTER = download_user_existence_filter()[0]
+    USER_EXISTENCE_FILTER_LOADED_AT = time.time()
+
+
+def download_user_existence_filter():
+    response = file_storage_service.download(
+        bucket_name=file_storage_service.get_app_storage_bucket(),
+        key=USER_EXISTENCE_FILTER_KEY,
+    )
+    if response is None:
+        return None, None
+
+    try:
+        return BloomFilter.from_bytes(response["Body"].read()), response.get("ETag")
+    except Exception as e:
+        log_unexpected_exception(e)
+        # the etag still lets a rebuild replace the unreadable snapshot
+        return None, response.get("ETag")
+
+
+def upload_user_existence_filter(user_existence_filter: BloomFilter, **kwargs):
+    return file_storage_service.upload(
+        bucket_name=file_storage_service.get_app_storage_bucket(),
+        key=USER_EXISTENCE_FILTER_KEY,
+        content=user_existence_filter.to_bytes(),
+        **kwargs,
+    )
+
+
+def add_users_to_existence_filter(user_ids: list):
+    for _ in range(USER_EXISTENCE_FILTER_MAX_WRITE_ATTEMPTS):
+        user_existence_filter, etag = download_user_existence_filter()
+
+        if user_existence_filter is None:
+            # a filter holding only new users would deny every existing user
+            log_warning("user existence filter missing, rebuild it to enable it")
+            return None
+
+        for user_id in user_ids:
+            user_existence_filter.add(user_id)
+
+        # conditional write so concurrent stream batches never drop each others bits
+        response = upload_user_existence_filter(user_existence_filter, IfMatch=etag)
+        if response is not None:
+            return response
+
+    raise Exception(f"unable to add users to existence filter: {user_ids}")
+
+
+def rebuild_user_existence_filter():
+    for _ in range(USER_EXISTENCE_FILTER_MAX_WRITE_ATTEMPTS):
+        # read before the scan, a stream add made during the scan fails the write below
+        etag = download_user_existence_filter()[1]
+        user_profiles = query_all_user_profiles()
+
+        user_existence_filter = BloomFilter.for_capacity(
+            capacity=max(USER_EXISTENCE_FILTER_CAPACITY, 2 * len(user_profiles)),
+            false_positive_rate=USER_EXISTENCE_FILTER_FALSE_POSITIVE_RATE,
+        )
+        for user_profile in user_profiles:
+            user_existence_filter.add(user_profile)
+
+        response = upload_user_existence_filter(
+            user_existence_filter,
+            **({"IfMatch": etag} if etag is not None else {"IfNoneMatch": "*"}),
+        )
+        if response is not None:
+            return len(user_profiles)
+
+    raise Exception("unable to rebuild user existence filter")
+
+
+def query_all_user_profiles():
+    user_profiles = []
+    exclusive_start_key = None
+
+    while True:
+        response = user_data_access.query_user_profiles(
+            exclusive_start_key=exclusive_start_key
+        )
+        user_profiles.extend(item["profile"] for item in response.get("Items", []))
+        exclusive_start_key = response.get("LastEvaluatedKey")
+
+        if not exclusive_start_key:
+            return user_profiles
@@ -9,6 +9,8 @@ from core_lib.services.queue.queue_service import (
 from core_lib.utils.args_util import get_non_null_kwargs
 
 AUTH_SERVICE_IMPL = cognito_service
+# dispatched on by the replica region's auth event handler
+SIGN_UP_EVENT_TYPE = "replicated_sign_up"
 
 
 def get_user_pool_id():
@@ -23,27 +25,34 @@ def get_known_public_keys():
     return AUTH_SERVICE_IMPL.get_known_public_keys()
 
 
+def get_known_public_key(kid: str):
+    return AUTH_SERVICE_IMPL.get_known_public_key(kid=kid)
+
+
 def replicate_auth_event(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         response = func(*args, **kwargs)
 
-        message = {
-            "event_type": func.__name__,
-            "args": get_non_null_kwargs(**kwargs),
-        }
-        region = os.getenv("REPLICA_REGION")
-        send_message_to_queue(
-            message, region=region, queue_url=get_auth_event_queue_url(region=region)
-        )
+        send_replicated_auth_event(event_type=func.__name__, **kwargs)
 
         return response
 
     return wrapper
 
 
-@replicate_auth_event
-def replicated_sign_up(
+def send_replicated_auth_event(event_type: str, **kwargs):
+    message = {
+        "event_type": event_type,
+        "args": get_non_null_kwargs(**kwargs),
+    }
+    region = os.getenv("REPLICA_REGION")
+    send_message_to_queue(
+        message, region=region, queue_url=get_auth_event_queue_url(region=region)
+    )
+
+
+def replicate_sign_up(
     profile: str,
     username: str,
     email: str,
@@ -51,7 +60,8 @@ def replicated_sign_up(
     first_name: str,
     last_name: str,
 ):
-    return sign_up(
+    send_replicated_auth_event(
+        event_type=SIGN_UP_EVENT_TYPE,
         profile=profile,
         username=username,
         email=email,
@@ -94,6 +104,12 @@ def initiate_user_password_auth(username: str, password: str):
     )
 
 
+def initiate_refresh_token_auth(username: str, refresh_token: str):
+    return AUTH_SERVICE_IMPL.initiate_refresh_token_auth(
+        username=username.lower(), refresh_token=refresh_token
+    )
+
+
 def admin_create_user(
     profile: str,
     username: str,
@@ -122,5 +138,9 @@ def admin_disable_user(username: str):
     )
 
 
+def admin_delete_user(username: str):
+    return AUTH_SERVICE_IMPL.admin_delete_user(username=username)
+
+
 def health_check():
     return AUTH_SERVICE_IMPL.health_check()
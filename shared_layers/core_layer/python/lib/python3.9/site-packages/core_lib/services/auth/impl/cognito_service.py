@@ -1,16 +1,24 @@
 import base64
+import functools
 import hashlib
 import hmac
 import os
+import random
+import threading
+import time
 
 import boto3
+from botocore.exceptions import ClientError
 
 from core_lib.services.parameter.parameter_service import (
     get_parameter_value,
     ParameterName,
 )
 from core_lib.utils import requests_util
-from core_lib.utils.log_util import log_function_call
+from core_lib.utils.cache_util import LRUCache
+from core_lib.utils.log_util import log_function_call, log_warning
+from core_lib.utils.metrics_util import increment_metric
+from core_lib.utils.rate_limit_util import TokenBucket
 from core_lib.utils.requests_util import TIMEOUT
 
 cognito_idp_client = boto3.client("cognito-idp")
@@ -18,7 +26,110 @@ cognito_idp_client = boto3.client("cognito-idp")
 region = os.getenv("region")
 USER_POOL_ID = None
 USER_POOL_CLIENT = None
+
+JWKS_REFRESH_TTL_SECONDS = int(os.getenv("JWKS_REFRESH_TTL_SECONDS", "3600"))
+JWKS_MIN_REFETCH_INTERVAL_SECONDS = int(
+    os.getenv("JWKS_MIN_REFETCH_INTERVAL_SECONDS", "60")
+)
 KNOWN_PUBLIC_KEYS = None
+KNOWN_PUBLIC_KEYS_BY_KID = {}
+KNOWN_PUBLIC_KEYS_REFRESH_AT = None
+LAST_JWKS_FETCH_TIME = None
+JWKS_LOCK = threading.Lock()
+
+APP_CLIENT_SECRET_TTL_SECONDS = int(os.getenv("APP_CLIENT_SECRET_TTL_SECONDS", "900"))
+USER_POOL_CLIENT_DESCRIPTION = None
+USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT = None
+USER_POOL_CLIENT_LOCK = threading.Lock()
+SECRET_HASH_CACHE = LRUCache(
+    max_size=int(os.getenv("SECRET_HASH_CACHE_MAX_SIZE", "256"))
+)
+
+
+# per container requests per second, a fraction of the account wide Cognito quota
+# categories so bursts are smoothed before they reach the user pool
+COGNITO_OPERATION_RATE_LIMITS = {
+    "sign_up": 10,
+    "confirm_sign_up": 10,
+    "admin_create_user": 10,
+    "initiate_auth": 20,
+    "respond_to_auth_challenge": 20,
+    "admin_enable_user": 5,
+    "admin_disable_user": 5,
+    "admin_update_user_attributes": 5,
+    "admin_set_user_password": 5,
+    "admin_delete_user": 5,
+    "describe_user_pool_client": 5,
+}
+COGNITO_DEFAULT_RATE_LIMIT = 5
+COGNITO_THROTTLE_MAX_RETRIES = int(os.getenv("COGNITO_THROTTLE_MAX_RETRIES", "3"))
+COGNITO_THROTTLE_BASE_BACKOFF_SECONDS = 0.1
+COGNITO_THROTTLE_MAX_BACKOFF_SECONDS = 2
+COGNITO_THROTTLING_ERROR_CODES = ["TooManyRequestsException", "ThrottlingException"]
+COGNITO_RATE_LIMITERS = {}
+COGNITO_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_cognito_rate_limiter(operation: str):
+    rate_limiter = COGNITO_RATE_LIMITERS.get(operation)
+
+    if rate_limiter is None:
+        with COGNITO_RATE_LIMITERS_LOCK:
+            rate_limiter = COGNITO_RATE_LIMITERS.get(operation)
+
+            if rate_limiter is None:
+                rate_limit = os.getenv(
+                    f"COGNITO_{operation.upper()}_RATE_LIMIT",
+                    COGNITO_OPERATION_RATE_LIMITS.get(
+                        operation, COGNITO_DEFAULT_RATE_LIMIT
+                    ),
+                )
+                rate_limiter = TokenBucket(rate_per_second=float(rate_limit))
+                COGNITO_RATE_LIMITERS[operation] = rate_limiter
+
+    return rate_limiter
+
+
+def call_cognito(operation: str, **kwargs):
+    """
+    Call a cognito_idp_client operation through its rate limiter, retrying throttled
+    calls with jittered exponential backoff.
+    """
+    rate_limiter = get_cognito_rate_limiter(operation)
+    attempt = 0
+
+    while True:
+        waited_seconds = rate_limiter.acquire()
+        if waited_seconds:
+            increment_metric(f"cognito.{operation}.wait_ms", waited_seconds * 1000)
+
+        try:
+            response = getattr(cognito_idp_client, operation)(**kwargs)
+            rate_limiter.on_success()
+            return response
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in (
+                COGNITO_THROTTLING_ERROR_CODES
+            ):
+                raise e
+
+            rate_limiter.on_throttle()
+            increment_metric(f"cognito.{operation}.throttles")
+
+            if attempt >= COGNITO_THROTTLE_MAX_RETRIES:
+                raise e
+
+            backoff_seconds = random.uniform(
+                0,
+                min(
+                    COGNITO_THROTTLE_MAX_BACKOFF_SECONDS,
+                    COGNITO_THROTTLE_BASE_BACKOFF_SECONDS * 2**attempt,
+                ),
+            )
+            increment_metric(f"cognito.{operation}.wait_ms", backoff_seconds * 1000)
+            time.sleep(backoff_seconds)
+            attempt += 1
 
 
 def get_user_pool_id():
@@ -39,33 +150,135 @@ def get_user_pool_client():
     return USER_POOL_CLIENT
 
 
-def get_known_public_keys():
-    global KNOWN_PUBLIC_KEYS
+def get_known_public_keys(force_refresh: bool = False):
+    if (
+        force_refresh
+        or KNOWN_PUBLIC_KEYS is None
+        or time.time() >= KNOWN_PUBLIC_KEYS_REFRESH_AT
+    ):
+        with JWKS_LOCK:
+            # another thread may have refreshed while we waited on the lock
+            if (
+                KNOWN_PUBLIC_KEYS is None
+                or time.time() >= KNOWN_PUBLIC_KEYS_REFRESH_AT
+                or (force_refresh and can_refetch_known_public_keys())
+            ):
+                refresh_known_public_keys()
+
+    return KNOWN_PUBLIC_KEYS
+
+
+def get_known_public_key(kid: str):
+    get_known_public_keys()
+    jwk = KNOWN_PUBLIC_KEYS_BY_KID.get(kid)
+
+    # an unknown kid usually means the keys were rotated, refetch at most once per interval
+    if jwk is None and can_refetch_known_public_keys():
+        get_known_public_keys(force_refresh=True)
+        jwk = KNOWN_PUBLIC_KEYS_BY_KID.get(kid)
+
+    return jwk
+
+
+def can_refetch_known_public_keys():
+    return (
+        LAST_JWKS_FETCH_TIME is None
+        or time.time() - LAST_JWKS_FETCH_TIME >= JWKS_MIN_REFETCH_INTERVAL_SECONDS
+    )
+
 
-    if KNOWN_PUBLIC_KEYS is None:
+def refresh_known_public_keys():
+    global KNOWN_PUBLIC_KEYS, KNOWN_PUBLIC_KEYS_BY_KID, KNOWN_PUBLIC_KEYS_REFRESH_AT
+    global LAST_JWKS_FETCH_TIME
+
+    LAST_JWKS_FETCH_TIME = time.time()
+    try:
         jwks_url = f"https://cognito-idp.{region}.amazonaws.com/{get_user_pool_id()}/.well-known/jwks.json"
         jwks_response = requests_util.get(jwks_url, timeout=TIMEOUT)
         jwks = jwks_response.json()
         KNOWN_PUBLIC_KEYS = jwks["keys"]
+        KNOWN_PUBLIC_KEYS_BY_KID = {jwk.get("kid"): jwk for jwk in KNOWN_PUBLIC_KEYS}
+        # jitter the refresh so warm containers across the fleet do not refetch together
+        KNOWN_PUBLIC_KEYS_REFRESH_AT = time.time() + JWKS_REFRESH_TTL_SECONDS * (
+            1 - random.random() * 0.1
+        )
+    except Exception as e:
+        if KNOWN_PUBLIC_KEYS is None:
+            raise e
 
-    return KNOWN_PUBLIC_KEYS
+        # stale if error, keep serving the last known keys and retry after the refetch interval
+        log_warning(f"unable to refresh jwks, serving stale keys: {e}")
+        KNOWN_PUBLIC_KEYS_REFRESH_AT = time.time() + JWKS_MIN_REFETCH_INTERVAL_SECONDS
+
+
+def describe_user_pool_client(force_refresh: bool = False):
+    if force_refresh or is_user_pool_client_description_stale():
+        with USER_POOL_CLIENT_LOCK:
+            if force_refresh or is_user_pool_client_description_stale():
+                refresh_user_pool_client_description()
 
+    return USER_POOL_CLIENT_DESCRIPTION
 
-def get_app_client_secret():
-    client_response = cognito_idp_client.describe_user_pool_client(
-        UserPoolId=get_user_pool_id(), ClientId=get_user_pool_client()
+
+def is_user_pool_client_description_stale():
+    return (
+        USER_POOL_CLIENT_DESCRIPTION is None
+        or time.time() >= USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT
     )
+
+
+def refresh_user_pool_client_description():
+    global USER_POOL_CLIENT_DESCRIPTION, USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT
+
+    USER_POOL_CLIENT_DESCRIPTION = call_cognito(
+        "describe_user_pool_client",
+        UserPoolId=get_user_pool_id(),
+        ClientId=get_user_pool_client(),
+    )
+    USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT = (
+        time.time() + APP_CLIENT_SECRET_TTL_SECONDS
+    )
+    # hashes derived from a previous secret are no longer valid
+    SECRET_HASH_CACHE.clear()
+
+
+def get_app_client_secret(force_refresh: bool = False):
+    client_response = describe_user_pool_client(force_refresh=force_refresh)
     return client_response.get("UserPoolClient", {}).get("ClientSecret")
 
 
 def get_cognito_client_secret_hash(username):
-    message = bytes(username + get_user_pool_client(), "utf-8")
     key = bytes(get_app_client_secret(), "utf-8")
-    return base64.b64encode(
-        hmac.new(key, message, digestmod=hashlib.sha256).digest()
-    ).decode()
 
+    secret_hash = SECRET_HASH_CACHE.get(username)
+    if secret_hash is None:
+        message = bytes(username + get_user_pool_client(), "utf-8")
+        secret_hash = base64.b64encode(
+            hmac.new(key, message, digestmod=hashlib.sha256).digest()
+        ).decode()
+        SECRET_HASH_CACHE.set(username, secret_hash)
+
+    return secret_hash
+
+
+# Decorator to retry a call once with a reloaded client secret after it was rotated
+def retry_on_secret_hash_mismatch(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except cognito_idp_client.exceptions.NotAuthorizedException as e:
+            if "secret hash" not in str(e).lower():
+                raise e
 
+            log_warning(f"secret hash rejected, reloading client secret: {e}")
+            get_app_client_secret(force_refresh=True)
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@retry_on_secret_hash_mismatch
 def sign_up(
     profile: str,
     username: str,
@@ -77,7 +290,8 @@ def sign_up(
     username = username.lower()
     email = email.lower()
     client_id = get_user_pool_client()
-    cognito_idp_client.sign_up(
+    call_cognito(
+        "sign_up",
         ClientId=client_id,
         SecretHash=get_cognito_client_secret_hash(username),
         Username=username,
@@ -93,19 +307,22 @@ def sign_up(
     return {"username": username, "profile": profile}
 
 
+@retry_on_secret_hash_mismatch
 def confirm_sign_up(username: str, code: str):
-    cognito_idp_client.admin_enable_user(
-        UserPoolId=get_user_pool_id(), Username=username
-    )
+    # enable before confirm, a confirm of a user that is still disabled is rejected
+    call_cognito("admin_enable_user", UserPoolId=get_user_pool_id(), Username=username)
 
-    cognito_idp_client.confirm_sign_up(
+    call_cognito(
+        "confirm_sign_up",
         ClientId=get_user_pool_client(),
         Username=username,
         ConfirmationCode=code,
         SecretHash=get_cognito_client_secret_hash(username),
     )
 
-    cognito_idp_client.admin_update_user_attributes(
+    # only mark the email verified once the code was accepted
+    call_cognito(
+        "admin_update_user_attributes",
         UserPoolId=get_user_pool_id(),
         Username=username,
         UserAttributes=[{"Name": "email_verified", "Value": "true"}],
@@ -113,8 +330,10 @@ def confirm_sign_up(username: str, code: str):
 
 
 @log_function_call
+@retry_on_secret_hash_mismatch
 def initiate_user_password_auth(username: str, password: str):
-    auth_response = cognito_idp_client.initiate_auth(
+    auth_response = call_cognito(
+        "initiate_auth",
         AuthFlow="USER_PASSWORD_AUTH",
         AuthParameters={
             "USERNAME": username,
@@ -127,6 +346,21 @@ def initiate_user_password_auth(username: str, password: str):
     return auth_response
 
 
+@retry_on_secret_hash_mismatch
+def initiate_refresh_token_auth(username: str, refresh_token: str):
+    auth_response = call_cognito(
+        "initiate_auth",
+        AuthFlow="REFRESH_TOKEN_AUTH",
+        AuthParameters={
+            "REFRESH_TOKEN": refresh_token,
+            "SECRET_HASH": get_cognito_client_secret_hash(username),
+        },
+        ClientId=get_user_pool_client(),
+    )
+    auth_response.pop("ResponseMetadata", None)
+    return auth_response
+
+
 def admin_create_user(
     profile: str,
     username: str,
@@ -158,10 +392,11 @@ def admin_create_user(
     if suppress_message:
         args["MessageAction"] = "SUPPRESS"
 
-    cognito_idp_client.admin_create_user(**args)
+    call_cognito("admin_create_user", **args)
 
     if is_password_permanent:
-        cognito_idp_client.admin_set_user_password(
+        call_cognito(
+            "admin_set_user_password",
             UserPoolId=user_pool_id,
             Username=username,
             Password=password,
@@ -170,7 +405,8 @@ def admin_create_user(
 
 
 def admin_set_user_password(username: str, password: str, is_permanent: bool = False):
-    return cognito_idp_client.admin_set_user_password(
+    return call_cognito(
+        "admin_set_user_password",
         UserPoolId=get_user_pool_id(),
         Username=username,
         Password=password,
@@ -179,21 +415,29 @@ def admin_set_user_password(username: str, password: str, is_permanent: bool = F
 
 
 def admin_disable_user(username: str):
-    return cognito_idp_client.admin_disable_user(
-        UserPoolId=get_user_pool_id(), Username=username
+    return call_cognito(
+        "admin_disable_user", UserPoolId=get_user_pool_id(), Username=username
+    )
+
+
+def admin_delete_user(username: str):
+    return call_cognito(
+        "admin_delete_user", UserPoolId=get_user_pool_id(), Username=username
     )
 
 
 def admin_enable_user(username: str):
-    return cognito_idp_client.admin_enable_user(
-        UserPoolId=get_user_pool_id(), Username=username
+    return call_cognito(
+        "admin_enable_user", UserPoolId=get_user_pool_id(), Username=username
     )
 
 
+@retry_on_secret_hash_mismatch
 def respond_to_new_password_auth_challenge(username: str, password: str, session: str):
     secret_hash = get_cognito_client_secret_hash(username)
 
-    auth_response = cognito_idp_client.respond_to_auth_challenge(
+    auth_response = call_cognito(
+        "respond_to_auth_challenge",
         ClientId=get_user_pool_client(),
         ChallengeName="NEW_PASSWORD_REQUIRED",
         Session=session,
@@ -209,6 +453,10 @@ def respond_to_new_password_auth_challenge(username: str, password: str, session
 
 
 def health_check():
-    return cognito_idp_client.describe_user_pool_client(
-        UserPoolId=get_user_pool_id(), ClientId=get_user_pool_client()
+    # always reaches cognito, the cached client description may be up to
+    # APP_CLIENT_SECRET_TTL_SECONDS old
+    return call_cognito(
+        "describe_user_pool_client",
+        UserPoolId=get_user_pool_id(),
+        ClientId=get_user_pool_client(),
     )
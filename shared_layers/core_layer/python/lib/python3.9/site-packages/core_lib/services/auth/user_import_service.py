@@ -0,0 +1,165 @@
+import codecs
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from core_lib.services.auth import auth_service
+from core_lib.services.file_storage import file_storage_service
+from core_lib.utils import json_util
+from core_lib.utils.metrics_util import get_metrics, share_metrics
+from core_lib.utils.uuid_util import generate_uuid
+
+USER_IMPORT_MAX_WORKERS = int(os.getenv("USER_IMPORT_MAX_WORKERS", "16"))
+USER_IMPORT_CHECKPOINT_INTERVAL = int(
+    os.getenv("USER_IMPORT_CHECKPOINT_INTERVAL", "200")
+)
+USER_IMPORT_PREFIX = "user-imports"
+
+IMPORT_IN_PROGRESS = "IN_PROGRESS"
+IMPORT_COMPLETE = "COMPLETE"
+USER_CREATED = "CREATED"
+USER_EXISTS = "EXISTS"
+USER_FAILED = "FAILED"
+
+
+def import_users(bucket_name: str, key: str, import_id: str, should_stop=None):
+    """
+    Create every user in an NDJSON or CSV object through a bounded worker pool.
+
+    Records are processed in chunks of USER_IMPORT_CHECKPOINT_INTERVAL. After each
+    chunk its results are written as a manifest part and the checkpoint is advanced,
+    so a call that stops early, because should_stop returned True or the Lambda
+    timed out, resumes after the last checkpointed record.
+    """
+    checkpoint = get_checkpoint(import_id) or {
+        "import_id": import_id,
+        "bucket_name": bucket_name,
+        "key": key,
+        "status": IMPORT_IN_PROGRESS,
+        "next_record": 0,
+        "manifest_parts": 0,
+        "counts": {USER_CREATED: 0, USER_EXISTS: 0, USER_FAILED: 0},
+    }
+    if checkpoint["status"] == IMPORT_COMPLETE:
+        return checkpoint
+
+    records = enumerate(read_user_records(bucket_name=bucket_name, key=key))
+    records = islice(records, checkpoint["next_record"], None)
+
+    # cognito throttle and retry metrics of the workers are logged with the invocation
+    with ThreadPoolExecutor(
+        max_workers=USER_IMPORT_MAX_WORKERS,
+        initializer=share_metrics,
+        initargs=(get_metrics(),),
+    ) as executor:
+        while True:
+            chunk = list(islice(records, USER_IMPORT_CHECKPOINT_INTERVAL))
+            if not chunk:
+                checkpoint["status"] = IMPORT_COMPLETE
+                break
+
+            results = list(executor.map(lambda record: import_user(*record), chunk))
+            save_manifest_part(
+                import_id=import_id,
+                part_number=checkpoint["manifest_parts"],
+                results=results,
+            )
+
+            checkpoint["next_record"] = chunk[-1][0] + 1
+            checkpoint["manifest_parts"] += 1
+            for result in results:
+                checkpoint["counts"][result["status"]] += 1
+            save_checkpoint(checkpoint)
+
+            if should_stop is not None and should_stop():
+                return checkpoint
+
+    save_checkpoint(checkpoint)
+    return checkpoint
+
+
+def import_user(record_number: int, user: dict):
+    username = user.get("username")
+    profile = user.get("profile") or generate_uuid()
+    result = {"record": record_number, "username": username, "profile": profile}
+
+    try:
+        auth_service.admin_create_user(
+            profile=profile,
+            username=username,
+            email=user.get("email"),
+            password=user.get("password"),
+            first_name=user.get("first_name"),
+            last_name=user.get("last_name"),
+            suppress_message=True,
+            is_password_permanent=True,
+        )
+        result["status"] = USER_CREATED
+
+    except Exception as e:
+        # a resumed chunk may contain users created before the last checkpoint
+        error_code = getattr(e, "response", {}).get("Error", {}).get("Code")
+        if error_code == "UsernameExistsException":
+            result["status"] = USER_EXISTS
+            # the existing user keeps its own profile, not the one generated here
+            result["profile"] = user.get("profile")
+        else:
+            result["status"] = USER_FAILED
+            result["error"] = str(e)
+
+    return result
+
+
+def read_user_records(bucket_name: str, key: str):
+    response = file_storage_service.download(bucket_name=bucket_name, key=key)
+    if response is None:
+        raise Exception(f"unable to read user import: s3://{bucket_name}/{key}")
+
+    lines = codecs.iterdecode(response["Body"].iter_lines(), "utf-8")
+
+    if key.lower().endswith(".csv"):
+        yield from csv.DictReader(lines)
+    else:
+        for line in lines:
+            if line.strip():
+                yield json_util.loads(line)
+
+
+def get_checkpoint_key(import_id: str):
+    return f"{USER_IMPORT_PREFIX}/{import_id}/checkpoint.json"
+
+
+def get_manifest_part_key(import_id: str, part_number: int):
+    return f"{USER_IMPORT_PREFIX}/{import_id}/manifest/part-{part_number:05d}.ndjson"
+
+
+def get_checkpoint(import_id: str):
+    response = file_storage_service.download(
+        bucket_name=file_storage_service.get_app_storage_bucket(),
+        key=get_checkpoint_key(import_id),
+    )
+    if response is None:
+        return None
+
+    return json_util.loads(response["Body"].read())
+
+
+def save_checkpoint(checkpoint: dict):
+    response = file_storage_service.upload(
+        bucket_name=file_storage_service.get_app_storage_bucket(),
+        key=get_checkpoint_key(checkpoint["import_id"]),
+        content=json_util.dumps(checkpoint),
+    )
+    if response is None:
+        raise Exception(f"unable to save user import checkpoint: {checkpoint}")
+
+
+def save_manifest_part(import_id: str, part_number: int, results: list):
+    response = file_storage_service.upload(
+        bucket_name=file_storage_service.get_app_storage_bucket(),
+        key=get_manifest_part_key(import_id, part_number),
+        content="\n".join(json_util.dumps(result) for result in results),
+    )
+    if response is None:
+        raise Exception(f"unable to save user import manifest part: {part_number}")
@@ -13,3 +13,7 @@ def get_function(**kwargs):
 
 def add_invoke_permission(**kwargs):
     return FUNCTION_SERVICE_IMPL.add_invoke_permission(**kwargs)
+
+
+def invoke_function_async(**kwargs):
+    return FUNCTION_SERVICE_IMPL.invoke_function_async(**kwargs)
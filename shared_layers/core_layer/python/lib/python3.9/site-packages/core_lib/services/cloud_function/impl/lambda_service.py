@@ -1,4 +1,5 @@
 from core_lib.services.database.impl import dynamodb_service
+from core_lib.utils import json_util
 from core_lib.utils.args_util import get_non_null_kwargs
 from core_lib.utils.log_util import log_unexpected_exception
 import boto3
@@ -14,6 +15,14 @@ def get_function(**kwargs):
     return lambda_client.get_function(**get_non_null_kwargs(**kwargs))
 
 
+def invoke_function_async(function_name: str, payload: dict):
+    return lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType="Event",
+        Payload=json_util.dumps_bytes(payload),
+    )
+
+
 def add_invoke_permission(function_name: str, statement_id: str, principle: str):
     try:
         lambda_client.add_permission(
@@ -1,4 +1,6 @@
 import os
+import random
+import time
 
 import boto3
 from boto3.dynamodb.types import TypeDeserializer
@@ -22,6 +24,9 @@ dynamodb_client = boto3.client("dynamodb")
 DB_TABLE_NAME = None
 DB_TABLE = None
 
+BATCH_GET_ITEM_MAX_KEYS = 100
+BATCH_GET_ITEM_MAX_RETRIES = 5
+
 
 def db_table_name():
     global DB_TABLE_NAME
@@ -49,10 +54,10 @@ def dynamodb_json_to_json(dynamodb_json):
     return normal_json
 
 
-def put_item(item: dict, data_model: DynamoDBItem):
+def put_item(item: dict, data_model: DynamoDBItem, **kwargs):
     new_item = data_model.build_new_item(item)
     validate_json(json=new_item, validator=data_model.put_item_validator)
-    db_response = dynamodb_put_item(Item=new_item)
+    db_response = dynamodb_put_item(Item=new_item, **get_non_null_kwargs(**kwargs))
     return db_response
 
 
@@ -95,6 +100,42 @@ def batch_get_item(**kwargs):
     return db_response.get("Responses", {}).get(db_table_name(), [])
 
 
+def batch_get_items(keys: list, **kwargs):
+    """
+    BatchGetItem over any number of keys of the app table.
+
+    Keys are sent in chunks of BATCH_GET_ITEM_MAX_KEYS and unprocessed keys are
+    retried with jittered exponential backoff.
+    """
+    table_name = db_table_name()
+    items = []
+
+    for chunk_start in range(0, len(keys), BATCH_GET_ITEM_MAX_KEYS):
+        chunk_end = chunk_start + BATCH_GET_ITEM_MAX_KEYS
+        request_items = {
+            table_name: {
+                "Keys": keys[chunk_start:chunk_end],
+                **get_non_null_kwargs(**kwargs),
+            }
+        }
+
+        retries = 0
+        while request_items:
+            db_response = dynamodb_batch_get_item(RequestItems=request_items)
+            items.extend(db_response.get("Responses", {}).get(table_name, []))
+            request_items = db_response.get("UnprocessedKeys")
+
+            if request_items:
+                if retries >= BATCH_GET_ITEM_MAX_RETRIES:
+                    raise Exception(
+                        f"unable to process batch get keys after {retries} retries"
+                    )
+                time.sleep(random.uniform(0, 0.05 * 2**retries))
+                retries += 1
+
+    return items
+
+
 def build_new_item(item: dict):
     item["created_by"] = safe_get_thread_attribute("principle")
     item["created_date_time"] = get_current_utc_datetime_iso()
@@ -105,6 +146,26 @@ def build_new_item(item: dict):
     return item
 
 
+def build_projection(fields: list = None, projection_expression: str = None):
+    """
+    ProjectionExpression kwargs for a list of attribute names.
+
+    Names are aliased through ExpressionAttributeNames so reserved words such as name
+    or status can be projected. Without fields the projection_expression is kept.
+    """
+    if not fields:
+        return (
+            {"ProjectionExpression": projection_expression}
+            if projection_expression is not None
+            else {}
+        )
+
+    return {
+        "ProjectionExpression": ",".join(f"#{field}" for field in fields),
+        "ExpressionAttributeNames": {f"#{field}": field for field in fields},
+    }
+
+
 def build_update_expression_and_values(updates: dict):
     update_expression = build_update_expression(list(updates.keys()))
     expression_attribute_values = build_update_expression_attribute_values(updates)
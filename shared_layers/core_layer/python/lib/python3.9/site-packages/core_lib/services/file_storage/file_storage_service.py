@@ -11,3 +11,11 @@ def upload(**kwargs):
 @log_function_call
 def download(**kwargs):
     return FILE_STORAGE_SERVICE_IMPL.download(**kwargs)
+
+
+def generate_presigned_download_url(**kwargs):
+    return FILE_STORAGE_SERVICE_IMPL.generate_presigned_download_url(**kwargs)
+
+
+def get_app_storage_bucket():
+    return FILE_STORAGE_SERVICE_IMPL.get_app_storage_bucket()
@@ -1,4 +1,5 @@
 import boto3
+from botocore.config import Config
 
 from core_lib.services.parameter.parameter_service import (
     get_parameter_value,
@@ -6,7 +7,8 @@ from core_lib.services.parameter.parameter_service import (
 )
 from core_lib.utils.log_util import log_unexpected_exception
 
-s3_client = boto3.client("s3")
+# presigned urls for objects encrypted with KMS must be signed with SigV4
+s3_client = boto3.client("s3", config=Config(signature_version="s3v4"))
 s3_resource = boto3.resource("s3")
 S3_APP_STORAGE_BUCKET = None
 
@@ -20,15 +22,25 @@ def get_app_storage_bucket():
     return S3_APP_STORAGE_BUCKET
 
 
-def upload(bucket_name: str, key: str, content):
+def upload(bucket_name: str, key: str, content, **kwargs):
     try:
-        return s3_resource.Object(bucket_name=bucket_name, key=key).put(Body=content)
+        return s3_resource.Object(bucket_name=bucket_name, key=key).put(
+            Body=content, **kwargs
+        )
     except Exception as e:
         log_unexpected_exception(e)
 
 
 def download(bucket_name: str, key: str):
     try:
-        return s3_client.get_object(bucket_name=bucket_name, key=key)
+        return s3_client.get_object(Bucket=bucket_name, Key=key)
     except Exception as e:
         log_unexpected_exception(e)
+
+
+def generate_presigned_download_url(bucket_name: str, key: str, expires_in: int):
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket_name, "Key": key},
+        ExpiresIn=expires_in,
+    )
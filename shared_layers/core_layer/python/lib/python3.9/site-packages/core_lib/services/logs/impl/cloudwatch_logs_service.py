@@ -1,10 +1,10 @@
 import base64
 import gzip
-import json
 from datetime import datetime, timedelta
 
 import boto3
 
+from core_lib.utils import json_util
 from core_lib.utils.log_util import log_info, log_unexpected_exception
 
 logs_client = boto3.client("logs")
@@ -15,7 +15,7 @@ def log_subscribed_log_events(event):
     decompressed_data = gzip.decompress(compressed_data)
 
     # Convert the decompressed data to a JSON object
-    log_data = json.loads(decompressed_data)
+    log_data = json_util.loads(decompressed_data)
 
     # Extract log events from the log data
     log_events = log_data["logEvents"]
@@ -23,7 +23,7 @@ def log_subscribed_log_events(event):
     # Process each log event
     for log_event in log_events:
         try:
-            print(json.loads(json.dumps(log_event.get("message"))))
+            print(log_event.get("message"))
         except Exception as e:
             log_unexpected_exception(e)
 
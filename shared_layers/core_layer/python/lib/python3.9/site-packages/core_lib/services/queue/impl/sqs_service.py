@@ -1,4 +1,3 @@
-import json
 import os
 
 import boto3
@@ -6,6 +5,7 @@ from core_lib.services.parameter.parameter_service import (
     get_parameter_value,
     ParameterName,
 )
+from core_lib.utils import json_util
 from core_lib.utils.log_util import log_warning, log_info, log_unexpected_exception
 
 sqs_client = boto3.client("sqs")
@@ -30,7 +30,7 @@ def send_message_to_queue(
 ):
     try:
         if isinstance(message, dict):
-            message = json.dumps(message, cls=json.JSONEncoder)
+            message = json_util.dumps(message)
 
         log_info(f"sending message: {message} to {queue_url} in region {region}")
 
@@ -1,7 +1,23 @@
+import os
+
 from core_lib.services.secrets.impl import secrets_manager_service
 
 SECRETS_SERVICE_IMPL = secrets_manager_service
 
+CURSOR_SIGNING_KEY = None
+
 
 def get_secret_value(secret_id: str):
     return SECRETS_SERVICE_IMPL.get_secret_value(secret_id=secret_id)
+
+
+def get_cursor_signing_key():
+    global CURSOR_SIGNING_KEY
+
+    if CURSOR_SIGNING_KEY is None:
+        secret_value = get_secret_value(os.getenv("CURSOR_SIGNING_SECRET_ID")).get(
+            "SecretString"
+        )
+        CURSOR_SIGNING_KEY = secret_value.encode("utf-8")
+
+    return CURSOR_SIGNING_KEY
@@ -0,0 +1,64 @@
+import hashlib
+import math
+import struct
+
+# size in bits and number of hash functions, stored in front of the bit array
+HEADER_FORMAT = ">QI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set membership over a bit array.
+
+    might_contain never returns False for an added value, but may return True for a
+    value that was never added at roughly the configured false positive rate.
+    """
+
+    def __init__(self, size_bits: int, hash_count: int, bits: bytearray = None):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray(math.ceil(size_bits / 8))
+
+    def add(self, value: str):
+        for position in self.get_bit_positions(value):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def might_contain(self, value: str):
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self.get_bit_positions(value)
+        )
+
+    def get_bit_positions(self, value: str):
+        # double hashing derives every position from a single digest
+        digest = hashlib.sha256(value.encode("utf-8")).digest()
+        hash_a = int.from_bytes(digest[:8], "big")
+        hash_b = int.from_bytes(digest[8:16], "big") | 1
+
+        return [(hash_a + i * hash_b) % self.size_bits for i in range(self.hash_count)]
+
+    def to_bytes(self):
+        return struct.pack(HEADER_FORMAT, self.size_bits, self.hash_count) + bytes(
+            self.bits
+        )
+
+    @classmethod
+    def from_bytes(cls, content: bytes):
+        size_bits, hash_count = struct.unpack(HEADER_FORMAT, content[:HEADER_SIZE])
+        bits = bytearray(content[HEADER_SIZE:])
+
+        if len(bits) != math.ceil(size_bits / 8):
+            raise ValueError("bloom filter content does not match its header")
+
+        return cls(size_bits=size_bits, hash_count=hash_count, bits=bits)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        size_bits = math.ceil(
+            -capacity * math.log(false_positive_rate) / (math.log(2) ** 2)
+        )
+        hash_count = max(1, round(size_bits / capacity * math.log(2)))
+
+        return cls(size_bits=size_bits, hash_count=hash_count)
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded, thread safe, least recently used cache with optional per entry expiry.
+
+    Entries expire at an absolute epoch timestamp. When the cache is created with a
+    ttl_seconds value, entries set without an explicit expires_at expire ttl_seconds
+    after being set.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.items.get(key)
+
+            if entry is not None and is_expired(entry[1]):
+                del self.items[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, expires_at: float = None):
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = time.time() + self.ttl_seconds
+
+        with self.lock:
+            self.items[key] = (value, expires_at)
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.items.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+    def stats(self):
+        return {
+            "size": len(self.items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def is_expired(expires_at: float = None):
+    return expires_at is not None and expires_at <= time.time()
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import hashlib
+import hmac
+
+from core_lib.exceptions.types import AppException
+from core_lib.utils import json_util
+
+
+def encode_cursor(key: dict, signing_key: bytes, scope: str = ""):
+    """
+    Opaque, tamper proof cursor for a pagination key.
+
+    The scope is signed but not stored, so a cursor only decodes for the same scope,
+    e.g. the principal whose list it pages through.
+    """
+    payload = json_util.dumps_bytes(key)
+    signature = sign(payload, signing_key, scope)
+
+    return f"{urlsafe_b64encode(payload)}.{urlsafe_b64encode(signature)}"
+
+
+def decode_cursor(cursor: str, signing_key: bytes, scope: str = ""):
+    try:
+        encoded_payload, encoded_signature = cursor.split(".")
+        payload = urlsafe_b64decode(encoded_payload)
+        signature = urlsafe_b64decode(encoded_signature)
+    except (ValueError, binascii.Error):
+        raise AppException(message="invalid cursor", code=400)
+
+    if not hmac.compare_digest(signature, sign(payload, signing_key, scope)):
+        raise AppException(message="invalid cursor", code=400)
+
+    return json_util.loads(payload)
+
+
+def sign(payload: bytes, signing_key: bytes, scope: str):
+    return hmac.new(
+        signing_key, scope.encode("utf-8") + b"\n" + payload, hashlib.sha256
+    ).digest()
+
+
+def urlsafe_b64encode(content: bytes):
+    return base64.urlsafe_b64encode(content).rstrip(b"=").decode("ascii")
+
+
+def urlsafe_b64decode(content: str):
+    return base64.urlsafe_b64decode(content + "=" * (-len(content) % 4))
@@ -0,0 +1,51 @@
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# set JSON_CODEC=stdlib to opt out of the native encoder even when it is installed
+USE_NATIVE_CODEC = orjson is not None and os.getenv("JSON_CODEC") != "stdlib"
+
+
+def default(value):
+    """
+    Encode the non JSON types DynamoDB and the app hand to the serializer.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> str:
+    return dumps_bytes(value).decode("utf-8")
+
+
+def dumps_bytes(value) -> bytes:
+    if USE_NATIVE_CODEC:
+        try:
+            return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits, let the stdlib encode or reject them
+            pass
+
+    # match the native encoder: compact and without escaping non ascii characters
+    return json.dumps(
+        value, default=default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(content):
+    if USE_NATIVE_CODEC:
+        return orjson.loads(content)
+
+    return json.loads(content)
@@ -1,22 +1,30 @@
-import json
 from threading import current_thread
 
 from aws_xray_sdk.core import patch_all
 from aws_xray_sdk.core import xray_recorder
 
+from core_lib.utils import json_util
 from core_lib.utils.log_util import log_info, log_unexpected_exception
+from core_lib.utils.metrics_util import log_metrics, reset_metrics
 
 patch_all()
 
 
-def lambda_handler():
+def lambda_handler(log_event: bool = True):
+    """
+    log_event=False leaves logging the event to the handler, e.g. API handlers write a
+    single access record per request.
+    """
+
     def decorator(func):
         def wrapper(event, context):
             try:
-                log_info(event)
+                if log_event:
+                    log_info(event)
 
                 current_thread().__setattr__("event", event)
                 current_thread().__setattr__("context", context)
+                reset_metrics()
 
                 try:
                     # Capture metadata and annotations
@@ -25,7 +33,7 @@ def lambda_handler():
                         "event", event, "ProcessingEvent"
                     )
                     xray_recorder.current_subsegment().put_annotation(
-                        "EventSize", len(json.dumps(event))
+                        "EventSize", len(json_util.dumps_bytes(event))
                     )
                 except Exception as e:
                     log_unexpected_exception(e)
@@ -43,6 +51,9 @@ def lambda_handler():
                 log_unexpected_exception(e)
                 raise e
 
+            finally:
+                log_metrics()
+
         return wrapper
 
     return decorator
@@ -0,0 +1,50 @@
+import threading
+from threading import current_thread
+
+from core_lib.utils.date_time_util import get_current_utc_datetime_iso
+from core_lib.utils.thread_util import safe_get_thread_attribute
+
+METRICS_LOCK = threading.Lock()
+
+
+def reset_metrics():
+    current_thread().__setattr__("metrics", {})
+
+
+def get_metrics():
+    metrics = safe_get_thread_attribute("metrics")
+    if metrics is None:
+        reset_metrics()
+        metrics = safe_get_thread_attribute("metrics")
+
+    return metrics
+
+
+def share_metrics(metrics: dict):
+    """
+    Record this thread's metrics into metrics, e.g. the invoking thread's metrics from a
+    pool worker, since only the invoking thread's metrics are logged.
+    """
+    current_thread().__setattr__("metrics", metrics)
+
+
+def increment_metric(name: str, value: float = 1):
+    metrics = get_metrics()
+
+    with METRICS_LOCK:
+        metrics[name] = metrics.get(name, 0) + value
+
+
+def log_metrics():
+    metrics = safe_get_thread_attribute("metrics")
+    if not metrics:
+        return
+
+    message = {
+        "utc_datetime_iso": get_current_utc_datetime_iso(),
+        "log_type": "APP_METRICS_LOG",
+        "event_type": "INVOCATION_METRICS",
+        "principle": safe_get_thread_attribute("principle"),
+        "metrics": dict(metrics),
+    }
+    print(message)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket with an adaptive refill rate.
+
+    on_throttle halves the rate down to min_rate_per_second and on_success grows it
+    back towards rate_per_second, so callers back off while the upstream throttles.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float = None,
+        min_rate_per_second: float = None,
+    ):
+        self.max_rate_per_second = rate_per_second
+        self.rate_per_second = rate_per_second
+        self.min_rate_per_second = min_rate_per_second or rate_per_second / 10
+        self.capacity = capacity or max(rate_per_second, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until the tokens are available and return the seconds waited.
+        """
+        waited_seconds = 0.0
+
+        while True:
+            with self.lock:
+                self.refill()
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited_seconds
+
+                wait_seconds = (tokens - self.tokens) / self.rate_per_second
+
+            time.sleep(wait_seconds)
+            waited_seconds += wait_seconds
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate_per_second,
+        )
+        self.updated_at = now
+
+    def on_throttle(self):
+        with self.lock:
+            self.rate_per_second = max(
+                self.min_rate_per_second, self.rate_per_second / 2
+            )
+
+    def on_success(self):
+        with self.lock:
+            self.rate_per_second = min(
+                self.max_rate_per_second,
+                self.rate_per_second + self.max_rate_per_second * 0.05,
+            )
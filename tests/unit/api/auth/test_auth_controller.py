@@ -1,38 +1,41 @@
 import json
 from unittest.mock import patch
 
+import pytest
+
 from api.auth import auth_controller
 from api_lib.response.api_response import ApiResponse
+from core_lib.utils import json_util
+
+SIGNUP_EVENT = {
+    "headers": {},
+    "pathParameters": {},
+    "body": json.dumps(
+        {
+            "username": "User01",
+            "password": "Password@123",
+            "email": "test-email@gmail.com",
+            "first_name": "first",
+            "last_name": "last",
+        }
+    ),
+    "queryStringParameters": {},
+}
 
 
 @patch("api.auth.auth_controller.user_data_access.create_user")
-@patch("api.auth.auth_controller.auth_service.replicated_sign_up")
+@patch("api.auth.auth_controller.auth_service.replicate_sign_up")
+@patch("api.auth.auth_controller.auth_service.sign_up")
 @patch("api.auth.auth_controller.generate_uuid")
-def test_signup(generate_uuid, replicated_sign_up, create_user):
-    username = "User01"
-
-    event = {
-        "headers": {},
-        "pathParameters": {},
-        "body": json.dumps(
-            {
-                "username": username,
-                "password": "Password@123",
-                "email": "test-email@gmail.com",
-                "first_name": "first",
-                "last_name": "last",
-            }
-        ),
-        "queryStringParameters": {},
-    }
-
+def test_signup(generate_uuid, sign_up, replicate_sign_up, create_user):
+    event = SIGNUP_EVENT
     generate_uuid.return_value = "uuid_value"
 
     expected_signup_return_value = {
-        "username": username,
+        "username": "user01",
         "profile": generate_uuid.return_value,
     }
-    replicated_sign_up.return_value = expected_signup_return_value
+    sign_up.return_value = expected_signup_return_value
     create_user.return_value = {}
 
     sign_up_response = auth_controller.signup(event, None)
@@ -42,17 +45,54 @@ def test_signup(generate_uuid, replicated_sign_up, create_user):
     assert sign_up_response == {
         "headers": api_response.headers,
         "statusCode": api_response.status_code,
-        "body": json.dumps(expected_signup_return_value),
+        "body": json_util.dumps(expected_signup_return_value),
     }
 
     sign_up_input = {**json.loads(event["body"]), "profile": generate_uuid.return_value}
-    replicated_sign_up.assert_called_once_with(**sign_up_input)
+    sign_up.assert_called_once_with(**sign_up_input)
+    replicate_sign_up.assert_called_once_with(**sign_up_input)
 
     create_user_input = {**sign_up_input, "entity_status": "ACTIVE"}
     create_user_input.pop("password")
     create_user.assert_called_once_with(create_user_input)
 
 
+@patch("api.auth.auth_controller.user_data_access.create_user")
+@patch("api.auth.auth_controller.auth_service.replicate_sign_up")
+@patch("api.auth.auth_controller.auth_service.sign_up")
+@patch("api.auth.auth_controller.generate_uuid")
+def test_signup_does_not_create_user_item_when_sign_up_fails(
+    generate_uuid, sign_up, replicate_sign_up, create_user
+):
+    generate_uuid.return_value = "uuid_value"
+    sign_up.side_effect = Exception("username exists")
+
+    with pytest.raises(Exception, match="username exists"):
+        auth_controller.signup(SIGNUP_EVENT, None)
+
+    create_user.assert_not_called()
+    replicate_sign_up.assert_not_called()
+
+
+@patch("api.auth.auth_controller.auth_service.admin_delete_user")
+@patch("api.auth.auth_controller.user_data_access.create_user")
+@patch("api.auth.auth_controller.auth_service.replicate_sign_up")
+@patch("api.auth.auth_controller.auth_service.sign_up")
+@patch("api.auth.auth_controller.generate_uuid")
+def test_signup_deletes_cognito_user_when_create_user_fails(
+    generate_uuid, sign_up, replicate_sign_up, create_user, admin_delete_user
+):
+    generate_uuid.return_value = "uuid_value"
+    sign_up.return_value = {"username": "user01", "profile": "uuid_value"}
+    create_user.side_effect = Exception("db unavailable")
+
+    with pytest.raises(Exception, match="db unavailable"):
+        auth_controller.signup(SIGNUP_EVENT, None)
+
+    admin_delete_user.assert_called_once_with(username="user01")
+    replicate_sign_up.assert_not_called()
+
+
 @patch("api.auth.auth_controller.auth_service.replicated_confirm_sign_up")
 def test_confirm_signup(replicated_confirm_sign_up):
     event = {
@@ -105,7 +145,44 @@ def test_authenticate(initiate_user_password_auth):
     assert authenticate_response == {
         "headers": api_response.headers,
         "statusCode": api_response.status_code,
-        "body": json.dumps(expected_auth_service_return_value),
+        "body": json_util.dumps(expected_auth_service_return_value),
     }
 
     initiate_user_password_auth.assert_called_once_with(**json.loads(event["body"]))
+
+
+@patch("api.auth.auth_controller.auth_service.initiate_refresh_token_auth")
+def test_refresh_authentication(initiate_refresh_token_auth):
+    event = {
+        "headers": {},
+        "pathParameters": {},
+        "body": json.dumps(
+            {"username": "User01", "refresh_token": "refresh_token_value"}
+        ),
+        "queryStringParameters": {},
+    }
+
+    expected_auth_service_return_value = {
+        "ChallengeParameters": {},
+        "AuthenticationResult": {
+            "AccessToken": "access_token_value",
+            "ExpiresIn": 3600,
+            "TokenType": "Bearer",
+            "IdToken": "id_token_value",
+        },
+    }
+
+    initiate_refresh_token_auth.return_value = expected_auth_service_return_value
+
+    refresh_response = auth_controller.refresh_authentication(event, None)
+
+    api_response = ApiResponse(request_headers=event["headers"], status_code=200)
+
+    assert refresh_response == {
+        "headers": api_response.headers,
+        "statusCode": api_response.status_code,
+        "body": json_util.dumps(expected_auth_service_return_value),
+    }
+    initiate_refresh_token_auth.assert_called_once_with(
+        username="User01", refresh_token="refresh_token_value"
+    )
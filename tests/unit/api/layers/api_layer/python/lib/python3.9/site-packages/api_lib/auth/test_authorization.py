@@ -1,9 +1,12 @@
 import json
 from unittest.mock import patch
 
+import pytest
+
 from api_lib.auth.authorization import (
     Authorization,
     ActionType,
+    RateLimit,
     UserResourceAuthorizationModel,
     UserGroup,
     SearchResourceAuthorizationModel,
@@ -13,6 +16,7 @@ from api_lib.auth.authorization import (
     is_admin,
 )
 from api_lib.request.api_request import ApiRequest
+from core_lib.exceptions.types import AppException
 
 
 # Test helper functions
@@ -57,6 +61,75 @@ def test_authorize(query_associated_users, get_decoded_jwt_mock):
 
     response = test_func(_api_request)
     assert response == {"status": "success"}
+    assert _api_request.authorization.principle == "test-profile"
+    assert _api_request.authorization.action_type == ActionType.Get
+
+
+def build_rate_limited_handler():
+    _api_request = ApiRequest(
+        {
+            "headers": {"Authorization": "Bearer jwt-token"},
+            "pathParameters": {"id": "test-profile"},
+        }
+    )
+
+    @authorize(
+        Authorization(
+            resource_access=ResourceAccess.AccessUser,
+            action_type=ActionType.Get,
+            rate_limit=RateLimit(limit=5, window_seconds=30),
+        )
+    )
+    def get_test_resource(api_request):
+        return {"status": "success"}
+
+    return get_test_resource, _api_request
+
+
+@patch("api_lib.auth.authorization.user_association_data_access.is_user_associated")
+@patch("api_lib.auth.authorization.rate_limit_data_access.take_token")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_authorize_rate_limit(get_decoded_jwt_mock, take_token_mock, is_associated):
+    get_decoded_jwt_mock.return_value = {"profile": "test-profile"}
+    take_token_mock.return_value = None
+    handler, _api_request = build_rate_limited_handler()
+
+    assert handler(_api_request) == {"status": "success"}
+    take_token_mock.assert_called_once_with(
+        principle="test-profile",
+        route="get_test_resource",
+        limit=5,
+        window_seconds=30,
+    )
+
+
+@patch("api_lib.auth.authorization.user_association_data_access.is_user_associated")
+@patch("api_lib.auth.authorization.rate_limit_data_access.take_token")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_authorize_rate_limit_exceeded(
+    get_decoded_jwt_mock, take_token_mock, is_associated
+):
+    get_decoded_jwt_mock.return_value = {"profile": "test-profile"}
+    take_token_mock.return_value = 12
+    handler, _api_request = build_rate_limited_handler()
+
+    with pytest.raises(AppException) as e:
+        handler(_api_request)
+
+    assert e.value.get_code() == 429
+    assert e.value.params == {"headers": {"Retry-After": "12"}}
+    # rejected before resource authorization reads the table
+    is_associated.assert_not_called()
+
+
+@patch("api_lib.auth.authorization.rate_limit_data_access.take_token")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_authorize_rate_limit_fails_open(get_decoded_jwt_mock, take_token_mock):
+    get_decoded_jwt_mock.return_value = {"profile": "test-profile"}
+    take_token_mock.side_effect = Exception("throttled")
+    handler, _api_request = build_rate_limited_handler()
+
+    assert handler(_api_request) == {"status": "success"}
 
 
 # Test UserResourceAuthorizationModel
@@ -74,8 +147,91 @@ def test_user_resource_authorization_model_is_get_allowed(query_associated_users
     assert model.is_get_allowed() is True
 
 
+@patch("api_lib.auth.authorization.user_association_data_access.is_user_associated")
+def test_user_resource_authorization_model_is_get_allowed_for_associate(
+    is_user_associated_mock,
+):
+    is_user_associated_mock.return_value = True
+
+    model = UserResourceAuthorizationModel(
+        principle="test-id",
+        user_groups=[UserGroup.User.value],
+        target_resource_id_holder={"id": "other-id"},
+        action_type=ActionType.Get,
+    )
+
+    assert model.is_get_allowed() is True
+    is_user_associated_mock.assert_called_once_with(
+        user_a_id="test-id", user_b_id="other-id"
+    )
+
+
+@patch("api_lib.auth.authorization.user_association_data_access.find_associated_users")
+def test_user_resource_authorization_model_is_principle_authorized_many(
+    find_associated_users_mock,
+):
+    find_associated_users_mock.return_value = {"associate-id"}
+
+    model = UserResourceAuthorizationModel(
+        principle="test-id",
+        user_groups=[UserGroup.User.value],
+        target_resource_id_holder=None,
+        action_type=ActionType.Get,
+    )
+
+    assert model.is_principle_authorized_many(
+        ["test-id", "associate-id", "other-id"]
+    ) == {"test-id": True, "associate-id": True, "other-id": False}
+    find_associated_users_mock.assert_called_once_with(
+        user_a_id="test-id", user_b_ids=["associate-id", "other-id"]
+    )
+
+
+@patch("api_lib.auth.authorization.user_association_data_access.find_associated_users")
+def test_user_resource_authorization_model_is_batch_get_allowed(
+    find_associated_users_mock,
+):
+    find_associated_users_mock.return_value = set()
+
+    model = UserResourceAuthorizationModel(
+        principle="test-id",
+        user_groups=[UserGroup.User.value],
+        target_resource_id_holder=None,
+        action_type=ActionType.BatchGet,
+    )
+
+    assert model.is_principle_authorized() is True
+    assert model.is_principle_authorized_many(["test-id", "other-id"]) == {
+        "test-id": True,
+        "other-id": False,
+    }
+    find_associated_users_mock.assert_called_once_with(
+        user_a_id="test-id", user_b_ids=["other-id"]
+    )
+
+
+def test_user_resource_authorization_model_is_principle_authorized_many_per_target():
+    model = UserResourceAuthorizationModel(
+        principle="test-id",
+        user_groups=[UserGroup.User.value],
+        target_resource_id_holder=None,
+        action_type=ActionType.Update,
+    )
+
+    assert model.is_principle_authorized_many(["test-id", "other-id"]) == {
+        "test-id": True,
+        "other-id": False,
+    }
+
+
+@patch(
+    "api_lib.auth.authorization.user_existence_data_access.might_user_exist",
+    return_value=True,
+)
 @patch("api_lib.auth.authorization.user_data_access.find_user_by_id")
-def test_user_resource_authorization_model_is_associate_allowed(find_user_by_id_mock):
+def test_user_resource_authorization_model_is_associate_allowed(
+    find_user_by_id_mock, might_user_exist_mock
+):
     find_user_by_id_mock.return_value = {"profile": "test-profile"}
 
     model = UserResourceAuthorizationModel(
@@ -88,6 +244,26 @@ def test_user_resource_authorization_model_is_associate_allowed(find_user_by_id_
     assert model.is_associate_allowed() is True
 
 
+@patch(
+    "api_lib.auth.authorization.user_existence_data_access.might_user_exist",
+    return_value=False,
+)
+@patch("api_lib.auth.authorization.user_data_access.find_user_by_id")
+def test_user_resource_authorization_model_is_associate_allowed_for_unknown_user(
+    find_user_by_id_mock, might_user_exist_mock
+):
+    model = UserResourceAuthorizationModel(
+        principle="test-id",
+        user_groups=[UserGroup.User.value],
+        target_resource_id_holder={"id": "unknown-id"},
+        action_type=ActionType.Associate,
+    )
+
+    assert model.is_associate_allowed() is False
+    might_user_exist_mock.assert_called_once_with("unknown-id")
+    find_user_by_id_mock.assert_not_called()
+
+
 def test_user_resource_authorization_model_is_create_allowed():
     model = UserResourceAuthorizationModel(
         principle="test-id",
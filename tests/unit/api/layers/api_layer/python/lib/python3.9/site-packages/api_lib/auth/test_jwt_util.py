@@ -1,24 +1,28 @@
 from unittest.mock import patch
 
 import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 
-from api_lib.auth.jwt_util import get_decoded_jwt, jwk_to_pem
+from api_lib.auth import jwt_util
+from api_lib.auth.jwt_util import (
+    get_decoded_jwt,
+    get_public_key,
+    jwk_to_pem,
+    jwk_to_public_key,
+)
 
 
-@patch("api_lib.auth.jwt_util.get_known_public_keys")
+@patch("api_lib.auth.jwt_util.get_known_public_key")
 @patch("api_lib.auth.jwt_util.jwt.decode")
 @patch("api_lib.auth.jwt_util.get_audience")
-def test_get_decoded_jwt(
-    get_audience_mock, jwt_decode_mock, get_known_public_keys_mock
-):
+def test_get_decoded_jwt(get_audience_mock, jwt_decode_mock, get_known_public_key_mock):
     get_audience_mock.return_value = "test-audience"
-    get_known_public_keys_mock.return_value = [
-        {
-            "kid": "test-kid",
-            "e": "AQAB",
-            "n": "some-long-string",
-        }
-    ]
+    get_known_public_key_mock.return_value = {
+        "kid": "test-kid",
+        "e": "AQAB",
+        "n": "some-long-string",
+    }
     jwt_decode_mock.return_value = {
         "aud": "test-audience",
         "exp": 2000000000,  # Some future timestamp
@@ -43,3 +47,88 @@ def test_jwk_to_pem():
     pem = jwk_to_pem(jwk)
     assert "-----BEGIN PUBLIC KEY-----" in pem
     assert "-----END PUBLIC KEY-----" in pem
+
+
+def test_jwk_to_public_key():
+    jwk = {
+        "kid": "test-kid",
+        "e": "AQAB",
+        "n": "vrKIm5IYQa4TA4rpwMvxetYx8QvhFyJLu3Sgf3HhjsM",
+    }
+    public_key = jwk_to_public_key(jwk)
+    assert isinstance(public_key, rsa.RSAPublicKey)
+    assert public_key.public_numbers().e == 65537
+
+
+@patch("api_lib.auth.jwt_util.get_known_public_key")
+def test_get_public_key_is_built_once_per_kid(get_known_public_key_mock):
+    jwt_util.PUBLIC_KEYS.clear()
+    get_known_public_key_mock.return_value = {
+        "kid": "cached-kid",
+        "e": "AQAB",
+        "n": "vrKIm5IYQa4TA4rpwMvxetYx8QvhFyJLu3Sgf3HhjsM",
+    }
+
+    first_key = get_public_key("cached-kid")
+    second_key = get_public_key("cached-kid")
+
+    assert first_key is second_key
+
+
+@patch("api_lib.auth.jwt_util.get_known_public_key")
+def test_get_public_key_unknown_kid(get_known_public_key_mock):
+    jwt_util.PUBLIC_KEYS["rotated-kid"] = "stale-key"
+    get_known_public_key_mock.return_value = None
+
+    with pytest.raises(jwt.InvalidTokenError):
+        get_public_key("rotated-kid")
+
+    assert "rotated-kid" not in jwt_util.PUBLIC_KEYS
+
+
+@patch("api_lib.auth.jwt_util.get_public_key")
+@patch("api_lib.auth.jwt_util.jwt.decode")
+@patch("api_lib.auth.jwt_util.get_audience")
+def test_get_decoded_jwt_reuses_verified_claims(
+    get_audience_mock, jwt_decode_mock, get_public_key_mock
+):
+    jwt_util.VERIFIED_CLAIMS_CACHE.clear()
+    get_audience_mock.return_value = "test-audience"
+    jwt_decode_mock.return_value = {"aud": "test-audience", "exp": 2000000000}
+    token = jwt.encode(
+        {"aud": "test-audience"},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "repeat-kid"},
+    )
+
+    stats_before = jwt_util.get_verified_claims_cache_stats()
+    first_result = get_decoded_jwt(token)
+    second_result = get_decoded_jwt(token)
+    stats_after = jwt_util.get_verified_claims_cache_stats()
+
+    assert first_result == second_result == {"aud": "test-audience", "exp": 2000000000}
+    jwt_decode_mock.assert_called_once()
+    assert stats_after["hits"] - stats_before["hits"] == 1
+    assert stats_after["misses"] - stats_before["misses"] == 1
+
+
+@patch("api_lib.auth.jwt_util.get_public_key")
+@patch("api_lib.auth.jwt_util.jwt.decode")
+@patch("api_lib.auth.jwt_util.get_audience")
+def test_get_decoded_jwt_does_not_reuse_expired_claims(
+    get_audience_mock, jwt_decode_mock, get_public_key_mock
+):
+    jwt_util.VERIFIED_CLAIMS_CACHE.clear()
+    get_audience_mock.return_value = "test-audience"
+    jwt_decode_mock.return_value = {"aud": "test-audience", "exp": 1000}
+    token = jwt.encode(
+        {"aud": "test-audience"},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "expired-kid"},
+    )
+
+    assert get_decoded_jwt(token, check_exp_claim=False) is not False
+    assert get_decoded_jwt(token, check_exp_claim=False) is not False
+    assert jwt_decode_mock.call_count == 2
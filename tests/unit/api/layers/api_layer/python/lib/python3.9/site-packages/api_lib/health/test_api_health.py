@@ -0,0 +1,116 @@
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from api_lib.health import api_health
+from api_lib.request.api_request import ApiRequest
+from core_lib.utils.cache_util import LRUCache
+
+
+@pytest.fixture(autouse=True)
+def health_check_cache():
+    with patch.object(api_health, "HEALTH_CHECK_CACHE", LRUCache(ttl_seconds=30)):
+        yield
+
+
+def deep_health_check(probes: dict):
+    return api_health.health_check_response(
+        api_request=ApiRequest({"queryStringParameters": {"deep": "true"}}),
+        probes=probes,
+    )
+
+
+def test_health_check_response_shallow():
+    probe = Mock()
+
+    response = api_health.health_check_response(
+        api_request=ApiRequest({}), probes={"database": probe}
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"status": "pass"}
+    probe.assert_not_called()
+
+
+def test_health_check_response_deep():
+    auth_probe = Mock()
+    database_probe = Mock()
+
+    response = deep_health_check({"auth": auth_probe, "database": database_probe})
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Cache-Control"] == "no-store"
+    body = json.loads(response["body"])
+    assert body["status"] == "pass"
+    assert body["checks"]["auth"]["status"] == "pass"
+    assert body["checks"]["auth"]["cached"] is False
+    assert body["checks"]["database"]["status"] == "pass"
+    auth_probe.assert_called_once()
+    database_probe.assert_called_once()
+
+
+@patch("api_lib.health.api_health.log_warning")
+def test_health_check_response_deep_failure(_):
+    database_probe = Mock(side_effect=ConnectionError("unreachable"))
+
+    response = deep_health_check({"auth": Mock(), "database": database_probe})
+
+    assert response["statusCode"] == 503
+    body = json.loads(response["body"])
+    assert body["status"] == "fail"
+    assert body["checks"]["auth"]["status"] == "pass"
+    assert body["checks"]["database"]["status"] == "fail"
+    assert body["checks"]["database"]["error"] == "ConnectionError"
+
+
+def test_run_health_checks_cached():
+    probe = Mock()
+
+    api_health.run_health_checks({"database": probe})
+    checks = api_health.run_health_checks({"database": probe})
+
+    probe.assert_called_once()
+    assert checks["database"]["status"] == "pass"
+    assert checks["database"]["cached"] is True
+
+
+def test_run_health_checks_parallel():
+    def slow_probe():
+        time.sleep(0.2)
+
+    started_at = time.perf_counter()
+    api_health.run_health_checks({"a": slow_probe, "b": slow_probe, "c": slow_probe})
+
+    assert time.perf_counter() - started_at < 0.5
+
+
+@patch("api_lib.health.api_health.log_warning")
+@patch("api_lib.health.api_health.HEALTH_CHECK_TIMEOUT_SECONDS", 0.05)
+def test_run_health_checks_timeout(_):
+    checks = api_health.run_health_checks({"database": lambda: time.sleep(0.3)})
+
+    assert checks["database"] == {
+        "status": "fail",
+        "error": "timed out",
+        "cached": False,
+    }
+
+
+@patch("api_lib.health.api_health.log_warning")
+@patch("api_lib.health.api_health.HEALTH_CHECK_TIMEOUT_SECONDS", 0.05)
+def test_run_health_checks_caches_late_result_of_timed_out_probe(_):
+    probe = Mock(side_effect=lambda: time.sleep(0.2))
+
+    assert api_health.run_health_checks({"late": probe})["late"]["status"] == "fail"
+    # still running, the probe is awaited again rather than started twice
+    assert api_health.run_health_checks({"late": probe})["late"]["status"] == "fail"
+    assert api_health.HEALTH_CHECK_CACHE.get("late") is None
+
+    time.sleep(0.3)
+    checks = api_health.run_health_checks({"late": probe})
+
+    probe.assert_called_once()
+    assert checks["late"]["status"] == "pass"
+    assert checks["late"]["cached"] is True
@@ -0,0 +1,89 @@
+from unittest.mock import Mock, patch
+
+from api_lib.request.api_access_log import (
+    build_access_record,
+    log_access_record,
+    redact_event,
+)
+
+EVENT = {
+    "resource": "/v1.0/user/{id}",
+    "path": "/v1.0/user/abc",
+    "httpMethod": "GET",
+    "headers": {"Authorization": "Bearer jwt", "user-agent": "test-agent"},
+    "multiValueHeaders": {"Authorization": ["Bearer jwt"]},
+    "requestContext": {"requestId": "request-1", "identity": {"sourceIp": "1.2.3.4"}},
+    "body": "abcd",
+}
+
+
+@patch("api_lib.request.api_access_log.safe_get_thread_attribute")
+def test_build_access_record(mock_safe_get_thread_attribute):
+    mock_safe_get_thread_attribute.return_value = "abc"
+    api_request = Mock()
+    api_request.authorization.format.return_value = {"action_type": "GET"}
+
+    record = build_access_record(
+        event=EVENT,
+        api_request=api_request,
+        response={"statusCode": 200, "body": "0123456789"},
+        route="get",
+        duration_ms=12.345,
+    )
+
+    assert record["log_type"] == "APP_ACCESS_LOG"
+    assert record["event_type"] == "API_ACCESS"
+    assert record["request_id"] == "request-1"
+    assert record["route"] == "get"
+    assert record["http_method"] == "GET"
+    assert record["resource"] == "/v1.0/user/{id}"
+    assert record["source_ip"] == "1.2.3.4"
+    assert record["user_agent"] == "test-agent"
+    assert record["principle"] == "abc"
+    assert record["authorization"] == {"action_type": "GET"}
+    assert record["status_code"] == 200
+    assert record["duration_ms"] == 12.3
+    assert record["request_bytes"] == 4
+    assert record["response_bytes"] == 10
+    assert "lambda_event" not in record
+
+
+def test_build_access_record_without_response():
+    record = build_access_record(
+        event={}, api_request=None, response=None, route="get", duration_ms=1
+    )
+
+    assert record["status_code"] == 502
+    assert record["authorization"] is None
+    assert record["response_bytes"] == 0
+
+
+@patch("api_lib.request.api_access_log.API_ACCESS_LOG_EVENT_MAX_CHARS", 64)
+@patch("api_lib.request.api_access_log.API_ACCESS_LOG_EVENT", True)
+def test_build_access_record_with_event():
+    record = build_access_record(
+        event=EVENT, api_request=None, response={}, route="get", duration_ms=1
+    )
+
+    assert len(record["lambda_event"]) == 64
+    assert "jwt" not in record["lambda_event"]
+
+
+def test_redact_event():
+    redacted_event = redact_event(EVENT)
+
+    assert redacted_event["headers"] == {"user-agent": "test-agent"}
+    assert redacted_event["multiValueHeaders"] == {}
+    assert EVENT["headers"]["Authorization"] == "Bearer jwt"
+
+
+@patch("api_lib.request.api_access_log.log_unexpected_exception")
+@patch("api_lib.request.api_access_log.build_access_record")
+def test_log_access_record_never_raises(mock_build_access_record, mock_log_exception):
+    mock_build_access_record.side_effect = Exception("boom")
+
+    log_access_record(
+        event={}, api_request=None, response=None, route="get", started_at=0
+    )
+
+    mock_log_exception.assert_called_once()
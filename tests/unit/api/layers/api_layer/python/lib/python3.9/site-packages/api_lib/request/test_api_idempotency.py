@@ -0,0 +1,159 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api_lib.request import api_idempotency
+from api_lib.request.api_idempotency import idempotent
+from api_lib.request.api_request import ApiRequest
+from core_lib.exceptions.types import AppException
+
+EVENT = {
+    "httpMethod": "POST",
+    "resource": "/v1.0/signup",
+    "path": "/v1.0/signup",
+    "headers": {"idempotency-key": "key-1"},
+    "body": json.dumps({"username": "abc"}),
+}
+RESPONSE = {"statusCode": 201, "headers": {"Content-Type": "application/json"}}
+
+
+def build_handler(response=RESPONSE):
+    handler = MagicMock(return_value=response)
+    return handler, idempotent()(handler)
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_without_key(idempotency_data_access):
+    handler, wrapper = build_handler()
+    api_request = ApiRequest({**EVENT, "headers": {}})
+
+    assert wrapper(api_request) == RESPONSE
+    handler.assert_called_once_with(api_request=api_request)
+    idempotency_data_access.acquire_idempotency_record.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_invalid_key(idempotency_data_access):
+    handler, wrapper = build_handler()
+
+    with pytest.raises(AppException) as e:
+        wrapper(ApiRequest({**EVENT, "headers": {"Idempotency-Key": "k" * 256}}))
+
+    assert e.value.get_code() == 400
+    handler.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_first_request(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = None
+    handler, wrapper = build_handler()
+    api_request = ApiRequest(EVENT)
+
+    assert wrapper(api_request) == RESPONSE
+    handler.assert_called_once_with(api_request=api_request)
+    record_id = idempotency_data_access.acquire_idempotency_record.call_args.kwargs[
+        "record_id"
+    ]
+    idempotency_data_access.complete_idempotency_record.assert_called_once_with(
+        record_id=record_id, response=RESPONSE
+    )
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_record_id_is_scoped(idempotency_data_access):
+    key_1 = api_idempotency.build_record_id(ApiRequest(EVENT), "key-1")
+
+    assert key_1 == api_idempotency.build_record_id(ApiRequest(EVENT), "key-1")
+    assert key_1 != api_idempotency.build_record_id(ApiRequest(EVENT), "key-2")
+    assert key_1 != api_idempotency.build_record_id(
+        ApiRequest({**EVENT, "resource": "/v1.0/auth"}), "key-1"
+    )
+    with patch.object(
+        api_idempotency, "safe_get_thread_attribute", return_value="user-a"
+    ):
+        assert key_1 != api_idempotency.build_record_id(ApiRequest(EVENT), "key-1")
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_replay(idempotency_data_access):
+    fingerprint = api_idempotency.build_fingerprint(ApiRequest(EVENT))
+    idempotency_data_access.acquire_idempotency_record.return_value = {
+        "record_status": "COMPLETE",
+        "fingerprint": fingerprint,
+        "stored_response": {**RESPONSE, "statusCode": 201.0, "body": "{}"},
+    }
+    handler, wrapper = build_handler()
+
+    response = wrapper(ApiRequest(EVENT))
+
+    assert response["statusCode"] == 201
+    assert response["body"] == "{}"
+    assert response["headers"]["Idempotent-Replayed"] == "true"
+    handler.assert_not_called()
+    idempotency_data_access.complete_idempotency_record.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_in_progress(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = {
+        "record_status": "IN_PROGRESS",
+        "fingerprint": api_idempotency.build_fingerprint(ApiRequest(EVENT)),
+    }
+    handler, wrapper = build_handler()
+
+    response = wrapper(ApiRequest(EVENT))
+
+    assert response["statusCode"] == 409
+    assert response["headers"]["Retry-After"] == "1"
+    handler.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_different_request(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = {
+        "record_status": "COMPLETE",
+        "fingerprint": "other",
+    }
+    handler, wrapper = build_handler()
+
+    with pytest.raises(AppException) as e:
+        wrapper(ApiRequest(EVENT))
+
+    assert e.value.get_code() == 422
+    handler.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_releases_failed_request(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = None
+    handler, wrapper = build_handler()
+    handler.side_effect = Exception("failed")
+
+    with pytest.raises(Exception):
+        wrapper(ApiRequest(EVENT))
+
+    idempotency_data_access.release_idempotency_record.assert_called_once()
+    idempotency_data_access.complete_idempotency_record.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_releases_server_error(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = None
+    _, wrapper = build_handler(response={"statusCode": 503})
+
+    assert wrapper(ApiRequest(EVENT)) == {"statusCode": 503}
+    idempotency_data_access.release_idempotency_record.assert_called_once()
+    idempotency_data_access.complete_idempotency_record.assert_not_called()
+
+
+@patch.object(api_idempotency, "idempotency_data_access")
+def test_idempotent_releases_unstorable_response(idempotency_data_access):
+    idempotency_data_access.acquire_idempotency_record.return_value = None
+    idempotency_data_access.complete_idempotency_record.side_effect = Exception(
+        "item too large"
+    )
+    _, wrapper = build_handler()
+
+    assert wrapper(ApiRequest(EVENT)) == RESPONSE
+    idempotency_data_access.release_idempotency_record.assert_called_once()
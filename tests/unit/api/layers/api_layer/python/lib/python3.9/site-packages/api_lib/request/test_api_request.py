@@ -1,7 +1,20 @@
+import base64
 import json
+from threading import current_thread
 from unittest.mock import patch, Mock
 
+import pytest
+
+from api_lib.auth.authorization import (
+    ActionType,
+    Authorization,
+    RateLimit,
+    authorize,
+)
+from api_lib.request.api_idempotency import idempotent
 from api_lib.request.api_request import api, ApiRequest
+from core_lib.exceptions.types import AppException
+from core_lib.utils.thread_util import safe_get_thread_attribute
 
 
 def test_api_request_initialization():
@@ -36,3 +49,184 @@ def test_api_decorator(ApiRequestMock):
 
     ApiRequestMock.assert_called_once_with(event)
     func_mock.assert_called_once()
+
+
+def test_api_request_headers_are_case_insensitive():
+    api_request = ApiRequest(
+        {"headers": {"content-type": "application/json", "Origin": "https://a.com"}}
+    )
+
+    assert api_request.headers.get("Content-Type") == "application/json"
+    assert api_request.headers["origin"] == "https://a.com"
+    assert "CONTENT-TYPE" in api_request.headers
+    assert api_request.headers.get("Authorization") is None
+
+
+def test_api_request_without_headers():
+    api_request = ApiRequest({"headers": None, "body": None})
+
+    assert api_request.headers == {}
+    assert api_request.body is None
+
+
+@patch("api_lib.request.api_request.json_util")
+def test_api_request_parses_body_lazily_once(mock_json_util):
+    mock_json_util.loads.return_value = {"key1": "value1"}
+    api_request = ApiRequest(
+        {
+            "headers": {"content-type": "application/json; charset=utf-8"},
+            "body": json.dumps({"key1": "value1"}),
+        }
+    )
+
+    mock_json_util.loads.assert_not_called()
+
+    assert api_request.body == {"key1": "value1"}
+    assert api_request.body == {"key1": "value1"}
+    mock_json_util.loads.assert_called_once()
+
+
+def test_api_request_decodes_base64_body():
+    api_request = ApiRequest(
+        {
+            "headers": {},
+            "body": base64.b64encode(b'{"key1": "value1"}').decode(),
+            "isBase64Encoded": True,
+        }
+    )
+
+    assert api_request.body == {"key1": "value1"}
+
+
+def test_api_request_does_not_parse_non_json_body():
+    api_request = ApiRequest({"headers": {"Content-Type": "text/plain"}, "body": "{"})
+
+    assert api_request.body == "{"
+
+
+def test_api_request_invalid_json_body():
+    api_request = ApiRequest({"headers": {}, "body": "{"})
+
+    with pytest.raises(AppException) as e:
+        api_request.body
+
+    assert e.value.get_code() == 400
+
+
+@patch("api_lib.request.api_request.API_MAX_BODY_BYTES", 8)
+def test_api_decorator_rejects_large_body():
+    func_mock = Mock()
+
+    response = api()(func_mock)({"headers": {}, "body": json.dumps({"key": "value"})})
+
+    assert response["statusCode"] == 413
+    func_mock.assert_not_called()
+
+
+def test_api_decorator_formats_app_exception():
+    def func(api_request):
+        raise AppException(message="conflict", code=409)
+
+    response = api()(func)({"headers": {}})
+
+    assert response["statusCode"] == 409
+    assert json.loads(response["body"]) == {"message": "conflict"}
+
+
+def test_api_decorator_formats_app_exception_headers():
+    def func(api_request):
+        raise AppException(
+            message="slow down", code=429, params={"headers": {"Retry-After": "7"}}
+        )
+
+    response = api()(func)({"headers": {}})
+
+    assert response["statusCode"] == 429
+    assert response["headers"]["Retry-After"] == "7"
+
+
+@patch("api_lib.request.api_request.log_access_record")
+def test_api_decorator_logs_one_access_record(mock_log_access_record):
+    current_thread().__setattr__("principle", "previous-principal")
+
+    def get(api_request):
+        assert safe_get_thread_attribute("principle") is None
+        return {"statusCode": 200}
+
+    event = {"headers": {}}
+    response = api()(get)(event)
+
+    mock_log_access_record.assert_called_once()
+    kwargs = mock_log_access_record.call_args.kwargs
+    assert kwargs["event"] is event
+    assert kwargs["response"] is response
+    assert kwargs["route"] == "get"
+
+
+@patch("api_lib.auth.authorization.rate_limit_data_access.take_token")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+@patch("api_lib.request.api_request.log_access_record")
+def test_api_decorator_logs_route_of_decorated_handler(
+    mock_log_access_record, mock_get_decoded_jwt, mock_take_token
+):
+    mock_get_decoded_jwt.return_value = {"profile": "abc"}
+    mock_take_token.return_value = None
+
+    @api()
+    @authorize(
+        Authorization(
+            resource_access=None,
+            action_type=ActionType.Get,
+            rate_limit=RateLimit(limit=5),
+        )
+    )
+    @idempotent()
+    def get_test_resource(api_request):
+        return {"statusCode": 200}
+
+    get_test_resource({"headers": {"Authorization": "Bearer jwt-token"}})
+
+    assert get_test_resource.__name__ == "get_test_resource"
+    assert mock_log_access_record.call_args.kwargs["route"] == "get_test_resource"
+    assert mock_take_token.call_args.kwargs["route"] == "get_test_resource"
+
+
+@patch("api_lib.request.api_request.log_access_record")
+def test_api_decorator_logs_access_record_on_error(mock_log_access_record):
+    def get(api_request):
+        raise Exception("boom")
+
+    with pytest.raises(Exception):
+        api()(get)({"headers": {}})
+
+    assert mock_log_access_record.call_args.kwargs["response"] is None
+
+
+@patch("api_lib.request.api_request.log_access_record")
+def test_api_decorator_skip_access_log(mock_log_access_record):
+    api(skip_access_log=True)(Mock())({"headers": {}})
+
+    mock_log_access_record.assert_not_called()
+
+
+def test_api_request_get_fields():
+    allowed_fields = ("profile", "username", "email")
+
+    assert ApiRequest({"queryStringParameters": None}).get_fields(allowed_fields) == [
+        "profile",
+        "username",
+        "email",
+    ]
+    assert ApiRequest(
+        {"queryStringParameters": {"fields": "username, profile,username"}}
+    ).get_fields(allowed_fields) == ["username", "profile"]
+
+
+@pytest.mark.parametrize("fields", ["", " , ", "username,pk"])
+def test_api_request_get_fields_rejects_unknown_fields(fields):
+    api_request = ApiRequest({"queryStringParameters": {"fields": fields}})
+
+    with pytest.raises(AppException) as e:
+        api_request.get_fields(("profile", "username"))
+
+    assert e.value.get_code() == 400
@@ -0,0 +1,42 @@
+import json
+from unittest.mock import MagicMock
+
+from api_lib.request.api_router import api_router
+
+
+def test_api_router_dispatches_on_method_and_resource():
+    get = MagicMock(return_value={"statusCode": 200})
+    update = MagicMock(return_value={"statusCode": 201})
+    router = api_router(
+        {("GET", "/v1.0/user/{id}"): get, ("patch", "/v1.0/user/{id}"): update}
+    )
+    event = {"httpMethod": "PATCH", "resource": "/v1.0/user/{id}", "headers": {}}
+
+    assert router(event, "context") == {"statusCode": 201}
+    update.assert_called_once_with(event, "context")
+    get.assert_not_called()
+
+
+def test_api_router_unknown_resource():
+    router = api_router({("GET", "/v1.0/user"): MagicMock()})
+
+    response = router({"httpMethod": "GET", "resource": "/v1.0/other"}, None)
+
+    assert response["statusCode"] == 404
+    assert json.loads(response["body"]) == {"message": "resource not found"}
+
+
+def test_api_router_method_not_allowed():
+    router = api_router(
+        {
+            ("GET", "/v1.0/user/{id}"): MagicMock(),
+            ("DELETE", "/v1.0/user/{id}"): MagicMock(),
+        }
+    )
+
+    response = router(
+        {"httpMethod": "PUT", "resource": "/v1.0/user/{id}", "headers": None}, None
+    )
+
+    assert response["statusCode"] == 405
+    assert response["headers"]["Allow"] == "DELETE,GET"
@@ -0,0 +1,39 @@
+import pytest
+
+from api_lib.request.request_headers import RequestHeaders, get_request_header
+
+
+def test_get_request_header_of_plain_headers_is_case_insensitive():
+    headers = {"accept-encoding": "gzip", "If-None-Match": '"abc"'}
+
+    assert get_request_header(headers, "Accept-Encoding") == "gzip"
+    assert get_request_header(headers, "if-none-match") == '"abc"'
+    assert get_request_header(headers, "User-Agent") is None
+
+
+def test_get_request_header_of_request_headers():
+    headers = RequestHeaders({"User-Agent": "test-agent"})
+
+    assert get_request_header(headers, "user-agent") == "test-agent"
+
+
+def test_get_request_header_without_headers():
+    assert get_request_header(None, "User-Agent") is None
+    assert get_request_header({}, "User-Agent") is None
+
+
+def test_request_headers_are_read_only():
+    headers = RequestHeaders({"Content-Type": "application/json"})
+
+    with pytest.raises(TypeError):
+        headers["content-type"] = "text/plain"
+    assert not hasattr(headers, "update")
+    assert not hasattr(headers, "pop")
+
+
+def test_request_headers_compare_as_mapping():
+    headers = RequestHeaders({"Content-Type": "application/json"})
+
+    assert headers == {"Content-Type": "application/json"}
+    assert dict(headers) == {"Content-Type": "application/json"}
+    assert len(headers) == 1
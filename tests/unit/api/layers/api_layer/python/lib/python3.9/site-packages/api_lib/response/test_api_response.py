@@ -1,10 +1,17 @@
+import base64
+import gzip
 import json
 import os
+from unittest.mock import patch
 
 from api_lib.response.api_response import (
     ApiResponse,
+    build_etag,
+    is_etag_matched,
+    negotiate_content_encoding,
     set_access_control_allow_origin,
 )
+from core_lib.utils import json_util
 
 
 def test_api_response_initialization_and_formatting():
@@ -21,7 +28,7 @@ def test_api_response_initialization_and_formatting():
         "Access-Control-Allow-Origin": "https://example.com",
         "Access-Control-Allow-Credentials": "true",
         "Access-Control-Allow-Headers": "Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token,"
-        "X-Access-Token,X-Refresh-Token,",
+        "X-Access-Token,X-Refresh-Token,If-None-Match,Idempotency-Key,",
         "Access-Control-Allow-Methods": "OPTIONS,POST,GET,PATCH,DELETE,PUT",
         "Content-Type": "application/json",
         "strict-transport-security": "max-age=31536000; includeSubdomains; preload",
@@ -32,7 +39,7 @@ def test_api_response_initialization_and_formatting():
     }
 
     assert formatted_response["statusCode"] == status_code
-    assert formatted_response["body"] == json.dumps(response_body, cls=json.JSONEncoder)
+    assert formatted_response["body"] == json_util.dumps(response_body)
     assert formatted_response["headers"] == expected_headers
 
 
@@ -47,3 +54,222 @@ def test_set_access_control_allow_origin():
 
     os.environ["CORS_ALLOWED_ORIGINS"] = "*"
     assert set_access_control_allow_origin(request_headers) == "https://invalid.com"
+
+
+LARGE_RESPONSE_BODY = [
+    {"profile": f"user-{i}", "first_name": "first"} for i in range(100)
+]
+
+
+def test_api_response_small_body_is_not_compressed():
+    api_response = ApiResponse({"Accept-Encoding": "gzip"}, 200, {"key": "value"})
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["body"] == '{"key":"value"}'
+    assert "isBase64Encoded" not in formatted_response
+    assert "Content-Encoding" not in formatted_response["headers"]
+
+
+def test_api_response_gzip():
+    api_response = ApiResponse(
+        {"accept-encoding": "gzip, deflate"}, 200, LARGE_RESPONSE_BODY
+    )
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["isBase64Encoded"] is True
+    assert formatted_response["headers"]["Content-Encoding"] == "gzip"
+    assert formatted_response["headers"]["Vary"] == "Accept-Encoding"
+    body = gzip.decompress(base64.b64decode(formatted_response["body"]))
+    assert json.loads(body) == LARGE_RESPONSE_BODY
+
+
+def test_api_response_without_accept_encoding():
+    api_response = ApiResponse({}, 200, LARGE_RESPONSE_BODY)
+
+    formatted_response = api_response.format()
+
+    assert json.loads(formatted_response["body"]) == LARGE_RESPONSE_BODY
+    assert "isBase64Encoded" not in formatted_response
+    assert formatted_response["headers"]["Vary"] == "Accept-Encoding"
+
+
+@patch("api_lib.response.api_response.brotli")
+def test_api_response_prefers_brotli(mock_brotli):
+    mock_brotli.compress.return_value = b"compressed"
+    api_response = ApiResponse(
+        {"Accept-Encoding": "gzip, br"}, 200, LARGE_RESPONSE_BODY
+    )
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["headers"]["Content-Encoding"] == "br"
+    assert base64.b64decode(formatted_response["body"]) == b"compressed"
+
+
+@patch("api_lib.response.api_response.brotli", None)
+def test_negotiate_content_encoding():
+    assert negotiate_content_encoding(None) is None
+    assert negotiate_content_encoding("identity") is None
+    assert negotiate_content_encoding("br") is None
+    assert negotiate_content_encoding("gzip;q=0") is None
+    assert negotiate_content_encoding("*") == "gzip"
+    assert negotiate_content_encoding("deflate, GZIP;q=0.5") == "gzip"
+
+
+@patch("api_lib.response.api_response.brotli")
+def test_negotiate_content_encoding_with_brotli(mock_brotli):
+    assert negotiate_content_encoding("gzip, br") == "br"
+    assert negotiate_content_encoding("gzip, br;q=0.5") == "gzip"
+    assert negotiate_content_encoding("br, *;q=0") == "br"
+
+
+def test_api_response_etag():
+    api_response = ApiResponse({}, 200, {"key": "value"}, etag=True)
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["statusCode"] == 200
+    assert formatted_response["body"] == '{"key":"value"}'
+    assert formatted_response["headers"]["ETag"] == build_etag(b'{"key":"value"}')
+    assert "Cache-Control" not in formatted_response["headers"]
+
+
+def test_api_response_etag_not_modified():
+    etag = build_etag(b'{"key":"value"}')
+    api_response = ApiResponse(
+        {"If-None-Match": f"W/{etag}"},
+        200,
+        {"key": "value"},
+        etag=True,
+        cache_control="private, max-age=60",
+    )
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["statusCode"] == 304
+    assert formatted_response["body"] is None
+    assert formatted_response["headers"]["ETag"] == etag
+    assert formatted_response["headers"]["Cache-Control"] == "private, max-age=60"
+
+
+def test_api_response_etag_varies_by_content_encoding():
+    body = json_util.dumps_bytes(LARGE_RESPONSE_BODY)
+
+    gzip_response = ApiResponse(
+        {"Accept-Encoding": "gzip"}, 200, LARGE_RESPONSE_BODY, etag=True
+    ).format()
+    identity_response = ApiResponse({}, 200, LARGE_RESPONSE_BODY, etag=True).format()
+
+    assert gzip_response["headers"]["ETag"] == build_etag(body, "gzip")
+    assert identity_response["headers"]["ETag"] == build_etag(body)
+    assert gzip_response["headers"]["ETag"] != identity_response["headers"]["ETag"]
+
+
+def test_api_response_etag_not_modified_for_same_content_encoding():
+    etag = build_etag(json_util.dumps_bytes(LARGE_RESPONSE_BODY), "gzip")
+
+    not_modified_response = ApiResponse(
+        {"Accept-Encoding": "gzip", "If-None-Match": etag},
+        200,
+        LARGE_RESPONSE_BODY,
+        etag=True,
+    ).format()
+    identity_response = ApiResponse(
+        {"If-None-Match": etag}, 200, LARGE_RESPONSE_BODY, etag=True
+    ).format()
+
+    assert not_modified_response["statusCode"] == 304
+    assert not_modified_response["body"] is None
+    assert identity_response["statusCode"] == 200
+
+
+def test_is_etag_matched():
+    assert is_etag_matched(None, '"a"') is False
+    assert is_etag_matched('"b"', '"a"') is False
+    assert is_etag_matched('"b", "a"', '"a"') is True
+    assert is_etag_matched("*", '"a"') is True
+
+
+@patch("api_lib.response.api_response.API_RESPONSE_OFFLOAD_MIN_BYTES", 1000)
+@patch("api_lib.response.api_response.file_storage_service")
+def test_api_response_offload(mock_file_storage_service):
+    mock_file_storage_service.get_app_storage_bucket.return_value = "bucket"
+    mock_file_storage_service.upload.return_value = {}
+    mock_file_storage_service.generate_presigned_download_url.return_value = "url"
+    api_response = ApiResponse({}, 200, LARGE_RESPONSE_BODY)
+
+    formatted_response = api_response.format()
+
+    body = json_util.dumps_bytes(LARGE_RESPONSE_BODY)
+    upload_kwargs = mock_file_storage_service.upload.call_args.kwargs
+    assert upload_kwargs["bucket_name"] == "bucket"
+    assert upload_kwargs["key"].startswith("api-responses/")
+    assert upload_kwargs["content"] == body
+    mock_file_storage_service.generate_presigned_download_url.assert_called_once_with(
+        bucket_name="bucket", key=upload_kwargs["key"], expires_in=300
+    )
+    assert formatted_response["statusCode"] == 200
+    assert json.loads(formatted_response["body"]) == {
+        "offloaded_response": {
+            "url": "url",
+            "expires_in": 300,
+            "content_type": "application/json",
+            "content_length": len(body),
+        }
+    }
+    assert "Vary" not in formatted_response["headers"]
+
+
+@patch("api_lib.response.api_response.API_RESPONSE_OFFLOAD_MIN_BYTES", 1000)
+@patch("api_lib.response.api_response.file_storage_service")
+def test_api_response_offload_measures_escaped_body(mock_file_storage_service):
+    mock_file_storage_service.upload.return_value = {}
+    mock_file_storage_service.generate_presigned_download_url.return_value = "url"
+    response_body = {"text": '"' * 450}
+    api_response = ApiResponse({}, 200, response_body)
+
+    formatted_response = api_response.format()
+
+    # the body is below the limit, escaped into the proxy response it is not
+    assert len(json_util.dumps_bytes(response_body)) < 1000
+    assert "offloaded_response" in json.loads(formatted_response["body"])
+    mock_file_storage_service.upload.assert_called_once()
+
+
+@patch("api_lib.response.api_response.API_RESPONSE_OFFLOAD_MIN_BYTES", 1000)
+@patch("api_lib.response.api_response.file_storage_service")
+def test_api_response_small_body_is_not_measured(mock_file_storage_service):
+    with patch("api_lib.response.api_response.json_util") as mock_json_util:
+        mock_json_util.dumps_bytes.return_value = b'{"key":"value"}'
+        formatted_response = ApiResponse({}, 200, {"key": "value"}).format()
+
+    assert formatted_response["body"] == '{"key":"value"}'
+    mock_json_util.dumps_bytes.assert_called_once_with({"key": "value"})
+    mock_file_storage_service.upload.assert_not_called()
+
+
+# leaves room for the headers of the proxy response
+@patch("api_lib.response.api_response.API_RESPONSE_OFFLOAD_MIN_BYTES", 2000)
+@patch("api_lib.response.api_response.file_storage_service")
+def test_api_response_offload_after_compression(mock_file_storage_service):
+    api_response = ApiResponse({"Accept-Encoding": "gzip"}, 200, LARGE_RESPONSE_BODY)
+
+    formatted_response = api_response.format()
+
+    # compressed below the limit, the body stays inline
+    assert formatted_response["headers"]["Content-Encoding"] == "gzip"
+    mock_file_storage_service.upload.assert_not_called()
+
+
+@patch("api_lib.response.api_response.API_RESPONSE_OFFLOAD_MIN_BYTES", 1000)
+@patch("api_lib.response.api_response.file_storage_service")
+def test_api_response_offload_upload_failed(mock_file_storage_service):
+    mock_file_storage_service.upload.return_value = None
+    api_response = ApiResponse({}, 200, LARGE_RESPONSE_BODY)
+
+    formatted_response = api_response.format()
+
+    assert formatted_response["statusCode"] == 500
+    mock_file_storage_service.generate_presigned_download_url.assert_not_called()
@@ -1,22 +1,50 @@
 import json
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+import pytest
 
 from api.search import search_controller
 from api_lib.response.api_response import ApiResponse
+from core_lib.utils.cache_util import LRUCache
 
 
-@patch("api.search.search_controller.auth_service")
-@patch("api.search.search_controller.search_service")
-def test_health(search_service, auth_service):
-    auth_service.health_check.return_value = None
-    search_service.health_check.return_value = None
+@pytest.fixture(autouse=True)
+def take_token():
+    # rate limited routes never reach the DynamoDB token buckets
+    with patch(
+        "api_lib.auth.authorization.rate_limit_data_access.take_token",
+        return_value=None,
+    ) as mock_take_token:
+        yield mock_take_token
+
+
+def test_health():
+    mock_probe = Mock()
+    with patch.dict(
+        "api.search.search_controller.HEALTH_PROBES",
+        {"auth": mock_probe, "search": mock_probe},
+    ):
+        response = search_controller.health(event={}, context=None)
 
-    response = search_controller.health(event={}, context=None)
-    assert response == ApiResponse(
-        request_headers={},
-        status_code=200,
-        response_body=None,
-    ).format(skip_access_log=True)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"status": "pass"}
+    mock_probe.assert_not_called()
+
+
+@patch("api_lib.health.api_health.HEALTH_CHECK_CACHE", LRUCache())
+def test_health_deep():
+    with patch.dict(
+        "api.search.search_controller.HEALTH_PROBES",
+        {"auth": lambda: None, "search": lambda: None},
+    ):
+        response = search_controller.health(
+            event={"queryStringParameters": {"deep": "true"}}, context=None
+        )
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["status"] == "pass"
+    assert set(body["checks"]) == {"auth", "search"}
 
 
 @patch("api.search.search_controller.search_service")
@@ -36,8 +64,11 @@ def test_search_users(mock_get_decoded_jwt, search_service):
         event={"headers": headers, "body": json.dumps({"search_str": "test"})},
         context={},
     )
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=200,
-        response_body=expected_search_results,
-    ).format(skip_access_log=True)
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=200,
+            response_body=expected_search_results,
+        ).format()
+    )
@@ -1,23 +1,53 @@
 import json
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+import pytest
 
 from api.user import user_controller
-from api_lib.response.api_response import ApiResponse
+from api_lib.response.api_response import ApiResponse, build_etag
+from core_lib.data_access.user.user_data_access import USER_PROFILE_FIELDS
+from core_lib.utils import json_util
+from core_lib.utils.cache_util import LRUCache
 from core_lib.utils.json_schema_util import ACTIVE_STATUS, INACTIVE_STATUS
 
 
-@patch("api.user.user_controller.auth_service")
-@patch("api.user.user_controller.database_service")
-def test_health(database_service, auth_service):
-    auth_service.health_check.return_value = None
-    database_service.health_check.return_value = None
+@pytest.fixture(autouse=True)
+def take_token():
+    # rate limited routes never reach the DynamoDB token buckets
+    with patch(
+        "api_lib.auth.authorization.rate_limit_data_access.take_token",
+        return_value=None,
+    ) as mock_take_token:
+        yield mock_take_token
+
+
+def test_health():
+    mock_probe = Mock()
+    with patch.dict(
+        "api.user.user_controller.HEALTH_PROBES",
+        {"auth": mock_probe, "database": mock_probe},
+    ):
+        response = user_controller.health(event={}, context=None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"status": "pass"}
+    mock_probe.assert_not_called()
+
+
+@patch("api_lib.health.api_health.HEALTH_CHECK_CACHE", LRUCache())
+def test_health_deep():
+    with patch.dict(
+        "api.user.user_controller.HEALTH_PROBES",
+        {"auth": lambda: None, "database": lambda: None},
+    ):
+        response = user_controller.health(
+            event={"queryStringParameters": {"deep": "true"}}, context=None
+        )
 
-    response = user_controller.health(event={}, context=None)
-    assert response == ApiResponse(
-        request_headers={},
-        status_code=200,
-        response_body=None,
-    ).format(skip_access_log=True)
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["status"] == "pass"
+    assert set(body["checks"]) == {"auth", "database"}
 
 
 @patch("api.user.user_controller.safe_get_thread_attribute")
@@ -29,7 +59,7 @@ def test_query(
     mock_get_decoded_jwt.return_value = {"profile": "user-abc"}
     safe_get_thread_attribute.return_value = "user_id"
     expected_query_results = {
-        "last_evaluated_key": "next",
+        "cursor": "next",
         "items": [
             {
                 "profile": "abc",
@@ -46,12 +76,44 @@ def test_query(
     )
     headers = {"Authorization": "bearer foo"}
 
-    response = user_controller.query(event={"headers": headers}, context={})
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=200,
-        response_body=expected_query_results,
-    ).format(skip_access_log=True)
+    response = user_controller.query(
+        event={
+            "headers": headers,
+            "queryStringParameters": {"limit": "10", "cursor": "page"},
+        },
+        context={},
+    )
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=200,
+            response_body=expected_query_results,
+        ).format()
+    )
+    user_association_data_access.query_associated_users_with_profiles.assert_called_once_with(
+        user_a_id="user_id",
+        limit=10,
+        cursor="page",
+        fields=list(USER_PROFILE_FIELDS),
+    )
+
+
+@patch("api.user.user_controller.user_association_data_access")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_query_invalid_limit(mock_get_decoded_jwt, user_association_data_access):
+    mock_get_decoded_jwt.return_value = {"profile": "user-abc"}
+
+    response = user_controller.query(
+        event={
+            "headers": {"Authorization": "bearer foo"},
+            "queryStringParameters": {"limit": "0"},
+        },
+        context={},
+    )
+
+    assert response["statusCode"] == 400
+    user_association_data_access.query_associated_users_with_profiles.assert_not_called()
 
 
 @patch("api.user.user_controller.safe_get_thread_attribute")
@@ -75,11 +137,138 @@ def test_get(mock_get_decoded_jwt, user_data_access, safe_get_thread_attribute):
     response = user_controller.get(
         event={"headers": headers, "pathParameters": {"id": "user-a"}}, context={}
     )
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=200,
-        response_body=expected_get_results,
-    ).format(skip_access_log=True)
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=200,
+            response_body=expected_get_results,
+            etag=True,
+            cache_control="private, no-cache",
+        ).format()
+    )
+    assert response["headers"]["ETag"] == build_etag(
+        json_util.dumps_bytes(expected_get_results)
+    )
+
+
+@patch("api.user.user_controller.user_data_access")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_get_rate_limited(mock_get_decoded_jwt, user_data_access, take_token):
+    mock_get_decoded_jwt.return_value = {"profile": "user-a"}
+    take_token.return_value = 12
+
+    response = user_controller.get(
+        event={
+            "headers": {"Authorization": "bearer foo"},
+            "pathParameters": {"id": "user-a"},
+        },
+        context={},
+    )
+
+    assert response["statusCode"] == 429
+    assert response["headers"]["Retry-After"] == "12"
+    assert take_token.call_args.kwargs["route"] == "get"
+    user_data_access.find_user_by_id.assert_not_called()
+
+
+@patch("api.user.user_controller.safe_get_thread_attribute")
+@patch("api.user.user_controller.user_data_access")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_get_not_modified(
+    mock_get_decoded_jwt, user_data_access, safe_get_thread_attribute
+):
+    mock_get_decoded_jwt.return_value = {"profile": "user-a"}
+    safe_get_thread_attribute.return_value = "user-a"
+    user_data_access.find_user_by_id.return_value = {"profile": "user-a"}
+    etag = build_etag(json_util.dumps_bytes({"profile": "user-a"}))
+    headers = {"Authorization": "bearer foo", "if-none-match": f'"other", {etag}'}
+
+    response = user_controller.get(
+        event={"headers": headers, "pathParameters": {"id": "user-a"}}, context={}
+    )
+
+    assert response["statusCode"] == 304
+    assert response["body"] is None
+    assert response["headers"]["ETag"] == etag
+    assert response["headers"]["Cache-Control"] == "private, no-cache"
+
+
+def test_route():
+    response = user_controller.route(
+        event={"httpMethod": "GET", "resource": "/v1.0/health", "headers": {}},
+        context=None,
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"status": "pass"}
+
+
+@patch("api_lib.auth.authorization.user_association_data_access")
+@patch("api.user.user_controller.user_data_access")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_batch_get(
+    mock_get_decoded_jwt, user_data_access, auth_user_association_data_access
+):
+    mock_get_decoded_jwt.return_value = {"profile": "user-a"}
+    auth_user_association_data_access.find_associated_users.return_value = {"user-b"}
+    user_data_access.USER_PROFILE_FIELDS = USER_PROFILE_FIELDS
+    user_data_access.find_users_by_ids.return_value = {
+        "user-a": {"profile": "user-a", "username": "a"}
+    }
+    headers = {"Authorization": "bearer foo"}
+
+    response = user_controller.batch_get(
+        event={
+            "headers": headers,
+            "queryStringParameters": {"fields": "profile,username"},
+            "body": json.dumps({"ids": ["user-a", "user-b", "user-c", "user-a"]}),
+        },
+        context={},
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "results": {
+            "user-a": {"user": {"profile": "user-a", "username": "a"}},
+            "user-b": {"error": {"code": "NOT_FOUND", "message": "user not found"}},
+            "user-c": {"error": {"code": "FORBIDDEN", "message": "access denied"}},
+        }
+    }
+    auth_user_association_data_access.find_associated_users.assert_called_once_with(
+        user_a_id="user-a", user_b_ids=["user-b", "user-c"]
+    )
+    user_data_access.find_users_by_ids.assert_called_once_with(
+        _ids=["user-a", "user-b"], fields=["profile", "username"]
+    )
+
+
+@patch("api.user.user_controller.user_data_access")
+@patch("api_lib.auth.authorization.get_decoded_jwt")
+def test_batch_get_invalid_ids(mock_get_decoded_jwt, user_data_access):
+    mock_get_decoded_jwt.return_value = {"profile": "user-a"}
+
+    for body in [{}, {"ids": []}, {"ids": "user-a"}, {"ids": ["user-a", 1]}]:
+        response = user_controller.batch_get(
+            event={
+                "headers": {"Authorization": "bearer foo"},
+                "body": json.dumps(body),
+            },
+            context={},
+        )
+        assert response["statusCode"] == 400
+
+    with patch.object(user_controller, "BATCH_GET_USERS_MAX_IDS", 2):
+        response = user_controller.batch_get(
+            event={
+                "headers": {"Authorization": "bearer foo"},
+                "body": json.dumps({"ids": ["a", "b", "c"]}),
+            },
+            context={},
+        )
+        assert response["statusCode"] == 400
+
+    user_data_access.find_users_by_ids.assert_not_called()
 
 
 @patch("api.user.user_controller.safe_get_thread_attribute")
@@ -103,11 +292,14 @@ def test_update(mock_get_decoded_jwt, user_data_access, safe_get_thread_attribut
         },
         context={},
     )
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=200,
-        response_body=expected_update_results,
-    ).format(skip_access_log=True)
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=200,
+            response_body=expected_update_results,
+        ).format()
+    )
 
 
 @patch("api.user.user_controller.safe_get_thread_attribute")
@@ -126,13 +318,20 @@ def test_delete(mock_get_decoded_jwt, user_data_access, safe_get_thread_attribut
         },
         context={},
     )
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=204,
-        response_body=None,
-    ).format(skip_access_log=True)
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=204,
+            response_body=None,
+        ).format()
+    )
 
 
+@patch(
+    "api_lib.auth.authorization.user_existence_data_access.might_user_exist",
+    return_value=True,
+)
 @patch("api.user.user_controller.safe_get_thread_attribute")
 @patch("api.user.user_controller.user_association_data_access")
 @patch("api_lib.auth.authorization.user_data_access")
@@ -142,6 +341,7 @@ def test_associate(
     user_data_access,
     user_association_data_access,
     safe_get_thread_attribute,
+    might_user_exist,
 ):
     mock_get_decoded_jwt.return_value = {"profile": "user-a"}
     safe_get_thread_attribute.return_value = "user-a"
@@ -159,8 +359,11 @@ def test_associate(
         },
         context={},
     )
-    assert response == ApiResponse(
-        request_headers=headers,
-        status_code=201,
-        response_body=new_association,
-    ).format(skip_access_log=True)
+    assert (
+        response
+        == ApiResponse(
+            request_headers=headers,
+            status_code=201,
+            response_body=new_association,
+        ).format()
+    )
@@ -0,0 +1,58 @@
+import base64
+
+from scripts.local_server import build_proxy_event, build_resource_matchers
+
+ROUTES = {
+    ("GET", "/v1.0/user"): None,
+    ("GET", "/v1.0/user/{id}"): None,
+    ("POST", "/v1.0/user/batch-get"): None,
+    ("GET", "/v1.0/files/{proxy+}"): None,
+}
+
+
+def test_build_proxy_event():
+    event = build_proxy_event(
+        resource_matchers=build_resource_matchers(ROUTES),
+        method="GET",
+        url="/v1.0/user/abc?fields=profile&tag=a&tag=b",
+        headers={"Authorization": "Bearer token"},
+        body=b"",
+    )
+
+    assert event["resource"] == "/v1.0/user/{id}"
+    assert event["path"] == "/v1.0/user/abc"
+    assert event["httpMethod"] == "GET"
+    assert event["pathParameters"] == {"id": "abc"}
+    assert event["queryStringParameters"] == {"fields": "profile", "tag": "b"}
+    assert event["multiValueQueryStringParameters"]["tag"] == ["a", "b"]
+    assert event["headers"] == {"Authorization": "Bearer token"}
+    assert event["body"] is None
+    assert event["isBase64Encoded"] is False
+
+
+def test_build_proxy_event_static_resource_and_body():
+    event = build_proxy_event(
+        resource_matchers=build_resource_matchers(ROUTES),
+        method="POST",
+        url="/v1.0/user/batch-get",
+        headers={},
+        body=b'{"ids":["abc"]}',
+    )
+
+    assert event["resource"] == "/v1.0/user/batch-get"
+    assert event["pathParameters"] is None
+    assert event["queryStringParameters"] is None
+    assert base64.b64decode(event["body"]) == b'{"ids":["abc"]}'
+    assert event["isBase64Encoded"] is True
+
+
+def test_build_proxy_event_greedy_and_unknown_resource():
+    resource_matchers = build_resource_matchers(ROUTES)
+
+    event = build_proxy_event(resource_matchers, "GET", "/v1.0/files/a/b", {}, b"")
+    assert event["resource"] == "/v1.0/files/{proxy+}"
+    assert event["pathParameters"] == {"proxy": "a/b"}
+
+    event = build_proxy_event(resource_matchers, "GET", "/v1.0/other", {}, b"")
+    assert event["resource"] == "/v1.0/other"
+    assert event["pathParameters"] is None
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+
+from core_lib.data_access.idempotency import idempotency_data_access
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_repository import (
+    IdempotencyDynamoDBRepository,
+)
+
+
+@patch.object(IdempotencyDynamoDBRepository, "find_idempotency_record")
+@patch.object(IdempotencyDynamoDBRepository, "create_idempotency_record")
+def test_acquire_idempotency_record(mock_create, mock_find):
+    mock_create.return_value = True
+
+    assert (
+        idempotency_data_access.acquire_idempotency_record(
+            record_id="abc", fingerprint="print"
+        )
+        is None
+    )
+    kwargs = mock_create.call_args.kwargs
+    assert (
+        kwargs["expires_at"] - kwargs["now"]
+        == idempotency_data_access.IDEMPOTENCY_IN_PROGRESS_TTL_SECONDS
+    )
+    mock_find.assert_not_called()
+
+
+@patch.object(IdempotencyDynamoDBRepository, "find_idempotency_record")
+@patch.object(IdempotencyDynamoDBRepository, "create_idempotency_record")
+def test_acquire_idempotency_record_existing(mock_create, mock_find):
+    mock_create.return_value = False
+    mock_find.return_value = {"record_status": "COMPLETE"}
+
+    assert idempotency_data_access.acquire_idempotency_record(
+        record_id="abc", fingerprint="print"
+    ) == {"record_status": "COMPLETE"}
+
+
+@patch.object(IdempotencyDynamoDBRepository, "find_idempotency_record")
+@patch.object(IdempotencyDynamoDBRepository, "create_idempotency_record")
+def test_acquire_idempotency_record_released_concurrently(mock_create, mock_find):
+    mock_create.side_effect = [False, True]
+    mock_find.return_value = None
+
+    assert (
+        idempotency_data_access.acquire_idempotency_record(
+            record_id="abc", fingerprint="print"
+        )
+        is None
+    )
+    assert mock_create.call_count == 2
+
+
+@patch.object(IdempotencyDynamoDBRepository, "find_idempotency_record")
+@patch.object(IdempotencyDynamoDBRepository, "create_idempotency_record")
+def test_acquire_idempotency_record_gives_up(mock_create, mock_find):
+    mock_create.return_value = False
+    mock_find.return_value = None
+
+    with pytest.raises(Exception):
+        idempotency_data_access.acquire_idempotency_record(
+            record_id="abc", fingerprint="print"
+        )
+    assert (
+        mock_create.call_count
+        == idempotency_data_access.IDEMPOTENCY_ACQUIRE_MAX_ATTEMPTS
+    )
+
+
+@patch.object(IdempotencyDynamoDBRepository, "update_idempotency_record")
+def test_complete_idempotency_record(mock_update):
+    idempotency_data_access.complete_idempotency_record(
+        record_id="abc", response={"statusCode": 201}
+    )
+
+    updates = mock_update.call_args.kwargs["updates"]
+    assert mock_update.call_args.kwargs["record_id"] == "abc"
+    assert updates["record_status"] == "COMPLETE"
+    assert updates["stored_response"] == {"statusCode": 201}
+    assert updates["expires_at"] > 0
+
+
+@patch.object(IdempotencyDynamoDBRepository, "delete_idempotency_record")
+def test_release_idempotency_record(mock_delete):
+    idempotency_data_access.release_idempotency_record("abc")
+    mock_delete.assert_called_once_with(record_id="abc")
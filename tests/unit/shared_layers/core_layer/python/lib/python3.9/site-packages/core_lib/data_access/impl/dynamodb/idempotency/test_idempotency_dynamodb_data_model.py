@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+from jsonschema import ValidationError
+
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_data_model import (
+    IDEMPOTENCY_RECORD_COMPLETE,
+    IDEMPOTENCY_RECORD_IN_PROGRESS,
+    build_idempotency_record_key,
+    build_new_idempotency_record,
+    get_idempotency_record_allowed_updates_json_schema_validator,
+    get_idempotency_record_json_schema_validator,
+)
+
+RECORD_ID = hashlib.sha256(b"record").hexdigest()
+
+
+def test_build_idempotency_record_key():
+    assert build_idempotency_record_key(RECORD_ID) == {
+        "pk": f"idempotency_record-{RECORD_ID}",
+        "sk": "idempotency_record",
+    }
+
+
+def test_build_new_idempotency_record():
+    item = build_new_idempotency_record(
+        {"record_id": RECORD_ID, "fingerprint": "abc", "expires_at": 100}
+    )
+
+    assert item["record_status"] == IDEMPOTENCY_RECORD_IN_PROGRESS
+    assert item["entity_type"] == "idempotency_record"
+    item["origin_region"] = "us-east-2"
+    get_idempotency_record_json_schema_validator().validate(instance=item)
+
+
+def test_get_idempotency_record_json_schema_validator_rejects_invalid_key():
+    item = build_new_idempotency_record(
+        {"record_id": "not-a-hash", "fingerprint": "abc", "expires_at": 100}
+    )
+    item["origin_region"] = "us-east-2"
+
+    with pytest.raises(ValidationError):
+        get_idempotency_record_json_schema_validator().validate(instance=item)
+
+
+def test_get_idempotency_record_allowed_updates_json_schema_validator():
+    validator = get_idempotency_record_allowed_updates_json_schema_validator()
+    validator.validate(
+        instance={
+            "record_status": IDEMPOTENCY_RECORD_COMPLETE,
+            "stored_response": {"statusCode": 201},
+            "expires_at": 100,
+        }
+    )
+
+    with pytest.raises(ValidationError):
+        validator.validate(instance={"fingerprint": "other"})
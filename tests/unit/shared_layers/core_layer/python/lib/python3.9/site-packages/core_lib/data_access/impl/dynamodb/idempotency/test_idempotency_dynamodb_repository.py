@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_data_model import (
+    build_idempotency_record_key,
+)
+from core_lib.data_access.impl.dynamodb.idempotency.idempotency_dynamodb_repository import (
+    IdempotencyDynamoDBRepository,
+)
+
+
+def build_client_error(code: str):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "PutItem")
+
+
+@patch.object(IdempotencyDynamoDBRepository, "put_item")
+def test_create_idempotency_record(mock_put_item):
+    assert (
+        IdempotencyDynamoDBRepository().create_idempotency_record(
+            record_id="abc", fingerprint="print", expires_at=160, now=100
+        )
+        is True
+    )
+
+    kwargs = mock_put_item.call_args.kwargs
+    assert kwargs["item"] == {
+        "record_id": "abc",
+        "fingerprint": "print",
+        "expires_at": 160,
+    }
+    assert kwargs["ConditionExpression"] is not None
+
+
+@patch.object(IdempotencyDynamoDBRepository, "put_item")
+def test_create_idempotency_record_exists(mock_put_item):
+    mock_put_item.side_effect = build_client_error("ConditionalCheckFailedException")
+
+    assert (
+        IdempotencyDynamoDBRepository().create_idempotency_record(
+            record_id="abc", fingerprint="print", expires_at=160, now=100
+        )
+        is False
+    )
+
+
+@patch.object(IdempotencyDynamoDBRepository, "put_item")
+def test_create_idempotency_record_error(mock_put_item):
+    mock_put_item.side_effect = build_client_error(
+        "ProvisionedThroughputExceededException"
+    )
+
+    with pytest.raises(ClientError):
+        IdempotencyDynamoDBRepository().create_idempotency_record(
+            record_id="abc", fingerprint="print", expires_at=160, now=100
+        )
+
+
+@patch("core_lib.services.database.impl.dynamodb_service.get_item")
+def test_find_idempotency_record(mock_get_item):
+    mock_get_item.return_value = {"record_status": "COMPLETE"}
+
+    assert IdempotencyDynamoDBRepository().find_idempotency_record("abc") == {
+        "record_status": "COMPLETE"
+    }
+    mock_get_item.assert_called_once_with(
+        Key=build_idempotency_record_key("abc"), ConsistentRead=True
+    )
+
+
+@patch.object(IdempotencyDynamoDBRepository, "delete_item")
+def test_delete_idempotency_record(mock_delete_item):
+    IdempotencyDynamoDBRepository().delete_idempotency_record("abc")
+    mock_delete_item.assert_called_once_with(key=build_idempotency_record_key("abc"))
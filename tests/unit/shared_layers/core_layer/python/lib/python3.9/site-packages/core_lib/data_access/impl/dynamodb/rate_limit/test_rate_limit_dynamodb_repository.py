@@ -0,0 +1,91 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from core_lib.data_access.impl.dynamodb.rate_limit.rate_limit_dynamodb_repository import (
+    RateLimitDynamoDBRepository,
+)
+
+
+@patch(
+    "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.dynamodb_service.get_item"
+)
+def test_find_token_bucket(mock_get_item):
+    mock_get_item.return_value = {
+        "pk": "rate_limit-abc",
+        "sk": "search_users",
+        "tokens": Decimal("4.5"),
+        "refilled_at": Decimal("1000.25"),
+        "revision": Decimal("3"),
+    }
+
+    assert RateLimitDynamoDBRepository().find_token_bucket(
+        principle="abc", route="search_users"
+    ) == {"tokens": 4.5, "refilled_at": 1000.25, "revision": 3}
+    mock_get_item.assert_called_once_with(
+        Key={"pk": "rate_limit-abc", "sk": "search_users"}, ConsistentRead=True
+    )
+
+
+@patch(
+    "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.dynamodb_service.get_item"
+)
+def test_find_token_bucket_not_found(mock_get_item):
+    mock_get_item.return_value = None
+
+    assert (
+        RateLimitDynamoDBRepository().find_token_bucket(
+            principle="abc", route="search_users"
+        )
+        is None
+    )
+
+
+@patch(
+    "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.dynamodb_service.dynamodb_update_item"
+)
+def test_save_token_bucket(mock_update_item):
+    assert (
+        RateLimitDynamoDBRepository().save_token_bucket(
+            principle="abc",
+            route="search_users",
+            tokens=4.5,
+            refilled_at=1000.25,
+            revision=3,
+            expires_at=1120,
+        )
+        is True
+    )
+
+    kwargs = mock_update_item.call_args.kwargs
+    assert kwargs["Key"] == {"pk": "rate_limit-abc", "sk": "search_users"}
+    assert kwargs["UpdateExpression"].startswith("SET tokens = :tokens")
+    assert kwargs["ExpressionAttributeValues"] == {
+        ":tokens": Decimal("4.5"),
+        ":refilled_at": Decimal("1000.25"),
+        ":next_revision": 4,
+        ":entity_type": "rate_limit",
+        ":expires_at": 1120,
+    }
+
+
+@patch(
+    "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.dynamodb_service.dynamodb_update_item"
+)
+def test_save_token_bucket_written_concurrently(mock_update_item):
+    mock_update_item.side_effect = ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+    )
+
+    assert (
+        RateLimitDynamoDBRepository().save_token_bucket(
+            principle="abc",
+            route="search_users",
+            tokens=0,
+            refilled_at=1000,
+            revision=None,
+            expires_at=1120,
+        )
+        is False
+    )
@@ -62,3 +62,36 @@ def test_base_dynamodb_repository(
         "Responses": {"test": [test_item]}
     }
     mock_batch_get_item.assert_called_once_with(**test_batch_get_item)
+
+
+@patch.object(dynamodb_service, "batch_get_item")
+@patch.object(dynamodb_service, "query_items")
+@patch.object(dynamodb_service, "get_item")
+def test_base_dynamodb_repository_fields(
+    mock_get_item, mock_query_items, mock_batch_get_item
+):
+    repo = BaseDynamoDBRepository(data_model=MagicMock())
+    projection = {
+        "ProjectionExpression": "#profile,#username",
+        "ExpressionAttributeNames": {"#profile": "profile", "#username": "username"},
+    }
+
+    repo.get_item({"pk": "user"}, fields=["profile", "username"])
+    mock_get_item.assert_called_once_with(Key={"pk": "user"}, **projection)
+
+    repo.query(
+        KeyConditionExpression="pk = :pk",
+        ProjectionExpression="sk",
+        fields=["profile", "username"],
+    )
+    mock_query_items.assert_called_once_with(
+        KeyConditionExpression="pk = :pk", **projection
+    )
+
+    repo.batch_get_item(
+        RequestItems={"table": {"Keys": [{"pk": "user"}]}},
+        fields=["profile", "username"],
+    )
+    mock_batch_get_item.assert_called_once_with(
+        RequestItems={"table": {"Keys": [{"pk": "user"}], **projection}}
+    )
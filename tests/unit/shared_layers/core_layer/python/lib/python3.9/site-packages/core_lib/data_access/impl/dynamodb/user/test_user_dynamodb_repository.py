@@ -2,6 +2,8 @@ import unittest
 import uuid
 from unittest.mock import patch
 
+from boto3.dynamodb.conditions import Key
+
 from core_lib.data_access.impl.dynamodb.user.user_dynamodb_data_model import (
     build_user_item_key,
 )
@@ -24,10 +26,38 @@ class TestUserDynamoDBRepository(unittest.TestCase):
 
         result = self.repo.find_user_by_id("1")
         mock_get_item.assert_called_with(
-            key=build_user_item_key(_id="1"), projection_expression=None
+            key=build_user_item_key(_id="1"), projection_expression=None, fields=None
         )
         self.assertEqual(result, mock_user)
 
+    @patch(
+        "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.BaseDynamoDBRepository.batch_get_items"
+    )
+    def test_find_users_by_ids(self, mock_batch_get_items):
+        mock_batch_get_items.return_value = [
+            {"sk": "user-1", "username": "one"},
+            {"sk": "user-2", "username": "two"},
+        ]
+
+        result = self.repo.find_users_by_ids(["1", "2", "3"], fields=["username"])
+        mock_batch_get_items.assert_called_once_with(
+            keys=[build_user_item_key(_id=_id) for _id in ["1", "2", "3"]],
+            fields=["username", "sk"],
+        )
+        self.assertEqual(result, {"1": {"username": "one"}, "2": {"username": "two"}})
+
+    @patch(
+        "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.BaseDynamoDBRepository.batch_get_items"
+    )
+    def test_find_users_by_ids_all_fields(self, mock_batch_get_items):
+        mock_batch_get_items.return_value = [{"pk": "user", "sk": "user-1"}]
+
+        result = self.repo.find_users_by_ids(["1"])
+        mock_batch_get_items.assert_called_once_with(
+            keys=[build_user_item_key(_id="1")], fields=None
+        )
+        self.assertEqual(result, {"1": {"pk": "user", "sk": "user-1"}})
+
     @patch(
         "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.BaseDynamoDBRepository.put_item"
     )
@@ -63,3 +93,14 @@ class TestUserDynamoDBRepository(unittest.TestCase):
     def test_delete_user_by_id(self, mock_soft_delete_item):
         self.repo.delete_user_by_id("1")
         mock_soft_delete_item.assert_called_with(key=build_user_item_key(_id="1"))
+
+    @patch(
+        "core_lib.data_access.impl.dynamodb.base_dynamodb_repository.BaseDynamoDBRepository.query"
+    )
+    def test_query_user_profiles(self, mock_query):
+        self.repo.query_user_profiles(exclusive_start_key={"pk": "user"})
+        mock_query.assert_called_with(
+            KeyConditionExpression=Key("pk").eq("user"),
+            ProjectionExpression="profile",
+            ExclusiveStartKey={"pk": "user"},
+        )
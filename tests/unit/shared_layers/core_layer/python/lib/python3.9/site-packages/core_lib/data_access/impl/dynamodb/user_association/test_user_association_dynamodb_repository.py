@@ -39,6 +39,8 @@ def test_query_associated_users(mock_build_formatted_user_id, mock_query):
         KeyConditionExpression=Key("pk").eq("formatted_id")
         & Key("sk").eq("formatted_id"),
         ProjectionExpression=projection_expression,
+        Limit=None,
+        ExclusiveStartKey=None,
     )
 
 
@@ -61,20 +63,55 @@ def test_query_associated_users_with_profiles(
     mock_db_table_name = MagicMock(return_value="mock_table")
     repository.db_service.db_table_name = mock_db_table_name
 
-    result = repository.query_associated_users_with_profiles(user_a_id, user_b_id)
+    result = repository.query_associated_users_with_profiles(
+        user_a_id,
+        user_b_id,
+        limit=10,
+        exclusive_start_key={"pk": "user-a"},
+        fields=["profile", "username"],
+    )
 
-    mock_query_associated_users.assert_called_once_with(user_a_id, user_b_id)
+    mock_query_associated_users.assert_called_once_with(
+        user_a_id, user_b_id, limit=10, exclusive_start_key={"pk": "user-a"}
+    )
     mock_db_table_name.assert_called_once()  # Assert that the method was called
     mock_batch_get_item.assert_called_once_with(
         RequestItems={
             "mock_table": {
                 "Keys": [{"pk": USER_ENTITY_TYPE.value, "sk": "test_sk"}],
-                "ProjectionExpression": "profile,username,first_name,last_name,email,entity_status",
             }
-        }
+        },
+        fields=["profile", "username"],
     )
 
     assert result == {
         "last_evaluated_key": last_evaluated_key,
         "items": ["test_profile"],
     }
+
+
+@patch.object(UserAssociationDynamoDBRepository, "batch_get_items")
+def test_find_associated_user_ids(mock_batch_get_items):
+    mock_batch_get_items.return_value = [{"sk": "user-test_id_2"}]
+
+    repository = UserAssociationDynamoDBRepository()
+    result = repository.find_associated_user_ids(
+        "test_id_1", ["test_id_2", "test_id_3"]
+    )
+
+    assert result == {"test_id_2"}
+    mock_batch_get_items.assert_called_once_with(
+        keys=[
+            {"pk": "user-test_id_1", "sk": "user-test_id_2"},
+            {"pk": "user-test_id_1", "sk": "user-test_id_3"},
+        ],
+        projection_expression="sk",
+    )
+
+
+@patch.object(UserAssociationDynamoDBRepository, "batch_get_items")
+def test_find_associated_user_ids_without_targets(mock_batch_get_items):
+    repository = UserAssociationDynamoDBRepository()
+
+    assert repository.find_associated_user_ids("test_id_1", []) == set()
+    mock_batch_get_items.assert_not_called()
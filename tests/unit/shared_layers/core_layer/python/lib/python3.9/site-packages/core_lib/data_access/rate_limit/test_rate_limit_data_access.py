@@ -0,0 +1,158 @@
+from unittest.mock import patch
+
+import pytest
+
+from core_lib.data_access.impl.dynamodb.rate_limit.rate_limit_dynamodb_repository import (
+    RateLimitDynamoDBRepository,
+)
+from core_lib.data_access.rate_limit import rate_limit_data_access
+
+
+@pytest.fixture(autouse=True)
+def clear_allowance_cache():
+    rate_limit_data_access.RATE_LIMIT_ALLOWANCE_CACHE.clear()
+    yield
+    rate_limit_data_access.RATE_LIMIT_ALLOWANCE_CACHE.clear()
+
+
+@pytest.fixture
+def mock_time():
+    with patch(
+        "core_lib.data_access.rate_limit.rate_limit_data_access.time.time"
+    ) as mock_time:
+        mock_time.return_value = 1000
+        yield mock_time
+
+
+@pytest.fixture
+def bucket_table():
+    """
+    In memory stand in for the bucket items, saves honour the revision condition.
+    """
+    buckets = {}
+
+    def find_token_bucket(principle, route):
+        return buckets.get((principle, route))
+
+    def save_token_bucket(principle, route, tokens, refilled_at, revision, expires_at):
+        bucket = buckets.get((principle, route))
+        if (bucket["revision"] if bucket else None) != revision:
+            return False
+
+        buckets[(principle, route)] = {
+            "tokens": tokens,
+            "refilled_at": refilled_at,
+            "revision": 0 if revision is None else revision + 1,
+        }
+        return True
+
+    with patch.object(
+        RateLimitDynamoDBRepository,
+        "find_token_bucket",
+        side_effect=find_token_bucket,
+    ), patch.object(
+        RateLimitDynamoDBRepository,
+        "save_token_bucket",
+        side_effect=save_token_bucket,
+    ) as mock_save_token_bucket:
+        yield buckets, mock_save_token_bucket
+
+
+def take_token(limit: int = 100):
+    return rate_limit_data_access.take_token(
+        principle="abc", route="get", limit=limit, window_seconds=60
+    )
+
+
+@pytest.mark.parametrize("limit,claim", [(1, 1), (25, 2), (100, 10), (5000, 10)])
+def test_get_claim_size(limit, claim):
+    assert rate_limit_data_access.get_claim_size(limit) == claim
+
+
+def test_take_token_claims_in_batches(mock_time, bucket_table):
+    buckets, mock_save_token_bucket = bucket_table
+
+    for _ in range(11):
+        assert take_token() is None
+
+    assert mock_save_token_bucket.call_count == 2
+    assert buckets[("abc", "get")] == {
+        "tokens": 80,
+        "refilled_at": 1000,
+        "revision": 1,
+    }
+    assert mock_save_token_bucket.call_args.kwargs["expires_at"] == (
+        1060 + rate_limit_data_access.RATE_LIMIT_EXPIRY_GRACE_SECONDS
+    )
+
+
+def test_take_token_empty_bucket(mock_time, bucket_table):
+    buckets, mock_save_token_bucket = bucket_table
+    buckets[("abc", "get")] = {"tokens": 0.5, "refilled_at": 1000, "revision": 3}
+
+    # 100 tokens per 60 seconds, the missing half token refills in 0.3 seconds
+    assert take_token() == 1
+    assert take_token() == 1
+    # the empty bucket is remembered, over limit requests do not call DynamoDB
+    mock_save_token_bucket.assert_not_called()
+
+
+def test_take_token_refills_continuously(mock_time, bucket_table):
+    buckets, _mock_save_token_bucket = bucket_table
+    buckets[("abc", "get")] = {"tokens": 0, "refilled_at": 1000, "revision": 3}
+    assert take_token(limit=10) == 6
+
+    # one token refilled, a full window later does not grant a fresh limit
+    mock_time.return_value = 1006
+    rate_limit_data_access.RATE_LIMIT_ALLOWANCE_CACHE.clear()
+    assert take_token(limit=10) is None
+    assert take_token(limit=10) == 6
+    assert buckets[("abc", "get")]["revision"] == 4
+
+
+def test_take_token_does_not_allow_twice_the_limit_around_a_window(
+    mock_time, bucket_table
+):
+    allowed = 0
+    for second in range(30, 90):
+        mock_time.return_value = 1000 + second
+        rate_limit_data_access.RATE_LIMIT_ALLOWANCE_CACHE.clear()
+        allowed += sum(take_token(limit=10) is None for _ in range(10))
+
+    # a full bucket of 10, then the refill of 10 per 60 seconds
+    assert allowed == 19
+
+
+def test_take_token_retries_a_concurrent_write(mock_time, bucket_table):
+    buckets, mock_save_token_bucket = bucket_table
+    buckets[("abc", "get")] = {"tokens": 50, "refilled_at": 1000, "revision": 3}
+    save_token_bucket = mock_save_token_bucket.side_effect
+
+    def save_after_concurrent_write(**kwargs):
+        if mock_save_token_bucket.call_count == 1:
+            # another container took 45 tokens between the read and the write
+            buckets[("abc", "get")] = {
+                "tokens": 5,
+                "refilled_at": 1000,
+                "revision": 4,
+            }
+        return save_token_bucket(**kwargs)
+
+    mock_save_token_bucket.side_effect = save_after_concurrent_write
+
+    assert [take_token() for _ in range(5)] == [None] * 5
+    assert mock_save_token_bucket.call_count == 2
+    assert buckets[("abc", "get")]["tokens"] == 0
+    assert take_token() == 1
+
+
+def test_take_token_denies_a_contended_bucket(mock_time, bucket_table):
+    _buckets, mock_save_token_bucket = bucket_table
+    mock_save_token_bucket.side_effect = None
+    mock_save_token_bucket.return_value = False
+
+    assert take_token() == 1
+    assert (
+        mock_save_token_bucket.call_count
+        == rate_limit_data_access.RATE_LIMIT_MAX_WRITE_ATTEMPTS
+    )
@@ -1,12 +1,20 @@
 from unittest.mock import patch
+
+import pytest
+
 from core_lib.data_access.impl.dynamodb.user_association.user_association_dynamodb_repository import (
     UserAssociationDynamoDBRepository,
 )
+from core_lib.data_access.user import user_association_data_access
 from core_lib.data_access.user.user_association_data_access import (
     query_associated_users,
     associate_users,
     query_associated_users_with_profiles,
+    is_user_associated,
+    find_associated_users,
 )
+from core_lib.data_access.user.user_data_access import USER_PROFILE_FIELDS
+from core_lib.exceptions.types import AppException
 
 
 @patch.object(UserAssociationDynamoDBRepository, "query_associated_users")
@@ -31,7 +39,115 @@ def test_query_associated_users_with_profiles(
 ):
     user_a_id = "test_user_a_id"
     user_b_id = "test_user_b_id"
-    query_associated_users_with_profiles(user_a_id, user_b_id)
+    mock_query_associated_users_with_profiles.return_value = {
+        "last_evaluated_key": None,
+        "items": ["profile"],
+    }
+
+    result = query_associated_users_with_profiles(user_a_id, user_b_id)
+
+    assert result == {"cursor": None, "items": ["profile"]}
     mock_query_associated_users_with_profiles.assert_called_once_with(
-        user_a_id=user_a_id, user_b_id=user_b_id
+        user_a_id=user_a_id,
+        user_b_id=user_b_id,
+        limit=user_association_data_access.ASSOCIATED_USERS_PAGE_DEFAULT_LIMIT,
+        exclusive_start_key=None,
+        fields=USER_PROFILE_FIELDS,
+    )
+
+
+@patch.object(
+    user_association_data_access.secrets_service,
+    "get_cursor_signing_key",
+    return_value=b"signing-key",
+)
+@patch.object(UserAssociationDynamoDBRepository, "query_associated_users_with_profiles")
+def test_query_associated_users_with_profiles_resumes_from_cursor(
+    mock_query_associated_users_with_profiles, mock_get_cursor_signing_key
+):
+    last_evaluated_key = {"pk": "user-a", "sk": "user-b"}
+    mock_query_associated_users_with_profiles.return_value = {
+        "last_evaluated_key": last_evaluated_key,
+        "items": ["profile"],
+    }
+
+    first_page = query_associated_users_with_profiles("a", limit=500)
+
+    assert first_page["cursor"] is not None
+    assert "user-b" not in first_page["cursor"]
+    assert (
+        mock_query_associated_users_with_profiles.call_args.kwargs["limit"]
+        == user_association_data_access.ASSOCIATED_USERS_PAGE_MAX_LIMIT
+    )
+
+    query_associated_users_with_profiles("a", limit=10, cursor=first_page["cursor"])
+
+    assert mock_query_associated_users_with_profiles.call_args.kwargs == {
+        "user_a_id": "a",
+        "user_b_id": None,
+        "limit": 10,
+        "exclusive_start_key": last_evaluated_key,
+        "fields": USER_PROFILE_FIELDS,
+    }
+
+    # a cursor only pages through the list it was issued for
+    with pytest.raises(AppException):
+        query_associated_users_with_profiles("b", cursor=first_page["cursor"])
+
+
+@patch.object(UserAssociationDynamoDBRepository, "query_associated_users")
+def test_is_user_associated_caches_confirmed_associations(
+    mock_query_associated_users,
+):
+    user_association_data_access.ASSOCIATED_USERS_CACHE.clear()
+    mock_query_associated_users.return_value = {"Items": [{"sk": "user-b"}]}
+
+    assert is_user_associated("user-a", "user-b") is True
+    assert is_user_associated("user-a", "user-b") is True
+    mock_query_associated_users.assert_called_once_with("user-a", "user-b")
+
+    user_association_data_access.ASSOCIATED_USERS_CACHE.delete("user-a")
+    assert is_user_associated("user-a", "user-b") is True
+    assert mock_query_associated_users.call_count == 2
+
+
+@patch.object(UserAssociationDynamoDBRepository, "query_associated_users")
+def test_is_user_associated_does_not_cache_missing_associations(
+    mock_query_associated_users,
+):
+    user_association_data_access.ASSOCIATED_USERS_CACHE.clear()
+    mock_query_associated_users.return_value = {"Items": []}
+
+    assert is_user_associated("user-a", "user-c") is False
+    assert is_user_associated("user-a", "user-c") is False
+    assert mock_query_associated_users.call_count == 2
+
+
+@patch.object(UserAssociationDynamoDBRepository, "query_associated_users")
+@patch.object(UserAssociationDynamoDBRepository, "create_user_association")
+def test_associate_users_caches_new_association(
+    mock_create_user_association, mock_query_associated_users
+):
+    user_association_data_access.ASSOCIATED_USERS_CACHE.clear()
+
+    associate_users("user-a", "user-d")
+
+    assert is_user_associated("user-a", "user-d") is True
+    mock_query_associated_users.assert_not_called()
+
+
+@patch.object(UserAssociationDynamoDBRepository, "find_associated_user_ids")
+def test_find_associated_users_reads_only_uncached_users(
+    mock_find_associated_user_ids,
+):
+    user_association_data_access.ASSOCIATED_USERS_CACHE.clear()
+    user_association_data_access.cache_associated_user("user-a", "user-b")
+    mock_find_associated_user_ids.return_value = {"user-c"}
+
+    result = find_associated_users("user-a", ["user-b", "user-c", "user-d"])
+
+    assert result == {"user-b", "user-c"}
+    mock_find_associated_user_ids.assert_called_once_with(
+        user_a_id="user-a", user_b_ids=["user-c", "user-d"]
     )
+    assert is_user_associated("user-a", "user-c") is True
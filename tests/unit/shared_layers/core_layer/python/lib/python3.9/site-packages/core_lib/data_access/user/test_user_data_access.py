@@ -5,6 +5,7 @@ from core_lib.data_access.impl.dynamodb.user.user_dynamodb_repository import (
 )
 from core_lib.data_access.user.user_data_access import (
     find_user_by_id,
+    find_users_by_ids,
     delete_user_by_id,
     create_user,
     update_user,
@@ -17,10 +18,27 @@ def test_find_user_by_id(mock_find_user_by_id):
     projection_expression = "test_expression"
     find_user_by_id(_id, projection_expression)
     mock_find_user_by_id.assert_called_once_with(
-        _id=_id, projection_expression=projection_expression
+        _id=_id, projection_expression=projection_expression, fields=None
     )
 
 
+@patch.object(UserDynamoDBRepository, "find_users_by_ids")
+def test_find_users_by_ids(mock_find_users_by_ids):
+    mock_find_users_by_ids.return_value = {"test_id": {"username": "test"}}
+    assert find_users_by_ids(["test_id"], fields=["username"]) == {
+        "test_id": {"username": "test"}
+    }
+    mock_find_users_by_ids.assert_called_once_with(
+        _ids=["test_id"], fields=["username"]
+    )
+
+
+@patch.object(UserDynamoDBRepository, "find_users_by_ids")
+def test_find_users_by_ids_empty(mock_find_users_by_ids):
+    assert find_users_by_ids([]) == {}
+    mock_find_users_by_ids.assert_not_called()
+
+
 @patch.object(UserDynamoDBRepository, "delete_user_by_id")
 def test_delete_user_by_id(mock_delete_user_by_id):
     _id = "test_id"
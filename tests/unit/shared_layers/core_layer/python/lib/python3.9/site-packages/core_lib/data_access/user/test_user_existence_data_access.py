@@ -0,0 +1,172 @@
+import io
+from unittest.mock import patch
+
+import pytest
+
+from core_lib.data_access.user import user_existence_data_access
+from core_lib.data_access.user.user_existence_data_access import (
+    add_users_to_existence_filter,
+    might_user_exist,
+    rebuild_user_existence_filter,
+)
+from core_lib.utils.bloom_filter_util import BloomFilter
+
+
+def build_snapshot(*user_ids):
+    bloom_filter = BloomFilter.for_capacity(capacity=100)
+    for user_id in user_ids:
+        bloom_filter.add(user_id)
+
+    return {"Body": io.BytesIO(bloom_filter.to_bytes()), "ETag": '"etag"'}
+
+
+@pytest.fixture(autouse=True)
+def reset_user_existence_filter():
+    user_existence_data_access.USER_EXISTENCE_FILTER = None
+    user_existence_data_access.USER_EXISTENCE_FILTER_LOADED_AT = 0
+
+    with patch(
+        "core_lib.data_access.user.user_existence_data_access.file_storage_service."
+        "get_app_storage_bucket",
+        return_value="bucket",
+    ):
+        yield
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download"
+)
+def test_might_user_exist_without_snapshot(mock_download):
+    mock_download.return_value = None
+
+    assert might_user_exist("test-id") is True
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download"
+)
+def test_might_user_exist_reloads_snapshot_once_on_miss(mock_download):
+    mock_download.side_effect = [build_snapshot("test-id"), build_snapshot("new-id")]
+
+    assert might_user_exist("test-id") is True
+    user_existence_data_access.USER_EXISTENCE_FILTER_LOADED_AT -= (
+        user_existence_data_access.USER_EXISTENCE_FILTER_MIN_RELOAD_SECONDS
+    )
+    assert might_user_exist("new-id") is True
+    assert mock_download.call_count == 2
+
+    # forced reloads are rate limited, so the next miss is answered locally
+    assert might_user_exist("unknown-id") is False
+    assert mock_download.call_count == 2
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.upload"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download"
+)
+def test_add_users_to_existence_filter_retries_conflicting_writes(
+    mock_download, mock_upload
+):
+    mock_download.side_effect = [build_snapshot("test-id"), build_snapshot("test-id")]
+    mock_upload.side_effect = [None, {"ETag": '"new-etag"'}]
+
+    add_users_to_existence_filter(["new-id"])
+
+    assert mock_upload.call_count == 2
+    upload_kwargs = mock_upload.call_args.kwargs
+    assert upload_kwargs["IfMatch"] == '"etag"'
+    uploaded_filter = BloomFilter.from_bytes(upload_kwargs["content"])
+    assert uploaded_filter.might_contain("test-id") is True
+    assert uploaded_filter.might_contain("new-id") is True
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.upload"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download",
+    return_value=None,
+)
+def test_add_users_to_existence_filter_without_snapshot(mock_download, mock_upload):
+    add_users_to_existence_filter(["new-id"])
+
+    mock_upload.assert_not_called()
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.upload"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.user_data_access."
+    "query_user_profiles"
+)
+def test_rebuild_user_existence_filter(
+    mock_query_user_profiles, mock_upload, mock_download
+):
+    mock_download.return_value = build_snapshot("test-id")
+    mock_query_user_profiles.side_effect = [
+        {"Items": [{"profile": "user-1"}], "LastEvaluatedKey": {"pk": "user"}},
+        {"Items": [{"profile": "user-2"}], "LastEvaluatedKey": None},
+    ]
+
+    assert rebuild_user_existence_filter() == 2
+
+    mock_query_user_profiles.assert_called_with(exclusive_start_key={"pk": "user"})
+    upload_kwargs = mock_upload.call_args.kwargs
+    assert upload_kwargs["IfMatch"] == '"etag"'
+    uploaded_filter = BloomFilter.from_bytes(upload_kwargs["content"])
+    assert uploaded_filter.might_contain("user-1") is True
+    assert uploaded_filter.might_contain("user-2") is True
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.upload"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.user_data_access."
+    "query_user_profiles"
+)
+def test_rebuild_user_existence_filter_retries_concurrent_adds(
+    mock_query_user_profiles, mock_upload, mock_download
+):
+    mock_download.side_effect = [build_snapshot(), build_snapshot("user-2")]
+    mock_query_user_profiles.side_effect = [
+        {"Items": [{"profile": "user-1"}]},
+        {"Items": [{"profile": "user-1"}, {"profile": "user-2"}]},
+    ]
+    # a stream add changed the snapshot during the first scan
+    mock_upload.side_effect = [None, {"ETag": '"new-etag"'}]
+
+    assert rebuild_user_existence_filter() == 2
+
+    assert mock_upload.call_count == 2
+    uploaded_filter = BloomFilter.from_bytes(mock_upload.call_args.kwargs["content"])
+    assert uploaded_filter.might_contain("user-2") is True
+
+
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.download",
+    return_value=None,
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.file_storage_service.upload"
+)
+@patch(
+    "core_lib.data_access.user.user_existence_data_access.user_data_access."
+    "query_user_profiles",
+    return_value={"Items": []},
+)
+def test_rebuild_user_existence_filter_without_snapshot(
+    mock_query_user_profiles, mock_upload, mock_download
+):
+    assert rebuild_user_existence_filter() == 0
+
+    assert mock_upload.call_args.kwargs["IfNoneMatch"] == "*"
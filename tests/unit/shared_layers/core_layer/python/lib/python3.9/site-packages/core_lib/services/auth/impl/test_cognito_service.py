@@ -2,12 +2,17 @@ import base64
 import hashlib
 import hmac
 import os
+import time
 from unittest.mock import patch
 
+import pytest
+
+from core_lib.services.auth.impl import cognito_service
 from core_lib.services.auth.impl.cognito_service import (
     get_user_pool_id,
     get_user_pool_client,
     get_known_public_keys,
+    get_known_public_key,
     get_app_client_secret,
     admin_create_user,
     admin_set_user_password,
@@ -16,11 +21,15 @@ from core_lib.services.auth.impl.cognito_service import (
     sign_up,
     confirm_sign_up,
     initiate_user_password_auth,
+    initiate_refresh_token_auth,
+    call_cognito,
     admin_enable_user,
     respond_to_new_password_auth_challenge,
     health_check,
+    cognito_idp_client,
 )
 from core_lib.services.parameter.parameter_service import ParameterName
+from core_lib.utils.metrics_util import get_metrics, reset_metrics
 
 # Create mock responses
 mock_get_parameter_value_response = "mock_parameter_value"
@@ -66,6 +75,83 @@ def test_get_known_public_keys(mock_get_user_pool_id, mock_requests_util_get):
     assert response == mock_jwks_response_json["keys"]
 
 
+def reset_known_public_keys(keys=None, refresh_at=None, last_fetch_time=None):
+    cognito_service.KNOWN_PUBLIC_KEYS = keys
+    cognito_service.KNOWN_PUBLIC_KEYS_BY_KID = {key["kid"]: key for key in keys or []}
+    cognito_service.KNOWN_PUBLIC_KEYS_REFRESH_AT = refresh_at
+    cognito_service.LAST_JWKS_FETCH_TIME = last_fetch_time
+
+
+@patch("core_lib.services.auth.impl.cognito_service.requests_util.get")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value=mock_get_parameter_value_response,
+)
+def test_get_known_public_keys_refreshes_after_ttl(
+    mock_get_user_pool_id, mock_requests_util_get
+):
+    reset_known_public_keys(
+        keys=[{"kid": "old"}], refresh_at=time.time() - 1, last_fetch_time=0
+    )
+    mock_requests_util_get.return_value.json.return_value = {"keys": [{"kid": "new"}]}
+
+    assert get_known_public_keys() == [{"kid": "new"}]
+    assert cognito_service.KNOWN_PUBLIC_KEYS_REFRESH_AT > time.time()
+
+
+@patch("core_lib.services.auth.impl.cognito_service.requests_util.get")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value=mock_get_parameter_value_response,
+)
+def test_get_known_public_keys_stale_if_error(
+    mock_get_user_pool_id, mock_requests_util_get
+):
+    reset_known_public_keys(
+        keys=[{"kid": "old"}], refresh_at=time.time() - 1, last_fetch_time=0
+    )
+    mock_requests_util_get.side_effect = Exception("timeout")
+
+    assert get_known_public_keys() == [{"kid": "old"}]
+    assert cognito_service.KNOWN_PUBLIC_KEYS_REFRESH_AT > time.time()
+
+
+@patch("core_lib.services.auth.impl.cognito_service.requests_util.get")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value=mock_get_parameter_value_response,
+)
+def test_get_known_public_keys_without_stale_keys_raises(
+    mock_get_user_pool_id, mock_requests_util_get
+):
+    reset_known_public_keys()
+    mock_requests_util_get.side_effect = Exception("timeout")
+
+    with pytest.raises(Exception):
+        get_known_public_keys()
+
+
+@patch("core_lib.services.auth.impl.cognito_service.requests_util.get")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value=mock_get_parameter_value_response,
+)
+def test_get_known_public_key_refetches_on_unknown_kid(
+    mock_get_user_pool_id, mock_requests_util_get
+):
+    reset_known_public_keys(
+        keys=[{"kid": "old"}], refresh_at=time.time() + 60, last_fetch_time=0
+    )
+    mock_requests_util_get.return_value.json.return_value = {
+        "keys": [{"kid": "old"}, {"kid": "rotated"}]
+    }
+
+    assert get_known_public_key("rotated") == {"kid": "rotated"}
+    # a second unknown kid inside the refetch interval does not hit the endpoint again
+    assert get_known_public_key("missing") is None
+    mock_requests_util_get.assert_called_once()
+
+
 @patch(
     "core_lib.services.auth.impl.cognito_service.cognito_idp_client.describe_user_pool_client"
 )
@@ -80,6 +166,7 @@ def test_get_known_public_keys(mock_get_user_pool_id, mock_requests_util_get):
 def test_get_app_client_secret(
     mock_get_user_pool_client, mock_get_user_pool_id, mock_cognito_idp_client
 ):
+    reset_user_pool_client_description()
     mock_cognito_idp_client.return_value = {
         "UserPoolClient": {"ClientSecret": "mock_client_s"}
     }
@@ -87,6 +174,116 @@ def test_get_app_client_secret(
     assert response == "mock_client_s"
 
 
+def reset_user_pool_client_description(description=None, refresh_at=None):
+    cognito_service.USER_POOL_CLIENT_DESCRIPTION = description
+    cognito_service.USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT = refresh_at
+    cognito_service.SECRET_HASH_CACHE.clear()
+
+
+@patch(
+    "core_lib.services.auth.impl.cognito_service.cognito_idp_client.describe_user_pool_client"
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value="mock_pool_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client_id",
+)
+def test_get_app_client_secret_is_cached_until_ttl(
+    mock_get_user_pool_client, mock_get_user_pool_id, mock_describe_user_pool_client
+):
+    reset_user_pool_client_description()
+    mock_describe_user_pool_client.side_effect = [
+        {"UserPoolClient": {"ClientSecret": "secret_1"}},
+        {"UserPoolClient": {"ClientSecret": "secret_2"}},
+    ]
+
+    assert get_app_client_secret() == "secret_1"
+    assert get_app_client_secret() == "secret_1"
+    mock_describe_user_pool_client.assert_called_once()
+
+    cognito_service.USER_POOL_CLIENT_DESCRIPTION_REFRESH_AT = time.time() - 1
+    assert get_app_client_secret() == "secret_2"
+    assert mock_describe_user_pool_client.call_count == 2
+
+
+@patch(
+    "core_lib.services.auth.impl.cognito_service.cognito_idp_client.describe_user_pool_client"
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value="mock_pool_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client",
+)
+def test_get_cognito_client_secret_hash_is_cleared_on_secret_refresh(
+    mock_get_user_pool_client, mock_get_user_pool_id, mock_describe_user_pool_client
+):
+    reset_user_pool_client_description()
+    mock_describe_user_pool_client.side_effect = [
+        {"UserPoolClient": {"ClientSecret": "secret_1"}},
+        {"UserPoolClient": {"ClientSecret": "secret_2"}},
+    ]
+
+    secret_hash = get_cognito_client_secret_hash("mock_user")
+    assert get_cognito_client_secret_hash("mock_user") == secret_hash
+    assert cognito_service.SECRET_HASH_CACHE.stats()["hits"] >= 1
+
+    get_app_client_secret(force_refresh=True)
+    expected_hash = base64.b64encode(
+        hmac.new(
+            b"secret_2", b"mock_usermock_client", digestmod=hashlib.sha256
+        ).digest()
+    ).decode()
+    assert get_cognito_client_secret_hash("mock_user") == expected_hash
+
+
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client.sign_up")
+@patch("core_lib.services.auth.impl.cognito_service.get_app_client_secret")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_cognito_client_secret_hash",
+    return_value="mock_secret_hash",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client_id",
+)
+def test_sign_up_retries_after_secret_rotation(
+    mock_get_user_pool_client,
+    mock_get_cognito_client_secret_hash,
+    mock_get_app_client_secret,
+    mock_cognito_idp_client_sign_up,
+):
+    mock_cognito_idp_client_sign_up.side_effect = [
+        cognito_idp_client.exceptions.NotAuthorizedException(
+            {
+                "Error": {
+                    "Code": "NotAuthorizedException",
+                    "Message": "Unable to verify secret hash for client mock_client_id",
+                }
+            },
+            "SignUp",
+        ),
+        {"UserConfirmed": False},
+    ]
+
+    sign_up(
+        "mock_profile",
+        "mock_username",
+        "mock_email",
+        "mock_password",
+        "mock_first",
+        "mock_last",
+    )
+
+    mock_get_app_client_secret.assert_called_once_with(force_refresh=True)
+    assert mock_cognito_idp_client_sign_up.call_count == 2
+
+
 @patch(
     "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
     return_value="mock_client",
@@ -98,6 +295,7 @@ def test_get_app_client_secret(
 def test_get_cognito_client_secret_hash(
     mock_get_app_client_secret, mock_get_user_pool_client
 ):
+    reset_user_pool_client_description()
     username = "mock_user"
     message = bytes(username + "mock_client", "utf-8")
     key = bytes("mock_secret", "utf-8")
@@ -174,6 +372,76 @@ def test_confirm_sign_up(
     mock_admin_update_user_attributes.assert_called_once()
 
 
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value="mock_pool_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_cognito_client_secret_hash",
+    return_value="mock_secret_hash",
+)
+def test_confirm_sign_up_enables_user_before_confirm(
+    mock_get_cognito_client_secret_hash,
+    mock_get_user_pool_client,
+    mock_get_user_pool_id,
+    mock_cognito_idp_client,
+):
+    confirm_sign_up("mock_username", "mock_code")
+
+    called_operations = [name for name, _, _ in mock_cognito_idp_client.method_calls]
+    assert called_operations == [
+        "admin_enable_user",
+        "confirm_sign_up",
+        "admin_update_user_attributes",
+    ]
+
+
+@patch(
+    "core_lib.services.auth.impl.cognito_service.cognito_idp_client.admin_update_user_attributes"
+)
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client.confirm_sign_up")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.cognito_idp_client.admin_enable_user"
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_id",
+    return_value="mock_pool_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_cognito_client_secret_hash",
+    return_value="mock_secret_hash",
+)
+def test_confirm_sign_up_does_not_verify_email_for_rejected_code(
+    mock_get_cognito_client_secret_hash,
+    mock_get_user_pool_client,
+    mock_get_user_pool_id,
+    mock_admin_enable_user,
+    mock_confirm_sign_up,
+    mock_admin_update_user_attributes,
+):
+    mock_confirm_sign_up.side_effect = (
+        cognito_idp_client.exceptions.CodeMismatchException(
+            {"Error": {"Code": "CodeMismatchException", "Message": "Invalid code"}},
+            "ConfirmSignUp",
+        )
+    )
+
+    with pytest.raises(cognito_idp_client.exceptions.CodeMismatchException):
+        confirm_sign_up("mock_username", "mock_code")
+
+    mock_admin_enable_user.assert_called_once()
+    mock_admin_update_user_attributes.assert_not_called()
+
+
 @patch(
     "core_lib.services.auth.impl.cognito_service.cognito_idp_client.admin_create_user"
 )
@@ -305,9 +573,92 @@ def test_respond_to_new_password_auth_challenge(
 def test_health_check(
     mock_get_user_pool_client, mock_get_user_pool_id, mock_describe_user_pool_client
 ):
+    reset_user_pool_client_description()
     mock_describe_user_pool_client.return_value = {
         "UserPoolClient": {"ClientId": "mock_client_id"}
     }
     response = health_check()
     assert response == {"UserPoolClient": {"ClientId": "mock_client_id"}}
-    mock_describe_user_pool_client.assert_called_once()
+    mock_describe_user_pool_client.assert_called_once_with(
+        UserPoolId="mock_pool_id", ClientId="mock_client_id"
+    )
+
+    # the probe does not serve the cached client description
+    mock_describe_user_pool_client.side_effect = Exception("unavailable")
+    with pytest.raises(Exception, match="unavailable"):
+        health_check()
+
+
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client.initiate_auth")
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_user_pool_client",
+    return_value="mock_client_id",
+)
+@patch(
+    "core_lib.services.auth.impl.cognito_service.get_cognito_client_secret_hash",
+    return_value="mock_secret_hash",
+)
+def test_initiate_refresh_token_auth(
+    mock_get_cognito_client_secret_hash, mock_get_user_pool_client, mock_initiate_auth
+):
+    mock_initiate_auth.return_value = {
+        "AuthenticationResult": {"IdToken": "mock_id_token"},
+        "ResponseMetadata": {},
+    }
+
+    response = initiate_refresh_token_auth("mock_username", "mock_refresh_token")
+
+    assert response == {"AuthenticationResult": {"IdToken": "mock_id_token"}}
+    mock_get_cognito_client_secret_hash.assert_called_once_with("mock_username")
+    mock_initiate_auth.assert_called_once_with(
+        AuthFlow="REFRESH_TOKEN_AUTH",
+        AuthParameters={
+            "REFRESH_TOKEN": "mock_refresh_token",
+            "SECRET_HASH": "mock_secret_hash",
+        },
+        ClientId="mock_client_id",
+    )
+
+
+def build_throttling_exception(operation_name: str):
+    return cognito_idp_client.exceptions.TooManyRequestsException(
+        {"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}},
+        operation_name,
+    )
+
+
+@patch("core_lib.services.auth.impl.cognito_service.time.sleep")
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client.sign_up")
+def test_call_cognito_retries_throttled_calls(mock_sign_up, mock_sleep):
+    reset_metrics()
+    cognito_service.COGNITO_RATE_LIMITERS.clear()
+    mock_sign_up.side_effect = [build_throttling_exception("SignUp"), {"ok": True}]
+
+    response = call_cognito("sign_up", Username="mock_username")
+
+    assert response == {"ok": True}
+    assert mock_sign_up.call_count == 2
+    mock_sleep.assert_called_once()
+    assert get_metrics()["cognito.sign_up.throttles"] == 1
+    rate_limiter = cognito_service.get_cognito_rate_limiter("sign_up")
+    assert rate_limiter.rate_per_second < rate_limiter.max_rate_per_second
+
+
+@patch("core_lib.services.auth.impl.cognito_service.time.sleep")
+@patch("core_lib.services.auth.impl.cognito_service.cognito_idp_client.initiate_auth")
+def test_call_cognito_raises_after_max_throttle_retries(mock_initiate_auth, mock_sleep):
+    reset_metrics()
+    cognito_service.COGNITO_RATE_LIMITERS.clear()
+    mock_initiate_auth.side_effect = build_throttling_exception("InitiateAuth")
+
+    with pytest.raises(cognito_idp_client.exceptions.TooManyRequestsException):
+        call_cognito("initiate_auth", AuthFlow="USER_PASSWORD_AUTH")
+
+    assert (
+        mock_initiate_auth.call_count
+        == cognito_service.COGNITO_THROTTLE_MAX_RETRIES + 1
+    )
+    assert (
+        get_metrics()["cognito.initiate_auth.throttles"]
+        == cognito_service.COGNITO_THROTTLE_MAX_RETRIES + 1
+    )
@@ -86,15 +86,23 @@ def test_get_known_public_keys(mock_auth_impl):
     assert response == ["test_key"]
 
 
+@patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
+def test_get_known_public_key(mock_auth_impl):
+    mock_auth_impl.get_known_public_key.return_value = {"kid": "test_kid"}
+
+    response = auth_service.get_known_public_key("test_kid")
+
+    mock_auth_impl.get_known_public_key.assert_called_once_with(kid="test_kid")
+    assert response == {"kid": "test_kid"}
+
+
 @patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
 @patch("core_lib.services.auth.auth_service.send_message_to_queue")
 @patch("core_lib.services.auth.auth_service.get_auth_event_queue_url")
-def test_replicated_sign_up(mock_queue_url, mock_send_message, mock_auth_impl):
-    mock_auth_impl.sign_up.return_value = user_response
+def test_replicate_sign_up(mock_queue_url, mock_send_message, mock_auth_impl):
     mock_queue_url.return_value = "mock_queue_url"
 
-    # Call the function with the parameters
-    response = auth_service.replicated_sign_up(
+    auth_service.replicate_sign_up(
         profile="testprofile",
         username="testuser",
         email="testuser@example.com",
@@ -103,18 +111,8 @@ def test_replicated_sign_up(mock_queue_url, mock_send_message, mock_auth_impl):
         last_name="User",
     )
 
-    # Assert the function call
-    mock_auth_impl.sign_up.assert_called_once_with(
-        profile="testprofile",
-        username="testuser",
-        email="testuser@example.com",
-        password="testpassword",
-        first_name="Test",
-        last_name="User",
-    )
-
-    # Assert the message was sent to the queue
-    mock_send_message.assert_called_with(
+    mock_auth_impl.sign_up.assert_not_called()
+    mock_send_message.assert_called_once_with(
         {
             "event_type": "replicated_sign_up",
             "args": {
@@ -126,13 +124,10 @@ def test_replicated_sign_up(mock_queue_url, mock_send_message, mock_auth_impl):
                 "last_name": "User",
             },
         },
-        region=None,  # Adjust based on your setup
+        region=None,
         queue_url="mock_queue_url",
     )
 
-    # Assert the response
-    assert response == user_response
-
 
 @patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
 @patch("core_lib.services.auth.auth_service.send_message_to_queue")
@@ -186,6 +181,20 @@ def test_initiate_user_password_auth(mock_auth_impl):
     assert response == auth_response
 
 
+@patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
+def test_initiate_refresh_token_auth(mock_auth_impl):
+    mock_auth_impl.initiate_refresh_token_auth.return_value = auth_response
+
+    response = auth_service.initiate_refresh_token_auth(
+        username="TestUser", refresh_token="refresh_token"
+    )
+
+    mock_auth_impl.initiate_refresh_token_auth.assert_called_once_with(
+        username="testuser", refresh_token="refresh_token"
+    )
+    assert response == auth_response
+
+
 @patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
 def test_admin_create_user(mock_auth_impl):
     mock_auth_impl.admin_create_user.return_value = user_response
@@ -232,6 +241,13 @@ def test_admin_disable_user(mock_auth_impl):
     assert response == confirmation_response
 
 
+@patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
+def test_admin_delete_user(mock_auth_impl):
+    auth_service.admin_delete_user(username="testuser")
+
+    mock_auth_impl.admin_delete_user.assert_called_once_with(username="testuser")
+
+
 @patch("core_lib.services.auth.auth_service.AUTH_SERVICE_IMPL")
 def test_health_check(mock_auth_impl):
     mock_auth_impl.health_check.return_value = True
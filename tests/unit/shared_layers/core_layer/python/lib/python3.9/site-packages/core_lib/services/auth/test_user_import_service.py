@@ -0,0 +1,164 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core_lib.services.auth import user_import_service
+from core_lib.services.auth.user_import_service import (
+    IMPORT_COMPLETE,
+    IMPORT_IN_PROGRESS,
+    import_users,
+    read_user_records,
+)
+from core_lib.utils.metrics_util import get_metrics, increment_metric, reset_metrics
+
+
+def build_body(content: str):
+    body = MagicMock()
+    body.iter_lines.return_value = iter(content.encode("utf-8").splitlines())
+    return {"Body": body}
+
+
+class FakeFileStorage:
+    def __init__(self, source_key: str, source_content: str):
+        self.objects = {}
+        self.source_key = source_key
+        self.source_content = source_content
+
+    def download(self, bucket_name: str, key: str):
+        if key == self.source_key:
+            return build_body(self.source_content)
+        if key in self.objects:
+            return {"Body": io.BytesIO(self.objects[key].encode("utf-8"))}
+        return None
+
+    def upload(self, bucket_name: str, key: str, content):
+        self.objects[key] = content
+        return {"ETag": '"etag"'}
+
+
+@pytest.fixture
+def file_storage():
+    users = [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": "p"}
+        for i in range(5)
+    ]
+    fake_file_storage = FakeFileStorage(
+        source_key="imports/users.ndjson",
+        source_content="\n".join(json.dumps(user) for user in users),
+    )
+
+    with patch.object(
+        user_import_service.file_storage_service,
+        "download",
+        side_effect=fake_file_storage.download,
+    ), patch.object(
+        user_import_service.file_storage_service,
+        "upload",
+        side_effect=fake_file_storage.upload,
+    ), patch.object(
+        user_import_service.file_storage_service,
+        "get_app_storage_bucket",
+        return_value="app-storage",
+    ), patch.object(
+        user_import_service, "USER_IMPORT_CHECKPOINT_INTERVAL", 2
+    ):
+        yield fake_file_storage
+
+
+@patch("core_lib.services.auth.user_import_service.auth_service.admin_create_user")
+def test_import_users_writes_manifest_and_checkpoint(
+    mock_admin_create_user, file_storage
+):
+    # keyed by username, records of a chunk are created in no particular order
+    errors = {
+        "user1": ClientError(
+            {"Error": {"Code": "UsernameExistsException", "Message": "exists"}},
+            "AdminCreateUser",
+        ),
+        "user3": Exception("boom"),
+    }
+
+    def admin_create_user(username, **kwargs):
+        if username in errors:
+            raise errors[username]
+
+    mock_admin_create_user.side_effect = admin_create_user
+
+    checkpoint = import_users(
+        bucket_name="source", key="imports/users.ndjson", import_id="import-1"
+    )
+
+    assert checkpoint["status"] == IMPORT_COMPLETE
+    assert checkpoint["next_record"] == 5
+    assert checkpoint["manifest_parts"] == 3
+    assert checkpoint["counts"] == {"CREATED": 3, "EXISTS": 1, "FAILED": 1}
+    manifest = [
+        json.loads(line)
+        for part in range(3)
+        for line in file_storage.objects[
+            f"user-imports/import-1/manifest/part-{part:05d}.ndjson"
+        ].split("\n")
+    ]
+    assert [result["status"] for result in manifest] == [
+        "CREATED",
+        "EXISTS",
+        "CREATED",
+        "FAILED",
+        "CREATED",
+    ]
+    assert manifest[3]["error"] == "boom"
+
+
+@patch("core_lib.services.auth.user_import_service.auth_service.admin_create_user")
+def test_import_users_resumes_from_checkpoint(mock_admin_create_user, file_storage):
+    checkpoint = import_users(
+        bucket_name="source",
+        key="imports/users.ndjson",
+        import_id="import-2",
+        should_stop=lambda: True,
+    )
+
+    assert checkpoint["status"] == IMPORT_IN_PROGRESS
+    assert checkpoint["next_record"] == 2
+    assert mock_admin_create_user.call_count == 2
+
+    checkpoint = import_users(
+        bucket_name="source", key="imports/users.ndjson", import_id="import-2"
+    )
+
+    assert checkpoint["status"] == IMPORT_COMPLETE
+    assert mock_admin_create_user.call_count == 5
+    # records of a chunk are created concurrently, in no particular order
+    assert sorted(
+        call.kwargs["username"] for call in mock_admin_create_user.call_args_list[2:]
+    ) == ["user2", "user3", "user4"]
+
+
+@patch("core_lib.services.auth.user_import_service.auth_service.admin_create_user")
+def test_import_users_records_worker_metrics_on_invoking_thread(
+    mock_admin_create_user, file_storage
+):
+    mock_admin_create_user.side_effect = lambda **kwargs: increment_metric(
+        "cognito.admin_create_user.throttles"
+    )
+    reset_metrics()
+
+    import_users(bucket_name="source", key="imports/users.ndjson", import_id="import-3")
+
+    assert get_metrics() == {"cognito.admin_create_user.throttles": 5}
+
+
+@patch("core_lib.services.auth.user_import_service.file_storage_service.download")
+def test_read_user_records_from_csv(mock_download):
+    mock_download.return_value = build_body(
+        "username,email,password\nuser0,user0@example.com,p\n"
+    )
+
+    records = list(read_user_records(bucket_name="source", key="imports/users.csv"))
+
+    assert records == [
+        {"username": "user0", "email": "user0@example.com", "password": "p"}
+    ]
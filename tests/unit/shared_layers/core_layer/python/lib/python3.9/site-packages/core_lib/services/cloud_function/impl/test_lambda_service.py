@@ -7,6 +7,7 @@ from core_lib.services.cloud_function.impl.lambda_service import (
     add_invoke_permission,
     get_function,
     list_functions,
+    invoke_function_async,
 )
 
 
@@ -71,3 +72,11 @@ def test_create_database_event_lambda_trigger(
         BatchSize=5,
         Enabled=True,
     )
+
+
+@patch("core_lib.services.cloud_function.impl.lambda_service.lambda_client.invoke")
+def test_invoke_function_async(mock_invoke):
+    invoke_function_async(function_name="mock_func", payload={"key": "value"})
+    mock_invoke.assert_called_once_with(
+        FunctionName="mock_func", InvocationType="Event", Payload=b'{"key":"value"}'
+    )
@@ -10,6 +10,8 @@ from core_lib.services.database.impl.dynamodb_service import (
     update_item,
     delete_item,
     batch_get_item,
+    batch_get_items,
+    build_projection,
     health_check,
 )
 from core_lib.services.parameter.parameter_service import ParameterName
@@ -169,6 +171,44 @@ def test_batch_get_item(mock_get_item, mock_db_name):
     )
 
 
+@patch("core_lib.services.database.impl.dynamodb_service.time.sleep")
+@patch(
+    "core_lib.services.database.impl.dynamodb_service.db_table_name",
+    return_value="table_name",
+)
+@patch("core_lib.services.database.impl.dynamodb_service.dynamodb_batch_get_item")
+def test_batch_get_items_chunks_keys_and_retries_unprocessed_keys(
+    mock_batch_get_item, mock_db_name, mock_sleep
+):
+    keys = [{"pk": "user", "sk": f"user-{i}"} for i in range(150)]
+    mock_batch_get_item.side_effect = [
+        {
+            "Responses": {"table_name": [{"sk": "user-0"}]},
+            "UnprocessedKeys": {"table_name": {"Keys": [keys[1]]}},
+        },
+        {"Responses": {"table_name": [{"sk": "user-1"}]}},
+        {"Responses": {"table_name": [{"sk": "user-100"}]}},
+    ]
+
+    result = batch_get_items(keys=keys, ProjectionExpression="sk")
+
+    assert result == [{"sk": "user-0"}, {"sk": "user-1"}, {"sk": "user-100"}]
+    assert mock_batch_get_item.call_count == 3
+    first_request = mock_batch_get_item.call_args_list[0].kwargs["RequestItems"]
+    assert first_request["table_name"]["Keys"] == keys[:100]
+    assert first_request["table_name"]["ProjectionExpression"] == "sk"
+    assert mock_batch_get_item.call_args_list[1].kwargs["RequestItems"] == {
+        "table_name": {"Keys": [keys[1]]}
+    }
+    assert (
+        mock_batch_get_item.call_args_list[2].kwargs["RequestItems"]["table_name"][
+            "Keys"
+        ]
+        == keys[100:]
+    )
+    mock_sleep.assert_called_once()
+
+
 @patch(
     "core_lib.services.database.impl.dynamodb_service.dynamodb_client.describe_table",
     return_value={"Table": {"TableStatus": "ACTIVE"}},
@@ -180,3 +220,14 @@ def test_health_check(describe_table_mock):
 
     describe_table_mock.assert_called_once_with(TableName=db_table_name())
     assert response == {"Table": {"TableStatus": "ACTIVE"}}
+
+
+def test_build_projection():
+    assert build_projection() == {}
+    assert build_projection(projection_expression="sk") == {
+        "ProjectionExpression": "sk"
+    }
+    assert build_projection(["profile", "name"], "sk") == {
+        "ProjectionExpression": "#profile,#name",
+        "ExpressionAttributeNames": {"#profile": "profile", "#name": "name"},
+    }
@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from botocore.stub import Stubber
+
 from core_lib.services.file_storage.impl import s3_service
 
 
@@ -21,6 +23,27 @@ def test_upload(mock_s3_resource):
     assert response == {"ResponseMetadata": {"HTTPStatusCode": 200}}
 
 
+def test_upload_conditional_write():
+    # the stubber validates the parameters against the installed SDK's model
+    with Stubber(s3_service.s3_resource.meta.client) as stubber:
+        stubber.add_response(
+            "put_object",
+            {"ETag": '"new-etag"'},
+            {
+                "Bucket": "mybucket",
+                "Key": "mykey",
+                "Body": b"mycontent",
+                "IfMatch": '"etag"',
+            },
+        )
+
+        response = s3_service.upload(
+            "mybucket", "mykey", b"mycontent", IfMatch='"etag"'
+        )
+
+    assert response["ETag"] == '"new-etag"'
+
+
 @patch("core_lib.services.file_storage.impl.s3_service.s3_client")
 def test_download(mock_s3_client):
     # Arrange
@@ -32,5 +55,18 @@ def test_download(mock_s3_client):
     response = s3_service.download(bucket_name, key)
 
     # Assert
-    mock_s3_client.get_object.assert_called_once_with(bucket_name=bucket_name, key=key)
+    mock_s3_client.get_object.assert_called_once_with(Bucket=bucket_name, Key=key)
     assert response == {"Body": b"mycontent"}
+
+
+@patch("core_lib.services.file_storage.impl.s3_service.s3_client")
+def test_generate_presigned_download_url(mock_s3_client):
+    mock_s3_client.generate_presigned_url.return_value = "https://url"
+
+    assert (
+        s3_service.generate_presigned_download_url("mybucket", "mykey", 300)
+        == "https://url"
+    )
+    mock_s3_client.generate_presigned_url.assert_called_once_with(
+        "get_object", Params={"Bucket": "mybucket", "Key": "mykey"}, ExpiresIn=300
+    )
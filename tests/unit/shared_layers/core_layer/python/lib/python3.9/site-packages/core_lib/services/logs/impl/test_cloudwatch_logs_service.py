@@ -7,10 +7,10 @@ from core_lib.services.logs.impl import cloudwatch_logs_service
 
 
 @patch("core_lib.services.logs.impl.cloudwatch_logs_service.print")
-@patch("core_lib.services.logs.impl.cloudwatch_logs_service.json")
+@patch("core_lib.services.logs.impl.cloudwatch_logs_service.json_util")
 @patch("core_lib.services.logs.impl.cloudwatch_logs_service.gzip")
 @patch("core_lib.services.logs.impl.cloudwatch_logs_service.base64")
-def test_log_subscribed_log_events(mock_base64, mock_gzip, mock_json, mock_print):
+def test_log_subscribed_log_events(mock_base64, mock_gzip, mock_json_util, mock_print):
     # Arrange
     event = {
         "awslogs": {
@@ -21,10 +21,9 @@ def test_log_subscribed_log_events(mock_base64, mock_gzip, mock_json, mock_print
             ).decode()
         }
     }
-    mock_json.loads.side_effect = [
-        json.loads(gzip.decompress(base64.b64decode(event["awslogs"]["data"]))),
-        {"message": "test_message"},
-    ]
+    mock_json_util.loads.return_value = json.loads(
+        gzip.decompress(base64.b64decode(event["awslogs"]["data"]))
+    )
 
     # Act
     cloudwatch_logs_service.log_subscribed_log_events(event)
@@ -32,8 +31,8 @@ def test_log_subscribed_log_events(mock_base64, mock_gzip, mock_json, mock_print
     # Assert
     mock_base64.b64decode.assert_called_once()
     mock_gzip.decompress.assert_called_once()
-    mock_json.loads.assert_called()
-    mock_print.assert_called_once_with({"message": "test_message"})
+    mock_json_util.loads.assert_called_once()
+    mock_print.assert_called_once_with("test_message")
 
 
 @patch("core_lib.services.logs.impl.cloudwatch_logs_service.logs_client")
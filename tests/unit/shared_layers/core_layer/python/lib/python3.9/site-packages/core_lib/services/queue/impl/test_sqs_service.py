@@ -47,9 +47,9 @@ def test_send_message_to_queue(mock_log_warning, mock_log_info, mock_sqs_client)
     mock_sqs_client.get.return_value.send_message.assert_called_once_with(
         QueueUrl=test_queue_url,
         DelaySeconds=test_delay_seconds,
-        MessageBody='{"key": "value"}',
+        MessageBody='{"key":"value"}',
     )
     mock_log_info.assert_called_once_with(
-        f'sending message: {{"key": "value"}} to {test_queue_url} in region {test_region}'
+        f'sending message: {{"key":"value"}} to {test_queue_url} in region {test_region}'
     )
     mock_log_warning.assert_not_called()
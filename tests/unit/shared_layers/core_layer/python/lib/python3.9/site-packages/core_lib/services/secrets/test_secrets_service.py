@@ -12,3 +12,17 @@ def test_get_secret_value(mock_secrets_service):
     result = secrets_service.get_secret_value(secret_id)
 
     assert result == {"SecretString": "Secret value"}
+
+
+@patch("core_lib.services.secrets.secrets_service.CURSOR_SIGNING_KEY", None)
+@patch("core_lib.services.secrets.secrets_service.SECRETS_SERVICE_IMPL")
+def test_get_cursor_signing_key(mock_secrets_service, monkeypatch):
+    monkeypatch.setenv("CURSOR_SIGNING_SECRET_ID", "cursor-secret")
+    mock_secrets_service.get_secret_value.return_value = {"SecretString": "key"}
+
+    assert secrets_service.get_cursor_signing_key() == b"key"
+    assert secrets_service.get_cursor_signing_key() == b"key"
+
+    mock_secrets_service.get_secret_value.assert_called_once_with(
+        secret_id="cursor-secret"
+    )
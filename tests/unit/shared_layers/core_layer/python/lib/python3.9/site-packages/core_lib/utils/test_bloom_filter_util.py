@@ -0,0 +1,35 @@
+import pytest
+
+from core_lib.utils.bloom_filter_util import BloomFilter
+
+
+def test_bloom_filter_contains_added_values():
+    bloom_filter = BloomFilter.for_capacity(capacity=1000, false_positive_rate=0.01)
+
+    for i in range(1000):
+        bloom_filter.add(f"user-{i}")
+
+    assert all(bloom_filter.might_contain(f"user-{i}") for i in range(1000))
+    false_positives = sum(
+        bloom_filter.might_contain(f"other-{i}") for i in range(1000)
+    )
+    assert false_positives < 50
+
+
+def test_bloom_filter_round_trips_through_bytes():
+    bloom_filter = BloomFilter.for_capacity(capacity=100)
+    bloom_filter.add("test-id")
+
+    restored = BloomFilter.from_bytes(bloom_filter.to_bytes())
+
+    assert restored.size_bits == bloom_filter.size_bits
+    assert restored.hash_count == bloom_filter.hash_count
+    assert restored.might_contain("test-id") is True
+    assert restored.might_contain("unknown-id") is False
+
+
+def test_bloom_filter_rejects_truncated_content():
+    content = BloomFilter.for_capacity(capacity=100).to_bytes()
+
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(content[:-1])
@@ -0,0 +1,60 @@
+import time
+
+from core_lib.utils.cache_util import LRUCache, is_expired
+
+
+def test_lru_cache_get_and_set():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", "default") == "default"
+    assert cache.stats() == {"size": 1, "max_size": 2, "hits": 1, "misses": 2}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1, expires_at=time.time() - 1)
+    cache.set("b", 2, expires_at=time.time() + 60)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["size"] == 1
+
+
+def test_lru_cache_ttl_seconds():
+    cache = LRUCache(max_size=2, ttl_seconds=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_lru_cache_delete_and_clear():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_is_expired():
+    assert is_expired(None) is False
+    assert is_expired(time.time() - 1) is True
+    assert is_expired(time.time() + 60) is False
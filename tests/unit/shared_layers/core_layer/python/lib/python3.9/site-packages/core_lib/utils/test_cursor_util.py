@@ -0,0 +1,39 @@
+import pytest
+
+from core_lib.exceptions.types import AppException
+from core_lib.utils.cursor_util import decode_cursor, encode_cursor
+
+KEY = {"pk": "user-a", "sk": "user-b"}
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(KEY, signing_key=b"key", scope="a")
+
+    assert "user" not in cursor
+    assert decode_cursor(cursor, signing_key=b"key", scope="a") == KEY
+
+
+@pytest.mark.parametrize(
+    "signing_key, scope", [(b"other-key", "a"), (b"key", "b")], ids=["key", "scope"]
+)
+def test_decode_cursor_rejects_other_signature(signing_key, scope):
+    cursor = encode_cursor(KEY, signing_key=b"key", scope="a")
+
+    with pytest.raises(AppException) as e:
+        decode_cursor(cursor, signing_key=signing_key, scope=scope)
+
+    assert e.value.get_code() == 400
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "a.b.c", "!!.??"])
+def test_decode_cursor_rejects_malformed_cursor(cursor):
+    with pytest.raises(AppException):
+        decode_cursor(cursor, signing_key=b"key")
+
+
+def test_decode_cursor_rejects_tampered_payload():
+    signature = encode_cursor(KEY, signing_key=b"key").split(".")[1]
+    tampered_payload = encode_cursor({"pk": "user-c"}, signing_key=b"x").split(".")[0]
+
+    with pytest.raises(AppException):
+        decode_cursor(f"{tampered_payload}.{signature}", signing_key=b"key")
@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from core_lib.utils import json_util
+
+CODECS = [True, False] if json_util.orjson is not None else [False]
+
+
+@pytest.mark.parametrize("use_native_codec", CODECS)
+def test_dumps_dynamodb_types(use_native_codec):
+    with patch.object(json_util, "USE_NATIVE_CODEC", use_native_codec):
+        content = json_util.dumps(
+            {
+                "count": Decimal("3"),
+                "score": Decimal("1.5"),
+                "tags": {"a"},
+                "created": datetime(2023, 1, 2, 3, 4, 5),
+                "day": date(2023, 1, 2),
+                "name": "é",
+            }
+        )
+
+    assert content == (
+        '{"count":3,"score":1.5,"tags":["a"],"created":"2023-01-02T03:04:05",'
+        '"day":"2023-01-02","name":"é"}'
+    )
+
+
+@pytest.mark.parametrize("use_native_codec", CODECS)
+def test_dumps_bytes(use_native_codec):
+    with patch.object(json_util, "USE_NATIVE_CODEC", use_native_codec):
+        assert json_util.dumps_bytes({"key": "value"}) == b'{"key":"value"}'
+
+
+@pytest.mark.parametrize("use_native_codec", CODECS)
+def test_dumps_large_int(use_native_codec):
+    with patch.object(json_util, "USE_NATIVE_CODEC", use_native_codec):
+        assert json_util.dumps({"big": 2**70}) == '{"big":%d}' % 2**70
+
+
+@pytest.mark.parametrize("use_native_codec", CODECS)
+def test_dumps_unsupported_type(use_native_codec):
+    with patch.object(json_util, "USE_NATIVE_CODEC", use_native_codec):
+        with pytest.raises(TypeError):
+            json_util.dumps({"value": object()})
+
+
+@pytest.mark.parametrize("use_native_codec", CODECS)
+def test_loads(use_native_codec):
+    with patch.object(json_util, "USE_NATIVE_CODEC", use_native_codec):
+        assert json_util.loads('{"key": ["value", 1]}') == {"key": ["value", 1]}
+        assert json_util.loads(b'{"key": null}') == {"key": None}
@@ -45,3 +45,16 @@ def test_lambda_handler_with_exception(_, __, ___, mock_log_unexp, mock_log_info
     assert str(excinfo.value) == "Test exception"
     mock_log_info.assert_called_once_with(event)
     mock_log_unexp.assert_called()
+
+
+@patch.object(lambda_util, "log_info")
+@patch.object(current_thread(), "__setattr__")
+@patch.object(xray_recorder, "begin_subsegment")
+@patch.object(xray_recorder, "end_subsegment")
+def test_lambda_handler_without_event_log(_, __, ___, mock_log_info):
+    @lambda_util.lambda_handler(log_event=False)
+    def test_func(event):
+        return event
+
+    assert test_func({"key": "value"}, MagicMock()) == {"key": "value"}
+    mock_log_info.assert_not_called()
@@ -0,0 +1,41 @@
+from threading import Thread
+
+from core_lib.utils.metrics_util import (
+    get_metrics,
+    increment_metric,
+    reset_metrics,
+    share_metrics,
+)
+
+
+def test_increment_metric():
+    reset_metrics()
+
+    increment_metric("cognito.sign_up.throttles")
+    increment_metric("cognito.sign_up.throttles")
+    increment_metric("cognito.sign_up.wait_ms", 12.5)
+
+    assert get_metrics() == {
+        "cognito.sign_up.throttles": 2,
+        "cognito.sign_up.wait_ms": 12.5,
+    }
+
+    reset_metrics()
+    assert get_metrics() == {}
+
+
+def test_share_metrics():
+    reset_metrics()
+    metrics = get_metrics()
+
+    def worker():
+        share_metrics(metrics)
+        increment_metric("cognito.admin_create_user.throttles")
+
+    threads = [Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert get_metrics() == {"cognito.admin_create_user.throttles": 4}
@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+from core_lib.utils.rate_limit_util import TokenBucket
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    token_bucket = TokenBucket(rate_per_second=5)
+
+    assert [token_bucket.acquire() for _ in range(5)] == [0.0] * 5
+
+
+@patch("core_lib.utils.rate_limit_util.time.sleep")
+def test_token_bucket_waits_for_refill(mock_sleep):
+    token_bucket = TokenBucket(rate_per_second=5, capacity=1)
+    token_bucket.acquire()
+    token_bucket.tokens = 0.5
+
+    waited_seconds = token_bucket.acquire()
+
+    assert waited_seconds > 0
+    mock_sleep.assert_called()
+
+
+def test_token_bucket_adapts_rate_to_throttling():
+    token_bucket = TokenBucket(rate_per_second=10, min_rate_per_second=2)
+
+    token_bucket.on_throttle()
+    assert token_bucket.rate_per_second == 5
+    token_bucket.on_throttle()
+    token_bucket.on_throttle()
+    assert token_bucket.rate_per_second == 2
+
+    for _ in range(100):
+        token_bucket.on_success()
+    assert token_bucket.rate_per_second == 10